@@ -4,12 +4,38 @@ Performance Metrics and Bonus Computation
 @author: adarshshukla
 """
 
+import argparse
 import csv
+import itertools
+from array import array
+from functools import partial
+from operator import itemgetter
 # from statistics import mean, median, stdev
 
+from bonus_engine import compute_bonuses, eligibility_threshold, employee_bonus
+from employee_db import EmployeeDatabase
+from employee_table import EmployeeTable
+from flat_file_reader import find_output, iter_lines, open_text
+from flat_file_writer import write_csv
+from incremental_state import DATA_STATE_FILE, METRICS_STATE_FILE, load_state, save_state, scan_input
+from instrumentation import Instrumentation
+from keyword_matcher import KeywordMatcher
+from score_cache import SCORE_CACHE_SIZE, ScoreCache, keyword_map_version
+from table_snapshot import SNAPSHOT_FILE, write_snapshot
+
+# Names the scoring rule in the score cache's version, next to the keyword map.
+SCORE_RULE = 'score of the first keyword in map order, 3 without keywords'
+# The employee_data.csv columns read, in the order compute_evaluation_scores takes them.
+EMPLOYEE_DATA_FIELDS = ('id', 'last_name', 'first_name', 'job_code', 'base_pay', 'hours', 'utilization', 'sales')
+FINAL_DATA_FIELDS = ('ID', 'FirstName', 'LastName', 'JobCode', 'BasePay', 'Utilization', 'Evaluation', 'Sales',
+                     'Bonus')
+
+
 class PerformanceMetricsProcessor:
-    def __init__(self):
-        self.employees = {}
+    def __init__(self, compression=None, score_cache_size=SCORE_CACHE_SIZE):
+        # None, 'gzip' or 'zstd'; a compressed emp_end_yr.txt gets a .gz or .zst suffix.
+        self.compression = compression
+        self.employees = EmployeeTable()
         self.consultant_eval_scores = {}
         self.bonuses = {}
         self.evaluation_score_mapping = {
@@ -19,24 +45,23 @@ class PerformanceMetricsProcessor:
             'poor': 2,
             'bad': 1
         }
+        self.keyword_matcher = KeywordMatcher(self.evaluation_score_mapping)
+        self.score_cache = ScoreCache(partial(self.keyword_matcher.first_score, default=3),
+                                      keyword_map_version(self.evaluation_score_mapping, SCORE_RULE),
+                                      score_cache_size)
+        self.instrumentation = Instrumentation('PerformanceMetricsProcessor')
+        self.evaluation_lines = 0
 
-    def extract_evaluation_data(self):
-        """Extract and process evaluation data from evaluation.txt"""
+    def extract_evaluation_data(self, start=0):
+        """Extract and process evaluation data from evaluation.txt, from byte offset start on"""
         print("Extracting evaluation data...")
+        self.evaluation_lines = 0
         try:
-            with open('evaluation.txt', 'r') as file:
-                for line in file:
-                    if line.strip():
-                        parts = line.strip().split('#')
-                        if len(parts) >= 2:
-                            emp_id = int(parts[0])
-                            rating = parts[1].strip().lower()
-                            for keyword, score in self.evaluation_score_mapping.items():
-                                if keyword in rating:
-                                    self.consultant_eval_scores[emp_id] = score
-                                    break
-                            else:
-                                self.consultant_eval_scores[emp_id] = 3
+            for self.evaluation_lines, line in iter_lines('evaluation.txt', start, text=True):
+                parts = line.split('#', 2)
+                if len(parts) >= 2:
+                    emp_id = int(parts[0])
+                    self.consultant_eval_scores[emp_id] = self.score_cache.score(parts[1])
         except Exception as e:
             print(f"Error extracting evaluation data: {str(e)}")
 
@@ -72,31 +97,56 @@ class PerformanceMetricsProcessor:
     #                 }
     #     except Exception as e:
     #         print(f"Error computing evaluation scores: {str(e)}")
-    def compute_evaluation_scores(self):
-        """Compute evaluation scores for Consultants and load sales for Directors."""
+    def compute_evaluation_scores(self, employees=None):
+        """Compute evaluation scores for Consultants and load sales for Directors.
+
+        employees is DataProcessor's EmployeeTable, taken over and updated in place;
+        without it the employees are read from employee_data.csv.
+        """
         print("Computing evaluation scores...")
+        if employees is not None:
+            self.use_employees(employees)
+            return
+        ids, last_names, first_names, job_codes = array('q'), [], [], []
+        base_pay, hours, utilization, evaluation_score, sales = (array('d') for _ in range(5))
+        try:
+            try:
+                with open_text(find_output('employee_data.csv')) as file:
+                    reader = csv.reader(file)
+                    fields = itemgetter(*map(next(reader).index, EMPLOYEE_DATA_FIELDS))
+                    for emp_id, last_name, first_name, job_code, pay, worked, rate, amount in map(fields, reader):
+                        emp_id = int(emp_id)
+                        pay, worked, rate = float(pay), float(worked), float(rate)
+                        amount = float(amount) if job_code == 'D' and amount else 0
+
+                        ids.append(emp_id)
+                        last_names.append(last_name)
+                        first_names.append(first_name)
+                        job_codes.append(job_code)
+                        base_pay.append(pay)
+                        hours.append(worked)
+                        utilization.append(rate)
+                        evaluation_score.append(self.consultant_eval_scores.get(emp_id, 0))
+                        sales.append(amount)
+            finally:
+                # Filled a column at a time; the employees read before any error are kept.
+                self.employees.extend(ids, last_names, first_names, job_codes, base_pay, hours, utilization,
+                                      evaluation_score, sales)
+        except Exception as e:
+            print(f"Error computing evaluation scores: {str(e)}")
+
+    def use_employees(self, employees):
+        """Adopt an in-memory EmployeeTable, applying the same field rules as the employee_data.csv path."""
         try:
-            with open('employee_data.csv', 'r') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    emp_id = int(row['id'])
-                    job_code = row['job_code']
-                    first_name = row['first_name']
-                    last_name = row['last_name']
-
-                    score = self.consultant_eval_scores.get(emp_id, 0)
-
-                    self.employees[emp_id] = {
-                        'id': emp_id,
-                        'first_name': first_name,
-                        'last_name': last_name,
-                        'job_code': job_code,
-                        'base_pay': float(row['base_pay']),
-                        'hours': float(row['hours']),
-                        'utilization': float(row['utilization']),
-                        'evaluation_score': score,
-                        'sales': float(row['sales']) if job_code == 'D' and row['sales'] else 0
-                    }
+            director = employees.job_code_id('D')
+            evaluation_score = employees.evaluation_score
+            sales = employees.sales
+            for row, (emp_id, code) in enumerate(zip(employees.ids, employees.job_codes)):
+                evaluation_score[row] = self.consultant_eval_scores.get(emp_id, 0)
+                if code != director:
+                    sales[row] = 0
+            employees.mark_changed()
+            self.employees = employees
         except Exception as e:
             print(f"Error computing evaluation scores: {str(e)}")
 
@@ -104,46 +154,70 @@ class PerformanceMetricsProcessor:
         """Determine employees eligible for bonuses."""
         print("Determining bonus eligibility...")
         try:
-            utilization_values = []
-            for emp in self.employees.values():
-                if emp['job_code'] == 'C':
-                    utilization_values.append(emp['utilization'])
-
-            if not utilization_values:
+            table = self.employees
+            result = compute_bonuses(table.job_codes, table.base_pay, table.sales, table.evaluation_score,
+                                     table.utilization, table.job_code_id('C'), table.job_code_id('D'))
+            if result is None:
                 print("No valid utilization data available for bonus eligibility.")
                 return
 
-            sorted_utilization = sorted(utilization_values)
-            index_65th_percentile = int(len(utilization_values) * 0.65)
-            utilization_65th_percentile = sorted_utilization[index_65th_percentile]
-
-            for emp_id, emp_data in self.employees.items():
-                if emp_data['job_code'] == 'C' and emp_data['utilization'] >= utilization_65th_percentile and emp_data[
-                    'evaluation_score'] != 'N/A' and emp_data['evaluation_score'] >= 3.5:
-                    bonus_amount = self.calculate_bonus(emp_data, 0.1)
-                    self.bonuses[emp_id] = bonus_amount
-                elif emp_data['job_code'] == 'D':
-                    bonus_amount = self.calculate_bonus(emp_data, 0.15)
+            bonuses, eligible = result
+            table.bonus = bonuses
+            for emp_id, bonus_amount, is_eligible in zip(table.ids, bonuses, eligible):
+                if is_eligible:
                     self.bonuses[emp_id] = bonus_amount
+            table.mark_changed()
         except Exception as e:
             print(f"Error determining bonus eligibility: {str(e)}")
 
-    def calculate_bonus(self, emp_data, bonus_rate):
-        """Calculate bonuses based on the rate."""
-        base_pay = emp_data['base_pay']
-        job_code = emp_data['job_code']
-        evaluation_score = emp_data['evaluation_score']
-
-        if job_code == 'C' and evaluation_score != 'N/A':
-            bonus_cap = 50000
-            bonus = base_pay * bonus_rate
-        elif job_code == 'D':
-            bonus_cap = 150000
-            bonus = emp_data.get('sales', 0) * bonus_rate
-        else:
-            return 0
+    def update_bonus_eligibility(self, previous, threshold, bonuses):
+        """Recompute bonuses only for employees whose inputs differ from the previous run's table.
+
+        Falls back to determine_bonus_eligibility when the employees themselves changed or the
+        consultants' utilization percentile moved. Returns the eligibility threshold in use.
+        """
+        table = self.employees
+        consultant = table.job_code_id('C')
+        director = table.job_code_id('D')
+        if (previous is None or threshold is None or consultant is None or previous.ids != table.ids
+                or previous.job_code_labels != table.job_code_labels):
+            self.determine_bonus_eligibility()
+            return eligibility_threshold(table.job_codes, table.utilization, consultant)
+
+        print("Determining bonus eligibility for changed employees...")
+        affected = [
+            row for row, (code, pay, value, score, amount, old_code, old_pay, old_value, old_score, old_amount)
+            in enumerate(zip(table.job_codes, table.base_pay, table.utilization, table.evaluation_score, table.sales,
+                             previous.job_codes, previous.base_pay, previous.utilization,
+                             previous.evaluation_score, previous.sales))
+            if code != old_code or pay != old_pay or value != old_value or score != old_score or amount != old_amount
+        ]
+        # The percentile only needs recomputing if some consultant's utilization actually moved.
+        if any(consultant in (table.job_codes[row], previous.job_codes[row])
+               and (table.utilization[row] != previous.utilization[row]
+                    or table.job_codes[row] != previous.job_codes[row])
+               for row in affected):
+            new_threshold = eligibility_threshold(table.job_codes, table.utilization, consultant)
+            if new_threshold != threshold:
+                print("Utilization percentile moved, re-evaluating every employee.")
+                self.determine_bonus_eligibility()
+                return new_threshold
 
-        return min(bonus, bonus_cap)
+        table.bonus = previous.bonus
+        self.bonuses = bonuses
+        for row in affected:
+            emp_id = table.ids[row]
+            bonus = employee_bonus(table.job_codes[row], table.base_pay[row], table.sales[row],
+                                   table.evaluation_score[row], table.utilization[row], threshold, consultant, director)
+            if bonus is None:
+                table.bonus[row] = 0.0
+                self.bonuses.pop(emp_id, None)
+            else:
+                table.bonus[row] = bonus
+                self.bonuses[emp_id] = bonus
+        table.mark_changed()
+        print(f"Bonuses recomputed for {len(affected)} employee(s).")
+        return threshold
 
     # def write_final_data(self):
     #     """Write final data to emp_end_yr.txt"""
@@ -187,32 +261,159 @@ class PerformanceMetricsProcessor:
     def write_final_data(self):
         """Write final data to emp_end_yr.txt with Evaluation and Sales values."""
         print("Writing final data to emp_end_yr.txt...")
+        table = self.employees
+        labels = table.job_code_labels
+        rows = zip(table.ids, table.first_names, table.last_names, (labels[code] for code in table.job_codes),
+                   table.base_pay, table.utilization, table.evaluation_score, table.sales,
+                   map(self.bonuses.get, table.ids, itertools.repeat(0)))
         try:
-            with open('emp_end_yr.txt', 'w') as file:
-                file.write('ID,FirstName,LastName,JobCode,BasePay,Utilization,Evaluation,Sales,Bonus\n')
-                for emp_id, emp_data in self.employees.items():
-                    evaluation = emp_data.get('evaluation_score', 0)
-                    sales = emp_data.get('sales', 0)
-                    bonus = self.bonuses.get(emp_id, 0)
-
-                    file.write(
-                        f"{emp_data['id']},{emp_data['first_name']},{emp_data['last_name']},{emp_data['job_code']},"
-                        f"{emp_data['base_pay']},{emp_data['utilization']},{evaluation},{sales},{bonus}\n"
-                    )
-            print("emp_end_yr.txt updated successfully.")
+            path = write_csv('emp_end_yr.txt', FINAL_DATA_FIELDS, rows, self.compression, lineterminator='\n')
+            print(f"{path} updated successfully.")
         except Exception as e:
             print(f"Error writing final data to emp_end_yr.txt: {str(e)}")
+            return
+        self.write_snapshot(path)
 
-    def process_data(self):
-        """Main processing method"""
+    def write_snapshot(self, source='emp_end_yr.txt'):
+        """Write the binary snapshot of emp_end_yr.txt (written to source) that UserInteraction loads first."""
+        try:
+            bonus = array('d', [self.bonuses.get(emp_id, 0) for emp_id in self.employees.ids])
+            write_snapshot(self.employees, bonus, SNAPSHOT_FILE, source)
+        except Exception as e:
+            print(f"Error writing {SNAPSHOT_FILE}: {str(e)}")
+
+    def write_final_database(self, path):
+        """Write the final data, bonuses included, into the emp_end_yr table of a SQLite database."""
+        print(f"Writing final data to {path}...")
+        try:
+            database = EmployeeDatabase(path)
+            bonus = array('d', [self.bonuses.get(emp_id, 0) for emp_id in self.employees.ids])
+            database.write_final_data(self.employees, bonus)
+            database.close()
+            print(f"{path} updated successfully.")
+        except Exception as e:
+            print(f"Error writing final data to {path}: {str(e)}")
+
+    def process_database(self, path):
+        """Read employee_data from a SQLite database and write the final data back into it."""
+        try:
+            database = EmployeeDatabase(path)
+            employees = database.read_employee_data()
+            database.close()
+        except Exception as e:
+            print(f"Error reading employee data from {path}: {str(e)}")
+            return
+        self.process_data(employees, write_final_data=False)
+        self.run_step('write_final_database', path)
+
+    def step_rows(self, name):
+        """Rows processed by a step: evaluation lines read for the extraction, else employees."""
+        if name == 'extract_evaluation_data':
+            return self.evaluation_lines
+        return len(self.employees)
+
+    def run_step(self, name, *args):
+        """Run the method called name under the instrumentation."""
+        return self.instrumentation.run(name, getattr(self, name), *args, rows=lambda: self.step_rows(name))
+
+    def process_data(self, employees=None, write_final_data=True):
+        """Main processing method; employees is an optional in-memory table from DataProcessor"""
         print("\nStarting performance metrics and bonus computation...")
 
-        self.extract_evaluation_data()
-        self.compute_evaluation_scores()
-        self.determine_bonus_eligibility()
-        self.write_final_data()
+        self.run_step('extract_evaluation_data')
+        self.run_step('compute_evaluation_scores', employees)
+        self.run_step('determine_bonus_eligibility')
+        if write_final_data:
+            self.run_step('write_final_data')
 
         print("\nProcessing complete!")
 
-processor = PerformanceMetricsProcessor()
-processor.process_data()
\ No newline at end of file
+    def process_data_incremental(self, state_file=METRICS_STATE_FILE, data_state_file=DATA_STATE_FILE):
+        """Recompute only what changed since the last incremental run.
+
+        Appended evaluation.txt lines are applied to the saved scores. The employees come
+        from DataProcessor's incremental state when employee_data.csv is the file that run
+        wrote, and from employee_data.csv otherwise. Bonuses are then updated only for the
+        employees whose inputs changed.
+        """
+        print("\nStarting incremental performance metrics and bonus computation...")
+        state = load_state(state_file)
+        evaluation, status, start, _ = scan_input('evaluation.txt', state['evaluation'] if state else None)
+        if state is not None and status != 'changed':
+            self.consultant_eval_scores = state['scores']
+            if status == 'appended':
+                self.run_step('extract_evaluation_data', start)
+        else:
+            self.run_step('extract_evaluation_data')
+
+        data_state = load_state(data_state_file)
+        output = scan_input(find_output('employee_data.csv'))[0]
+        if data_state is not None and output is not None and data_state['output'] == output:
+            self.run_step('compute_evaluation_scores', data_state['employees'])
+        else:
+            self.run_step('compute_evaluation_scores')
+
+        if state is not None:
+            threshold = self.run_step('update_bonus_eligibility', state['employees'], state['threshold'],
+                                      state['bonuses'])
+        else:
+            threshold = self.run_step('update_bonus_eligibility', None, None, None)
+        self.run_step('write_final_data')
+
+        save_state(state_file, {
+            'evaluation': evaluation,
+            'scores': self.consultant_eval_scores,
+            'employees': self.employees,
+            'threshold': threshold,
+            'bonuses': self.bonuses,
+        })
+        print("\nProcessing complete!")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute bonuses from employee_data.csv into emp_end_yr.txt")
+    parser.add_argument('--incremental', action='store_true',
+                        help=f"only recompute bonuses of employees changed since the last incremental run "
+                             f"(state kept in {METRICS_STATE_FILE})")
+    parser.add_argument('--db', metavar='PATH',
+                        help="read employee_data from this SQLite database and write the emp_end_yr table "
+                             "into it instead of emp_end_yr.txt")
+    parser.add_argument('--compress', choices=('gzip', 'zstd'),
+                        help="write emp_end_yr.txt.gz or emp_end_yr.txt.zst instead of emp_end_yr.txt")
+    parser.add_argument('--score-cache', metavar='PATH',
+                        help="load evaluation comment scores cached by an earlier run from PATH and save them back")
+    parser.add_argument('--score-cache-size', type=int, default=SCORE_CACHE_SIZE,
+                        help="keep at most this many distinct comments in the score cache (default: %(default)s)")
+    parser.add_argument('--timings', action='store_true',
+                        help="print wall time, rows, rows/s and peak memory for every step")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="run under cProfile and tracemalloc and write a JSON report of the steps, "
+                             "hottest functions and allocation sites to PATH")
+    args = parser.parse_args(argv)
+    if args.db and args.incremental:
+        parser.error("--db cannot be combined with --incremental")
+
+    processor = PerformanceMetricsProcessor(compression=args.compress, score_cache_size=args.score_cache_size)
+    if args.score_cache:
+        processor.score_cache.load(args.score_cache)
+    if args.profile:
+        processor.instrumentation.start_profile()
+    if args.db:
+        processor.process_database(args.db)
+    elif args.incremental:
+        processor.process_data_incremental()
+    else:
+        processor.process_data()
+    if args.profile:
+        processor.instrumentation.stop_profile()
+        processor.instrumentation.write_report(args.profile)
+    if args.score_cache:
+        processor.score_cache.save(args.score_cache)
+    if args.timings:
+        processor.instrumentation.print_summary()
+    if args.timings or args.score_cache:
+        print(f"\nComment score cache: {processor.score_cache.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,18 +4,203 @@ Data Processing and Parsing
 @author: jashwanthsrinivas
 """
 
-import csv
+import argparse
+import math
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
+from heapq import merge
+
+from employee_db import EmployeeDatabase
+from employee_table import EmployeeTable
+from error_sink import ERROR_LOG_FILE, SAMPLE_LIMIT, ErrorSink, format_ranges, missing_ranges
+from exact_sum import MAX_TERMS, expansion, two_sum_error
+from flat_file_reader import find_output, iter_lines, iter_table
+from flat_file_writer import write_csv
+from incremental_state import DATA_STATE_FILE, load_state, save_state, scan_input
+from instrumentation import Instrumentation
+from keyword_matcher import KeywordMatcher
+from score_cache import SCORE_CACHE_SIZE, ScoreCache, keyword_map_version, normalize
+
+
+EMPLOYEE_DATA_FIELDS = ('id', 'last_name', 'first_name', 'job_code', 'base_pay', 'hours', 'utilization',
+                        'evaluation_score', 'sales')
+INPUT_FILES = ('emp_beg_yr.txt', 'timesheet.txt', 'evaluation.txt', 'sales.txt')
+# Names the scoring rule in the score cache's version, next to the keyword map.
+SCORE_RULE = 'keywords found / negative keywords found, 10.0 without negatives'
+STEP_INPUTS = {'process_timesheets': 'timesheet.txt', 'process_evaluations': 'evaluation.txt',
+               'process_sales': 'sales.txt'}
+
+
+def _numbered_lines(path, start=0, first_line=0, lines_read=None, text=False):
+    """iter_lines from byte offset start, numbering lines as if reading from the top of the file.
+
+    Once exhausted, the number of the last line read is stored in lines_read[path].
+    """
+    line_no = 0
+    for line_no, line in iter_lines(path, start, text=text):
+        yield first_line + line_no, line
+    if lines_read is not None:
+        lines_read[path] = line_no
+
+
+def _parse_timesheet_line(line):
+    """Split a stripped timesheet line (bytes) into (employee ID, hours); raises ValueError."""
+    emp_id, hours = line.split(b',')
+    hours = float(hours)
+    if not math.isfinite(hours):
+        raise ValueError(f"hours must be finite: {hours}")
+    return int(emp_id), hours
+
+
+def _chunk_offsets(path, chunks):
+    """Split a file into up to `chunks` byte ranges that start and end on line boundaries."""
+    size = os.path.getsize(path)
+    offsets = [0]
+    with open(path, 'rb') as file:
+        for i in range(1, chunks):
+            target = size * i // chunks
+            if target <= offsets[-1]:
+                continue
+            file.seek(target - 1)
+            file.readline()
+            position = file.tell()
+            if position >= size:
+                break
+            if position > offsets[-1]:
+                offsets.append(position)
+    offsets.append(size)
+    return list(zip(offsets, offsets[1:]))
+
+
+# The employee IDs known to a timesheet worker process, set once by its initializer.
+_worker_ids = None
+
+
+def _add_rounding_error(errors, key, a, b, total):
+    """Keep the rounding error of total = a + b among the errors under key, so the sum stays exact."""
+    error = two_sum_error(a, b, total)
+    terms = errors.get(key)
+    if terms is None:
+        errors[key] = [error]
+    else:
+        terms.append(error)
+        if len(terms) >= MAX_TERMS:
+            terms[:] = expansion(terms)
+
+
+def _init_timesheet_worker(ids):
+    global _worker_ids
+    _worker_ids = frozenset(ids)
+
+
+def _aggregate_timesheet_chunk(path, start, end):
+    """Sum hours per known employee ID over one byte range of a timesheet file.
+
+    Returns (hours by ID, their rounding errors by ID, unknown (local line number, ID)
+    pairs, invalid (local line number, line) pairs, lines in the range).
+    """
+    known = _worker_ids
+    hours_by_id = {}
+    errors = {}
+    unknown = []
+    invalid = []
+    line_count = 0
+    for line_count, line in iter_lines(path, start, end, skip_blank=False):
+        if line:
+            try:
+                emp_id, hours = _parse_timesheet_line(line)
+            except ValueError:
+                invalid.append((line_count, line.decode()))
+                continue
+            if emp_id in known:
+                total = hours_by_id.get(emp_id, 0.0)
+                hours_by_id[emp_id] = new_total = total + hours
+                if new_total - total != hours or new_total - hours != total:
+                    _add_rounding_error(errors, emp_id, total, hours, new_total)
+            else:
+                unknown.append((line_count, emp_id))
+    return hours_by_id, errors, unknown, invalid, line_count
+
+
+def score_comment(matcher, comments):
+    """Score one evaluation comment from its positive and negative keywords."""
+    positive_count, negative_count = matcher.counts(comments)
+    if negative_count == 0:
+        return 10.0
+    return round(positive_count / negative_count, 1)
+
+
+def comment_score_cache(mapping, maxsize=SCORE_CACHE_SIZE):
+    """Return a ScoreCache scoring comments with score_comment over a KeywordMatcher of mapping."""
+    return ScoreCache(partial(score_comment, KeywordMatcher(mapping)),
+                      keyword_map_version(mapping, SCORE_RULE), maxsize)
+
+
+# The comment score cache of an evaluation scoring worker process, built once by its initializer.
+_worker_cache = None
+
+
+def _init_evaluation_worker(mapping, maxsize, entries):
+    global _worker_cache
+    _worker_cache = comment_score_cache(mapping, maxsize)
+    _worker_cache.update(entries)
+
+
+def _score_evaluation_chunk(path, start, end):
+    """Score the evaluation comments in one byte range of an evaluation file.
+
+    Returns (local line numbers, employee IDs and scores of the valid lines,
+    invalid (local line number, line) pairs, lines in the range, the exception
+    that stopped the range early or None, and the score cache's hits, misses and
+    newly scored (comment, score) pairs on the range), so the caller can replay the
+    range in line order exactly as the serial path would have processed it.
+    """
+    line_numbers, ids, scores = array('q'), array('q'), array('d')
+    invalid = []
+    line_count = 0
+    error = None
+    cache = _worker_cache
+    hits, misses = cache.hits, cache.misses
+    scored = []
+    try:
+        for line_count, line in iter_lines(path, start, end, skip_blank=False, text=True):
+            if not line:
+                continue
+            try:
+                emp_id, comments = line.split('#', 1)
+                emp_id = int(emp_id)
+            except ValueError:
+                invalid.append((line_count, line))
+                continue
+            line_numbers.append(line_count)
+            ids.append(emp_id)
+            before = cache.misses
+            score = cache.score(comments)
+            if cache.misses != before:
+                scored.append((normalize(comments), score))
+            scores.append(score)
+    except Exception as e:
+        error = e
+    return line_numbers, ids, scores, invalid, line_count, error, (cache.hits - hits, cache.misses - misses, scored)
+
 
 class DataProcessor:
-    def __init__(self):
-        self.employees = {}
-        self.timesheet_errors = set()
-        self.evaluation_errors = set()
-        self.sales_errors = set()
-        self.duplicate_errors = set()
-        self.all_file_ids = set()
-        self.missing_ids = set()
+    def __init__(self, workers=1, error_samples=SAMPLE_LIMIT, compression=None,
+                 score_cache_size=SCORE_CACHE_SIZE):
+        self.workers = workers
+        # None, 'gzip' or 'zstd'; a compressed employee_data.csv gets a .gz or .zst suffix.
+        self.compression = compression
+        self.employees = EmployeeTable()
+        # The rounding errors of the hours column by table row: the column plus its errors is the exact sum
+        # of an employee's timesheet hours.
+        self.hours_errors = {}
+        self.errors = ErrorSink(ERROR_LOG_FILE, error_samples)
+        self.instrumentation = Instrumentation('DataProcessor')
+        # Lines read from each input by the last pass over it, for the instrumentation.
+        self.lines_read = {}
         self.evaluation_score_mapping = {
             'excellent': 5,
             'good': 4,
@@ -26,123 +211,242 @@ class DataProcessor:
             'unreliable': 2,
             'late': 2
         }
+        self.score_cache = comment_score_cache(self.evaluation_score_mapping, score_cache_size)
 
     def read_employee_data(self):
         """Read and process initial employee data from emp_beg_yr.txt"""
         print("Reading employee data from emp_beg_yr.txt...")
+        ids, last_names, first_names, job_codes, base_pay = array('q'), [], [], [], array('d')
+        seen = set(self.employees.index)
         try:
-            with open('emp_beg_yr.txt', 'r') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
+            try:
+                for row in iter_table('emp_beg_yr.txt'):
                     emp_id = int(row['ID'])
-                    if emp_id in self.employees:
-                        self.duplicate_errors.add(emp_id)
+                    if emp_id in seen:
+                        self.errors.record('duplicate', emp_id, id=emp_id)
                     else:
-                        self.employees[emp_id] = {
-                            'id': emp_id,
-                            'last_name': row['LastName'],
-                            'first_name': row['FirstName'],
-                            'job_code': row['JobCode'],
-                            'base_pay': float(row['BasePay']),
-                            'hours': 0,
-                            'utilization': 0,
-                            'evaluation_score': 0,
-                            'sales': 0,
-                        }
-                        self.all_file_ids.add(emp_id)
-
-                # Find missing IDs in sequence
-                for i in range(min(self.all_file_ids), max(self.all_file_ids) + 1):
-                    if i not in self.all_file_ids:
-                        self.missing_ids.add(i)
+                        pay = float(row['BasePay'])
+                        seen.add(emp_id)
+                        ids.append(emp_id)
+                        last_names.append(row['LastName'])
+                        first_names.append(row['FirstName'])
+                        job_codes.append(row['JobCode'])
+                        base_pay.append(pay)
+            finally:
+                # Filled a column at a time; the employees read before any error are kept.
+                self.employees.extend(ids, last_names, first_names, job_codes, base_pay)
+
+            # Find missing IDs in sequence, as ranges between the sorted IDs
+            for first, last in missing_ranges(sorted(self.employees.index)):
+                self.errors.record('missing_ids', (first, last), first=first, last=last)
         except FileNotFoundError:
             print("Error: emp_beg_yr.txt file not found.")
         except Exception as e:
             print(f"Error reading employee data: {str(e)}")
 
-    def process_timesheets(self):
-        """Validate and process timesheet data."""
+    def parse_timesheets(self, lines):
+        """Turn timesheet lines into (line number, employee ID, hours) triples."""
+        for line_no, line in lines:
+            try:
+                yield (line_no,) + _parse_timesheet_line(line)
+            except ValueError:
+                print(f"Invalid record at line {line_no}: {line.decode()}")
+                self.errors.record('invalid_timesheet', line_no, line=line_no, text=line.decode())
+
+    def process_timesheets(self, start=0, first_line=0):
+        """Validate and process timesheet data, from byte offset start (line first_line + 1) on."""
         print("Processing timesheet data...")
         try:
-            with open('timesheet.txt', 'r') as file:
-                for line_no, line in enumerate(file, start=1):
-                    if line.strip():
-                        try:
-                            emp_id, hours = line.strip().split(',')
-                            emp_id = int(emp_id)
-                            hours = float(hours)
-
-                            if emp_id in self.employees:
-                                self.employees[emp_id]['hours'] += hours
-                            else:
-                                self.timesheet_errors.add(emp_id)
-                        except ValueError:
-                            print(f"Invalid record at line {line_no}: {line.strip()}")
+            if self.workers > 1 and start == 0:
+                self.process_timesheets_parallel('timesheet.txt')
+                return
+            index = self.employees.index
+            hours_column = self.employees.hours
+            hours_errors = self.hours_errors
+            try:
+                for line_no, emp_id, hours in self.parse_timesheets(
+                        _numbered_lines('timesheet.txt', start, first_line, self.lines_read)):
+                    row = index.get(emp_id)
+                    if row is not None:
+                        total = hours_column[row]
+                        hours_column[row] = new_total = total + hours
+                        # Sums of whole or half hours are exact; any other addition keeps its rounding error.
+                        if new_total - total != hours or new_total - hours != total:
+                            _add_rounding_error(hours_errors, row, total, hours, new_total)
+                    else:
+                        self.errors.record('timesheet', emp_id, id=emp_id, line=line_no)
+            finally:
+                self.store_hours()
         except Exception as e:
             print(f"Error processing timesheets: {str(e)}")
 
-    def process_evaluations(self):
-        """Process employee evaluation data from evaluation.txt"""
+    def process_timesheets_parallel(self, path):
+        """Aggregate timesheet hours over newline-aligned byte ranges in a process pool.
+
+        The ranges come back in file order and their invalid lines and unknown IDs are
+        replayed in line order, so printed messages and error records come out exactly
+        as from the serial path.
+        """
+        ranges = _chunk_offsets(path, self.workers * 4)
+        index = self.employees.index
+        hours_column = self.employees.hours
+        hours_errors = self.hours_errors
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_timesheet_worker,
+                                     initargs=(self.employees.ids,)) as pool:
+                results = pool.map(_aggregate_timesheet_chunk, *zip(*[(path, start, end) for start, end in ranges]))
+                first_line = 0
+                for hours_by_id, errors, unknown, invalid, line_count in results:
+                    for emp_id, hours in hours_by_id.items():
+                        row = index[emp_id]
+                        total = hours_column[row]
+                        hours_column[row] = new_total = total + hours
+                        if new_total - total != hours or new_total - hours != total:
+                            _add_rounding_error(hours_errors, row, total, hours, new_total)
+                    for emp_id, terms in errors.items():
+                        row_errors = hours_errors.setdefault(index[emp_id], [])
+                        row_errors += terms
+                        if len(row_errors) >= MAX_TERMS:
+                            row_errors[:] = expansion(row_errors)
+                    for line_no, emp_id, line in merge(((line_no, emp_id, None) for line_no, emp_id in unknown),
+                                                       ((line_no, None, line) for line_no, line in invalid)):
+                        line_no += first_line
+                        if emp_id is None:
+                            print(f"Invalid record at line {line_no}: {line}")
+                            self.errors.record('invalid_timesheet', line_no, line=line_no, text=line)
+                        else:
+                            self.errors.record('timesheet', emp_id, id=emp_id, line=line_no)
+                    first_line += line_count
+            self.lines_read[path] = first_line
+        finally:
+            self.store_hours()
+
+    def store_hours(self):
+        """Round the exact timesheet hours of every employee with rounding errors into the hours column."""
+        hours_column = self.employees.hours
+        for row, errors in self.hours_errors.items():
+            # The first term of an expansion is the correctly rounded sum, the others what it left out.
+            terms = expansion([hours_column[row]] + errors)
+            hours_column[row] = terms[0] if terms else 0.0
+            errors[:] = terms[1:]
+        self.employees.mark_changed()
+
+    def score_comment(self, comments):
+        """Score one evaluation comment from its positive and negative keywords, through the score cache."""
+        return self.score_cache.score(comments)
+
+    def parse_evaluations(self, lines):
+        """Turn evaluation lines into (line number, employee ID, comments) triples."""
+        for line_no, line in lines:
+            try:
+                emp_id, comments = line.split('#', 1)
+                yield line_no, int(emp_id), comments
+            except ValueError:
+                print(f"Invalid evaluation record at line {line_no}: {line}")
+                self.errors.record('invalid_evaluation', line_no, line=line_no, text=line)
+
+    def process_evaluations(self, start=0, first_line=0):
+        """Process employee evaluation data from evaluation.txt, from byte offset start on"""
         print("Processing evaluation data...")
         try:
-            with open('evaluation.txt', 'r') as file:
-                for line_no, line in enumerate(file, start=1):
-                    if line.strip():
-                        try:
-                            emp_id, comments = line.strip().split('#', 1)
-                            emp_id = int(emp_id)
-
-                            if emp_id in self.employees:
-                                positive_count = sum(keyword in comments.lower() for keyword in self.evaluation_score_mapping if keyword in self.evaluation_score_mapping and keyword in comments.lower())
-                                negative_count = sum(keyword in comments.lower() for keyword in self.evaluation_score_mapping if keyword in self.evaluation_score_mapping and keyword in comments.lower() and self.evaluation_score_mapping[keyword] < 4)
-                                if negative_count == 0:
-                                    score = 10.0
-                                else:
-                                    score = round(positive_count / negative_count, 1)
-                                self.employees[emp_id]['evaluation_score'] = score
-                            else:
-                                self.evaluation_errors.add((emp_id, line_no))
-                        except ValueError:
-                            print(f"Invalid evaluation record at line {line_no}: {line.strip()}")
+            if self.workers > 1 and start == 0:
+                self.process_evaluations_parallel('evaluation.txt')
+                return
+            index = self.employees.index
+            score_column = self.employees.evaluation_score
+            for line_no, emp_id, comments in self.parse_evaluations(
+                    _numbered_lines('evaluation.txt', start, first_line, self.lines_read, text=True)):
+                row = index.get(emp_id)
+                if row is not None:
+                    score_column[row] = self.score_comment(comments)
+                else:
+                    self.errors.record('evaluation', (emp_id, line_no), id=emp_id, line=line_no)
+            self.employees.mark_changed()
         except FileNotFoundError:
             print("Error: evaluation.txt file not found.")
         except Exception as e:
             print(f"Error processing evaluations: {str(e)}")
 
-    def process_sales(self):
-        """Process sales data from sales.txt"""
+    def process_evaluations_parallel(self, path):
+        """Score evaluation comments over newline-aligned byte ranges in a process pool.
+
+        The ranges come back in file order and each is replayed line by line, so scores,
+        printed messages and error records come out exactly as from the serial path.
+        """
+        ranges = _chunk_offsets(path, self.workers * 4)
+        index = self.employees.index
+        score_column = self.employees.evaluation_score
+        cache = self.score_cache
+        # Each worker starts from the comments cached so far; their hits and misses are added up here.
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_evaluation_worker,
+                                 initargs=(self.evaluation_score_mapping, cache.maxsize,
+                                           list(cache.entries.items()))) as pool:
+            results = pool.map(_score_evaluation_chunk, *zip(*[(path, start, end) for start, end in ranges]))
+            first_line = 0
+            try:
+                for line_numbers, ids, scores, invalid, line_count, error, (hits, misses, scored) in results:
+                    cache.hits += hits
+                    cache.misses += misses
+                    cache.update(scored)
+                    valid = zip(line_numbers, ids, scores)
+                    for line_no, emp_id, score in merge(valid, ((line_no, None, line) for line_no, line in invalid)):
+                        line_no += first_line
+                        if emp_id is None:
+                            print(f"Invalid evaluation record at line {line_no}: {score}")
+                            self.errors.record('invalid_evaluation', line_no, line=line_no, text=score)
+                            continue
+                        row = index.get(emp_id)
+                        if row is not None:
+                            score_column[row] = score
+                        else:
+                            self.errors.record('evaluation', (emp_id, line_no), id=emp_id, line=line_no)
+                    if error is not None:
+                        raise error
+                    first_line += line_count
+            finally:
+                self.employees.mark_changed()
+        self.lines_read[path] = first_line
+
+    def parse_sales(self, lines):
+        """Turn sales lines into (line number, employee ID, sales) triples."""
+        for line_no, line in lines:
+            try:
+                emp_id, sales = line.split(b',')
+                yield line_no, int(emp_id), float(sales)
+            except ValueError:
+                print(f"Invalid sales record at line {line_no}: {line.decode()}")
+                self.errors.record('invalid_sales', line_no, line=line_no, text=line.decode())
+
+    def process_sales(self, start=0, first_line=0):
+        """Process sales data from sales.txt, from byte offset start on"""
         print("Processing sales data...")
         try:
-            with open('sales.txt', 'r') as file:
-                for line_no, line in enumerate(file, start=1):
-                    if line.strip():
-                        try:
-                            emp_id, sales = line.strip().split(',')
-                            emp_id = int(emp_id)
-                            sales = float(sales)
-
-                            if emp_id in self.employees and self.employees[emp_id]['job_code'] == 'D':
-                                self.employees[emp_id]['sales'] = sales
-                            else:
-                                self.sales_errors.add((emp_id, line_no))
-                        except ValueError:
-                            print(f"Invalid sales record at line {line_no}: {line.strip()}")
+            index = self.employees.index
+            director = self.employees.job_code_id('D')
+            for line_no, emp_id, sales in self.parse_sales(_numbered_lines('sales.txt', start, first_line, self.lines_read)):
+                row = index.get(emp_id)
+                if row is not None and self.employees.job_codes[row] == director:
+                    self.employees.sales[row] = sales
+                else:
+                    self.errors.record('sales', (emp_id, line_no), id=emp_id, line=line_no)
+            self.employees.mark_changed()
         except Exception as e:
             print(f"Error processing sales: {str(e)}")
 
     def calculate_utilization(self):
         """Calculate utilization rates"""
         print("Calculating utilization rates...")
-        total_hours = 0
-        total_utilization = 0
-        for emp_data in self.employees.values():
+        utilization = self.employees.utilization
+        for row, hours in enumerate(self.employees.hours):
             try:
-                rate = (emp_data['hours'] / 2250) * 100
-                emp_data['utilization'] = min(round(rate, 2), 100)
-                total_hours += emp_data['hours']
-                total_utilization += emp_data['utilization']
+                rate = (hours / 2250) * 100
+                utilization[row] = min(round(rate, 2), 100)
             except Exception as e:
                 print(f"Error calculating utilization: {str(e)}")
+        self.employees.mark_changed()
+        # Added up exactly, so the totals do not depend on how the hours were aggregated.
+        total_hours = math.fsum(self.employees.hours)
+        total_utilization = math.fsum(utilization)
 
         average_utilization = total_utilization / len(self.employees)
         print(f"\nUtilization Statistics:")
@@ -151,77 +455,219 @@ class DataProcessor:
         print(f"Average Utilization: {average_utilization:.2f}%")
 
     def write_error_log(self):
-        """Write error log."""
+        """Write the error.txt summary and close the streamed error log."""
         print("Writing error log...")
         try:
             with open('error.txt', 'w') as file:
                 current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 file.write(f"Error Log Generated at: {current_time}\n\n")
 
-                if self.timesheet_errors or self.missing_ids:
+                errors = self.errors
+                if errors.counts['timesheet'] or errors.counts['missing_ids']:
                     file.write("Timesheet Errors:\n")
-                    for emp_id in sorted(self.timesheet_errors):
+                    for emp_id in errors.sorted_samples('timesheet'):
                         file.write(f"Timesheet error: Employee ID {emp_id} not found.\n")
-                    if self.missing_ids:
+                    self.write_truncation_note(file, 'timesheet')
+                    if errors.counts['missing_ids']:
                         file.write("\nMissing Employee IDs: {")
-                        file.write(", ".join(map(str, sorted(self.missing_ids))))
+                        file.write(format_ranges(errors.sorted_samples('missing_ids')))
                         file.write("}\n")
+                        self.write_truncation_note(file, 'missing_ids')
                     file.write("\n")
 
-                if self.evaluation_errors:
+                if errors.counts['evaluation']:
                     file.write("Evaluation Errors:\n")
-                    for emp_id, line in sorted(self.evaluation_errors):
+                    for emp_id, line in errors.sorted_samples('evaluation'):
                         file.write(f"Evaluation error: Employee ID {emp_id} not found at line {line}.\n")
+                    self.write_truncation_note(file, 'evaluation')
                     file.write("\n")
 
-                if self.sales_errors:
+                if errors.counts['sales']:
                     file.write("Sales Errors:\n")
-                    for emp_id, line in sorted(self.sales_errors):
+                    for emp_id, line in errors.sorted_samples('sales'):
                         file.write(f"Sales error: Employee ID {emp_id} not found at line {line}.\n")
+                    self.write_truncation_note(file, 'sales')
                     file.write("\n")
 
-                if self.duplicate_errors:
+                if errors.counts['duplicate']:
                     file.write("Duplicate Errors:\n")
-                    for emp_id in sorted(self.duplicate_errors):
+                    for emp_id in errors.sorted_samples('duplicate'):
                         file.write(f"Duplicate error: Employee ID {emp_id} found multiple times.\n")
+                    self.write_truncation_note(file, 'duplicate')
                     file.write("\n")
         except Exception as e:
             print(f"Error writing error log: {str(e)}")
+        self.errors.close()
+
+    def write_truncation_note(self, file, category):
+        """Point from a category whose samples were capped in error.txt to the full error log."""
+        if category in self.errors.truncated:
+            file.write(f"... {self.errors.counts[category]} records in total, "
+                       f"only the {self.errors.sample_limit} smallest distinct ones are listed; see {self.errors.path}.\n")
 
     def write_employee_data(self):
         """Write processed employee data to a CSV file"""
         print("Writing employee data to a CSV file...")
+        table = self.employees
+        labels = table.job_code_labels
+        rows = zip(table.ids, table.last_names, table.first_names, (labels[code] for code in table.job_codes),
+                   table.base_pay, table.hours, table.utilization, table.evaluation_score, table.sales)
         try:
-            with open('employee_data.csv', 'w', newline='') as file:
-                fieldnames = ['id', 'last_name', 'first_name', 'job_code', 'base_pay', 'hours', 'utilization', 'evaluation_score', 'sales']
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                writer.writeheader()
-                for emp_data in self.employees.values():
-                    writer.writerow({
-                        'id': emp_data['id'],
-                        'last_name': emp_data['last_name'],
-                        'first_name': emp_data['first_name'],
-                        'job_code': emp_data['job_code'],
-                        'base_pay': emp_data['base_pay'],
-                        'hours': emp_data['hours'],
-                        'utilization': emp_data['utilization'],
-                        'evaluation_score': emp_data['evaluation_score'],
-                        'sales': emp_data['sales']
-                    })
+            write_csv('employee_data.csv', EMPLOYEE_DATA_FIELDS, rows, self.compression)
         except Exception as e:
             print(f"Error writing employee data to CSV: {str(e)}")
 
-    def process_data(self):
-        """Main processing method"""
+    def write_employee_database(self, path):
+        """Write the processed employee data into the employee_data table of a SQLite database"""
+        print(f"Writing employee data to {path}...")
+        try:
+            database = EmployeeDatabase(path)
+            database.write_employee_data(self.employees)
+            database.close()
+        except Exception as e:
+            print(f"Error writing employee data to {path}: {str(e)}")
+
+    def process_data(self, write_employee_data=True):
+        """Main processing method; employee_data.csv is skipped when write_employee_data is False"""
         print("\nStarting data processing...")
-        self.read_employee_data()
-        self.process_timesheets()
-        self.process_evaluations()
-        self.process_sales()
-        self.calculate_utilization()
-        self.write_error_log()
-        self.write_employee_data()
+        self.errors.open()
+        self.run_step('read_employee_data')
+        self.run_step('process_timesheets')
+        self.run_step('process_evaluations')
+        self.run_step('process_sales')
+        self.run_step('calculate_utilization')
+        self.run_step('write_error_log')
+        if write_employee_data:
+            self.run_step('write_employee_data')
         print("\nProcessing complete!")
 
-processor = DataProcessor()
-processor.process_data()
\ No newline at end of file
+    def step_rows(self, name):
+        """Rows processed by a step: lines read for the input files, errors for the log, else employees."""
+        if name in STEP_INPUTS:
+            return self.lines_read.get(STEP_INPUTS[name], 0)
+        if name == 'write_error_log':
+            return sum(self.errors.counts.values())
+        return len(self.employees)
+
+    def run_step(self, name, *args):
+        """Run the method called name under the instrumentation."""
+        self.lines_read.pop(STEP_INPUTS.get(name), None)
+        return self.instrumentation.run(name, getattr(self, name), *args, rows=lambda: self.step_rows(name))
+
+    def reset_input(self, name):
+        """Forget everything read from one of timesheet.txt, evaluation.txt or sales.txt."""
+        if name == 'timesheet.txt':
+            self.employees.hours = array('d', bytes(8 * len(self.employees)))
+            self.hours_errors = {}
+            category = 'timesheet'
+        elif name == 'evaluation.txt':
+            self.employees.evaluation_score = array('d', bytes(8 * len(self.employees)))
+            category = 'evaluation'
+        elif name == 'sales.txt':
+            self.employees.sales = array('d', bytes(8 * len(self.employees)))
+            category = 'sales'
+        else:
+            return
+        self.errors.reset(category)
+        self.errors.reset(f"invalid_{category}")
+        self.employees.mark_changed()
+
+    def process_data_incremental(self, state_file=DATA_STATE_FILE):
+        """Process only what changed in the input files since the last incremental run.
+
+        Lines appended to timesheet.txt, evaluation.txt or sales.txt are applied on top of
+        the per-employee aggregates saved in state_file. A file changed in any other way is
+        reprocessed on its own; a changed emp_beg_yr.txt means processing everything.
+        """
+        state = load_state(state_file)
+        previous = state['inputs'] if state else {}
+        scans = {name: scan_input(name, previous.get(name)) for name in INPUT_FILES}
+
+        if state is None or scans['emp_beg_yr.txt'][1] != 'unchanged':
+            print("\nNo saved state for the current emp_beg_yr.txt, processing everything.")
+            self.process_data()
+        else:
+            print("\nStarting incremental data processing...")
+            self.employees = state['employees']
+            # States saved before exact hours only have the rounded column to start from.
+            self.hours_errors = state.get('hours_errors', {})
+            self.errors.restore(state['errors'])
+            # The records of earlier runs are already in the error log; new ones are appended to them.
+            self.errors.open(append=True)
+            for step, name in STEP_INPUTS.items():
+                fingerprint, status, start, first_line = scans[name]
+                if status == 'unchanged':
+                    print(f"{name} unchanged.")
+                elif status == 'appended':
+                    appended = fingerprint['lines'] + (not fingerprint['ends_with_newline']) - first_line
+                    print(f"{name}: {appended} appended line(s).")
+                    self.run_step(step, start, first_line)
+                else:
+                    print(f"{name} changed, reprocessing it.")
+                    self.reset_input(name)
+                    self.run_step(step)
+            self.run_step('calculate_utilization')
+            self.run_step('write_error_log')
+            self.run_step('write_employee_data')
+            print("\nProcessing complete!")
+
+        save_state(state_file, {
+            'inputs': {name: scan[0] for name, scan in scans.items()},
+            'output': scan_input(find_output('employee_data.csv'))[0],
+            'employees': self.employees,
+            'hours_errors': self.hours_errors,
+            'errors': self.errors.state(),
+        })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Process raw employee data into employee_data.csv")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="aggregate timesheet.txt in this many worker processes")
+    parser.add_argument('--incremental', action='store_true',
+                        help=f"only process input lines added since the last incremental run "
+                             f"(state kept in {DATA_STATE_FILE})")
+    parser.add_argument('--error-samples', type=int, default=SAMPLE_LIMIT,
+                        help=f"list only this many smallest distinct errors per category in error.txt; every error "
+                             f"is still streamed to {ERROR_LOG_FILE}")
+    parser.add_argument('--db', metavar='PATH',
+                        help="write the employees into the employee_data table of this SQLite database "
+                             "instead of employee_data.csv")
+    parser.add_argument('--compress', choices=('gzip', 'zstd'),
+                        help="write employee_data.csv.gz or employee_data.csv.zst instead of employee_data.csv")
+    parser.add_argument('--score-cache', metavar='PATH',
+                        help="load evaluation comment scores cached by an earlier run from PATH and save them back")
+    parser.add_argument('--score-cache-size', type=int, default=SCORE_CACHE_SIZE,
+                        help="keep at most this many distinct comments in the score cache (default: %(default)s)")
+    parser.add_argument('--timings', action='store_true',
+                        help="print wall time, rows, rows/s and peak memory for every step")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="run under cProfile and tracemalloc and write a JSON report of the steps, "
+                             "hottest functions and allocation sites to PATH")
+    args = parser.parse_args(argv)
+
+    processor = DataProcessor(workers=args.workers, error_samples=args.error_samples,
+                              compression=args.compress, score_cache_size=args.score_cache_size)
+    if args.score_cache:
+        processor.score_cache.load(args.score_cache)
+    if args.profile:
+        processor.instrumentation.start_profile()
+    if args.incremental:
+        processor.process_data_incremental()
+    else:
+        processor.process_data(write_employee_data=args.db is None)
+    if args.db:
+        processor.run_step('write_employee_database', args.db)
+    if args.profile:
+        processor.instrumentation.stop_profile()
+        processor.instrumentation.write_report(args.profile)
+    if args.score_cache:
+        processor.score_cache.save(args.score_cache)
+    if args.timings:
+        processor.instrumentation.print_summary()
+    if args.timings or args.score_cache:
+        print(f"\nComment score cache: {processor.score_cache.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Batch runs over partitioned input sets (business units, years)
+
+Every directory under the partitions directory that holds an emp_beg_yr.txt
+is one partition, e.g. partitions/2023/consulting. Partitions run in a
+process pool; each worker changes into the partition's own output directory,
+links the partition's input files there and runs DataProcessor and
+PerformanceMetricsProcessor on them, handing the EmployeeTable over in memory
+as pipeline.py does. The stages' console output goes to run.log in that
+directory. When every partition is done, a summary of employees, hours,
+sales, bonus payout and errors per partition (and over all of them) is
+printed and written to batch_summary.csv in the output directory.
+"""
+
+import argparse
+import contextlib
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from Project_Shukla_v2 import PerformanceMetricsProcessor
+from Project_Srinivas_v3 import INPUT_FILES, DataProcessor
+from error_sink import CATEGORIES
+from exact_sum import ExactSum
+from flat_file_writer import write_csv
+
+SUMMARY_FILE = 'batch_summary.csv'
+RUN_LOG = 'run.log'
+ERROR_FIELDS = tuple(f"{category}_errors" for category in CATEGORIES)
+SUMMARY_FIELDS = ('partition', 'status', 'employees', 'hours', 'sales', 'bonus_payout', 'bonus_employees',
+                  'errors') + ERROR_FIELDS + ('seconds',)
+# Summed exactly, so the TOTAL row is the same whichever order the partitions are added in.
+EXACT_FIELDS = ('hours', 'sales', 'bonus_payout')
+
+
+def find_partitions(root, exclude=None):
+    """Return the (name, directory) of every directory under root with an emp_beg_yr.txt, sorted by name.
+
+    The directory tree under exclude (the batch's own output directory) is skipped, as is any
+    directory holding a batch_summary.csv, i.e. the output of an earlier batch.
+    """
+    partitions = []
+    for directory, subdirectories, files in os.walk(root):
+        if exclude is not None and os.path.abspath(directory) == exclude or SUMMARY_FILE in files:
+            subdirectories.clear()
+            continue
+        if 'emp_beg_yr.txt' in files:
+            name = os.path.relpath(directory, root)
+            partitions.append((name.replace(os.sep, '/'), directory))
+    return sorted(partitions)
+
+
+def link_inputs(source, target):
+    """Make the input files of source visible in target, symlinked or, where that fails, copied."""
+    for name in INPUT_FILES:
+        path = os.path.join(source, name)
+        link = os.path.join(target, name)
+        if os.path.exists(path) and os.path.exists(link) and os.path.samefile(path, link):
+            continue
+        if os.path.lexists(link):
+            os.remove(link)
+        if not os.path.exists(path):
+            continue
+        try:
+            os.symlink(os.path.abspath(path), link)
+        except OSError:
+            shutil.copyfile(path, link)
+
+
+def run_partition(name, source, target, compression=None):
+    """Run both processing stages on one partition in its output directory and return its summary row."""
+    start = time.perf_counter()
+    summary = dict.fromkeys(SUMMARY_FIELDS, 0)
+    summary.update(partition=name, status='ok')
+    cwd = os.getcwd()
+    try:
+        os.makedirs(target, exist_ok=True)
+        link_inputs(source, target)
+        os.chdir(target)
+        with open(RUN_LOG, 'w') as log, contextlib.redirect_stdout(log):
+            processor = DataProcessor(compression=compression)
+            processor.process_data()
+            metrics = PerformanceMetricsProcessor(compression=compression)
+            metrics.process_data(employees=processor.employees)
+
+        table = metrics.employees
+        sums = {'hours': ExactSum(table.hours), 'sales': ExactSum(table.sales),
+                'bonus_payout': ExactSum(list(metrics.bonuses.values()))}
+        summary.update((field, total.value) for field, total in sums.items())
+        summary.update(employees=len(table), bonus_employees=len(metrics.bonuses),
+                       errors=sum(processor.errors.counts.values()), sums=sums)
+        summary.update((field, processor.errors.counts[category])
+                       for field, category in zip(ERROR_FIELDS, CATEGORIES))
+    except Exception as e:
+        summary['status'] = f"failed: {e}"
+    finally:
+        os.chdir(cwd)
+    summary['seconds'] = round(time.perf_counter() - start, 3)
+    return summary
+
+
+def total_row(summaries):
+    """Add up the numeric columns of every partition's summary."""
+    total = dict.fromkeys(SUMMARY_FIELDS, 0)
+    failed = sum(summary['status'] != 'ok' for summary in summaries)
+    total.update(partition='TOTAL', status=f"{failed} failed" if failed else 'ok')
+    for field in SUMMARY_FIELDS[2:]:
+        if field in EXACT_FIELDS:
+            exact = ExactSum()
+            for summary in summaries:
+                if 'sums' in summary:
+                    exact.merge(summary['sums'][field])
+            total[field] = exact.value
+        else:
+            total[field] = sum(summary[field] for summary in summaries)
+    total['seconds'] = round(total['seconds'], 3)
+    return total
+
+
+def run_batch(root, output, workers=1, compression=None):
+    """Run every partition under root into the matching directory under output; returns the summaries by name."""
+    output = os.path.abspath(output)
+    partitions = find_partitions(root, exclude=output)
+    if not partitions:
+        print(f"No partitions with an emp_beg_yr.txt found under {root}.")
+        return []
+    print(f"Running {len(partitions)} partition(s) with {workers} worker process(es)...")
+    summaries = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_partition, name, os.path.abspath(source), os.path.join(output, name), compression)
+                   for name, source in partitions]
+        for done, future in enumerate(as_completed(futures), 1):
+            summary = future.result()
+            summaries.append(summary)
+            print(f"[{done}/{len(partitions)}] {summary['partition']}: {summary['status']}, "
+                  f"{summary['employees']} employees, {summary['errors']} errors ({summary['seconds']:.2f}s)")
+    summaries.sort(key=lambda summary: summary['partition'])
+    return summaries
+
+
+def print_summary(summaries):
+    rows = summaries + [total_row(summaries)]
+    width = max(len('Partition'), *(len(row['partition']) for row in rows))
+    print(f"\n{'Partition':<{width}} {'Employees':>10} {'Hours':>14} {'Sales':>16} {'Bonus Payout':>16} "
+          f"{'Bonuses':>8} {'Errors':>8}  Status")
+    for row in rows:
+        print(f"{row['partition']:<{width}} {row['employees']:>10} {row['hours']:>14.2f} {row['sales']:>16.2f} "
+              f"{row['bonus_payout']:>16.2f} {row['bonus_employees']:>8} {row['errors']:>8}  {row['status']}")
+
+
+def write_summary(summaries, path):
+    rows = summaries + [total_row(summaries)]
+    write_csv(path, SUMMARY_FIELDS, ([row[field] for field in SUMMARY_FIELDS] for row in rows),
+              lineterminator='\n')
+    print(f"\nBatch summary written to {path}.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run data processing and bonus computation over every input "
+                                                 "partition under a directory")
+    parser.add_argument('partitions',
+                        help="directory whose subdirectories (at any depth) with an emp_beg_yr.txt are partitions")
+    parser.add_argument('--output', default='batch_output',
+                        help="write each partition's outputs to the same relative path under this directory "
+                             "(default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="run this many partitions at a time in worker processes (default: CPU count)")
+    parser.add_argument('--compress', choices=('gzip', 'zstd'),
+                        help="write employee_data.csv and emp_end_yr.txt compressed")
+    args = parser.parse_args(argv)
+
+    summaries = run_batch(args.partitions, args.output, workers=args.workers, compression=args.compress)
+    if summaries:
+        print_summary(summaries)
+        write_summary(summaries, os.path.join(args.output, SUMMARY_FILE))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Time to the first ID search: blocking load_data vs. start_loading
+
+Writes emp_end_yr.txt without its binary snapshot, so both paths parse the
+CSV, then measures how long a fresh UserInteraction takes to answer an ID
+search for an employee near the top of the file, and how long the
+background load takes to finish (it also builds the statistics that the first
+analytics query would otherwise build).
+
+Run from the repository root:
+    python -m benchmarks.background_loading
+"""
+
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+from Project_Shukla_v2 import PerformanceMetricsProcessor
+from benchmarks.synthetic import FIRST_NAMES, LAST_NAMES
+from ketan_new_v3 import UserInteraction
+from table_snapshot import SNAPSHOT_FILE
+
+EMPLOYEES = 300000
+SEARCH_ID = 101 + 1000
+
+
+def blocking():
+    start = time.perf_counter()
+    ui = UserInteraction()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ui.load_data()
+    found = ui.find_employees(emp_id=str(SEARCH_ID))
+    return found, time.perf_counter() - start
+
+
+def background():
+    start = time.perf_counter()
+    ui = UserInteraction()
+    ui.start_loading()
+    found = []
+    while not found:
+        with ui.data_lock:
+            found = ui.find_employees(emp_id=str(SEARCH_ID))
+        if not found:
+            time.sleep(0.001)
+    first = time.perf_counter() - start
+    ui.loader.join()
+    return found, first, time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(0)
+    processor = PerformanceMetricsProcessor()
+    for emp_id in range(101, 101 + EMPLOYEES):
+        job_code = rng.choice('CCCCD')
+        processor.employees.add(emp_id, rng.choice(LAST_NAMES), rng.choice(FIRST_NAMES), job_code,
+                                float(rng.randint(60000, 400000)), utilization=round(rng.uniform(0, 100), 2),
+                                evaluation_score=float(rng.randint(0, 5)),
+                                sales=float(rng.randint(0, 400) * 5000) if job_code == 'D' else 0.0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.determine_bonus_eligibility()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                processor.write_final_data()
+            os.remove(SNAPSHOT_FILE)
+            open('error.txt', 'w').close()
+            expected, blocking_time = blocking()
+            actual, first_time, total_time = background()
+        finally:
+            os.chdir(cwd)
+
+    assert actual == expected
+    print(f"{EMPLOYEES} employees: ID search answered after {blocking_time:.2f}s with load_data, "
+          f"after {first_time:.3f}s with start_loading (background load finished in {total_time:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Partitions one after another vs. batch_runner's process pool
+
+Writes seeded input sets for several partitions (two years of a few
+business units), runs them one at a time with batch_runner.run_partition in
+this process, then with run_batch in 2 and 4 worker processes, checking every
+partition's emp_end_yr.txt and summary, and the totals over all of them, come
+out identical.
+
+Run from the repository root:
+    python -m benchmarks.batch_runner
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from batch_runner import find_partitions, run_batch, run_partition, total_row
+from benchmarks.synthetic import write_inputs
+
+YEARS = ('2023', '2024')
+UNITS = ('consulting', 'sales', 'operations', 'support')
+EMPLOYEES = 20000
+WORKERS = (2, 4)
+
+
+def outputs(directory, summaries):
+    """Return each partition's emp_end_yr.txt and summary, and the TOTAL row, without timings and exact sums."""
+    result = {'TOTAL': {key: value for key, value in total_row(summaries).items() if key != 'seconds'}}
+    for summary in summaries:
+        with open(os.path.join(directory, summary['partition'], 'emp_end_yr.txt'), 'rb') as file:
+            result[summary['partition']] = (file.read(), {key: value for key, value in summary.items()
+                                                          if key not in ('seconds', 'sums')})
+    return result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        root = os.path.join(directory, 'partitions')
+        for seed, (year, unit) in enumerate((year, unit) for year in YEARS for unit in UNITS):
+            path = os.path.join(root, year, unit)
+            os.makedirs(path)
+            write_inputs(path, EMPLOYEES, EMPLOYEES * 4, seed=seed, invalid_ratio=0.01)
+
+        output = os.path.join(directory, 'serial')
+        start = time.perf_counter()
+        summaries = [run_partition(name, source, os.path.join(output, name)) for name, source in find_partitions(root)]
+        serial_time = time.perf_counter() - start
+        expected = outputs(output, summaries)
+
+        seconds = {}
+        for workers in WORKERS:
+            output = os.path.join(directory, f"workers_{workers}")
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                summaries = run_batch(root, output, workers=workers)
+            seconds[workers] = time.perf_counter() - start
+            assert outputs(output, summaries) == expected, workers
+
+    print(f"{len(summaries)} partitions of {EMPLOYEES} employees with {os.cpu_count()} CPU(s): "
+          f"one at a time {serial_time:.2f}s, " +
+          ", ".join(f"{workers} workers {elapsed:.2f}s" for workers, elapsed in seconds.items()))
+
+
+if __name__ == "__main__":
+    main()
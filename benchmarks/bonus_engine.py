@@ -0,0 +1,78 @@
+"""
+Per-employee bonus loop vs. the batch bonus engine
+
+Run from the repository root:
+    python -m benchmarks.bonus_engine
+"""
+
+import random
+import time
+
+from bonus_engine import compute_bonuses
+from employee_table import EmployeeTable
+
+EMPLOYEES = 1000000
+
+
+def synthetic_employees():
+    rng = random.Random(0)
+    employees = {}
+    for emp_id in range(101, 101 + EMPLOYEES):
+        job_code = rng.choice('CCCCD')
+        employees[emp_id] = {
+            'id': emp_id,
+            'job_code': job_code,
+            'base_pay': float(rng.randint(60000, 600000)),
+            'utilization': round(rng.uniform(0, 100), 2),
+            'evaluation_score': float(rng.randint(0, 5)) if job_code == 'C' else 0.0,
+            'sales': float(rng.randint(0, 400) * 5000) if job_code == 'D' else 0.0,
+        }
+    return employees
+
+
+def calculate_bonus(emp_data, bonus_rate):
+    if emp_data['job_code'] == 'C' and emp_data['evaluation_score'] != 'N/A':
+        return min(emp_data['base_pay'] * bonus_rate, 50000)
+    elif emp_data['job_code'] == 'D':
+        return min(emp_data.get('sales', 0) * bonus_rate, 150000)
+    return 0
+
+
+def per_employee_loop(employees):
+    """The loop previously used by PerformanceMetricsProcessor.determine_bonus_eligibility."""
+    bonuses = {}
+    utilization_values = [emp['utilization'] for emp in employees.values() if emp['job_code'] == 'C']
+    threshold = sorted(utilization_values)[int(len(utilization_values) * 0.65)]
+    for emp_id, emp_data in employees.items():
+        if emp_data['job_code'] == 'C' and emp_data['utilization'] >= threshold and emp_data[
+                'evaluation_score'] != 'N/A' and emp_data['evaluation_score'] >= 3.5:
+            bonuses[emp_id] = calculate_bonus(emp_data, 0.1)
+        elif emp_data['job_code'] == 'D':
+            bonuses[emp_id] = calculate_bonus(emp_data, 0.15)
+    return bonuses
+
+
+def main():
+    employees = synthetic_employees()
+    table = EmployeeTable()
+    for emp in employees.values():
+        table.add(emp['id'], '', '', emp['job_code'], emp['base_pay'], utilization=emp['utilization'],
+                  evaluation_score=emp['evaluation_score'], sales=emp['sales'])
+
+    start = time.perf_counter()
+    expected = per_employee_loop(employees)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bonuses, eligible = compute_bonuses(table.job_codes, table.base_pay, table.sales, table.evaluation_score,
+                                        table.utilization, table.job_code_id('C'), table.job_code_id('D'))
+    engine_time = time.perf_counter() - start
+
+    actual = {emp_id: bonus for emp_id, bonus, is_eligible in zip(table.ids, bonuses, eligible) if is_eligible}
+    assert actual == expected
+    print(f"{EMPLOYEES} employees: per-employee loop {loop_time:.3f}s, "
+          f"batch engine {engine_time:.3f}s ({loop_time / engine_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
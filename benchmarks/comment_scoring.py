@@ -0,0 +1,48 @@
+"""
+Per-keyword comment scan vs. the compiled KeywordMatcher
+
+Run from the repository root:
+    python -m benchmarks.comment_scoring
+"""
+
+import random
+import time
+
+from keyword_matcher import KeywordMatcher
+from benchmarks.synthetic import COMMENTS
+
+MAPPING = {
+    'excellent': 5, 'good': 4, 'dependable': 4, 'prompt': 4,
+    'poor': 2, 'error': 2, 'unreliable': 2, 'late': 2,
+}
+LARGE_MAPPING = dict(MAPPING, **{f"keyword{i}": 2 + i % 3 for i in range(40)})
+COMMENT_COUNT = 200000
+
+
+def per_keyword_counts(mapping, comments):
+    positive_count = sum(keyword in comments.lower() for keyword in mapping if keyword in mapping and keyword in comments.lower())
+    negative_count = sum(keyword in comments.lower() for keyword in mapping if keyword in mapping and keyword in comments.lower() and mapping[keyword] < 4)
+    return positive_count, negative_count
+
+
+def main():
+    rng = random.Random(0)
+    comments = [' '.join(rng.sample(COMMENTS, 3)) for _ in range(COMMENT_COUNT)]
+    for mapping in (MAPPING, LARGE_MAPPING):
+        matcher = KeywordMatcher(mapping)
+
+        start = time.perf_counter()
+        expected = [per_keyword_counts(mapping, comment) for comment in comments]
+        per_keyword = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = [matcher.counts(comment) for comment in comments]
+        compiled = time.perf_counter() - start
+
+        assert actual == expected
+        print(f"{COMMENT_COUNT} comments, {len(mapping)} keywords: per-keyword scan {per_keyword:.3f}s, "
+              f"compiled matcher {compiled:.3f}s ({per_keyword / compiled:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
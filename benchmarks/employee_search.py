@@ -0,0 +1,79 @@
+"""
+Linear-scan search_employee vs. EmployeeIndex
+
+Run from the repository root:
+    python -m benchmarks.employee_search
+"""
+
+import random
+import time
+
+from benchmarks.synthetic import FIRST_NAMES
+from employee_index import EmployeeIndex
+from employee_table import EmployeeTable
+
+EMPLOYEES = 500000
+REPEAT = 5
+SYLLABLES = ['an', 'ber', 'cit', 'dor', 'el', 'fra', 'gun', 'har', 'is', 'jo', 'ka', 'lin', 'mo', 'nor', 'os',
+             'per', 'qui', 'ros', 'som', 'tru', 'ul', 'val', 'wes', 'xan', 'yor', 'zel', 'bach', 'dy', 'eaux',
+             'gren', 'hof', 'lund', 'mann', 'rich', 'son', 'ton', 'ville', 'worth']
+
+
+def last_name(rng):
+    """Letter-only surnames from random syllables, so most full names are distinct as in a real workforce."""
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def linear_scan(table, emp_id=None, name=None, job_type=None):
+    """The scan previously done by UserInteraction.search_employee."""
+    rows = []
+    for row in range(len(table)):
+        if (
+                (emp_id and str(table.ids[row]) == str(emp_id)) or
+                (name and name.lower() in f"{table.first_names[row]} {table.last_names[row]}".lower()) or
+                (job_type and table.job_code(row) == job_type.upper())
+        ):
+            rows.append(row)
+    return rows
+
+
+def best_of(search):
+    """Return (result, fastest wall time) over REPEAT runs."""
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = search()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    rng = random.Random(0)
+    table = EmployeeTable()
+    for emp_id in range(101, 101 + EMPLOYEES):
+        table.add(emp_id, last_name(rng), rng.choice(FIRST_NAMES), rng.choice('CCCCD'), 0.0)
+
+    start = time.perf_counter()
+    index = EmployeeIndex(table)
+    build_time = time.perf_counter() - start
+    print(f"{EMPLOYEES} employees: index built in {build_time:.2f}s")
+
+    queries = [
+        ("ID", {'emp_id': str(101 + EMPLOYEES // 2)}),
+        ("missing ID", {'emp_id': '99999999'}),
+        ("full name", {'name': f"{table.first_names[1234]} {table.last_names[1234]}"}),
+        ("last name", {'name': table.last_names[4321]}),
+        ("short name", {'name': 'z'}),
+        ("job code D", {'job_type': 'd'}),
+    ]
+    for label, query in queries:
+        expected, scan_time = best_of(lambda: linear_scan(table, **query))
+        actual, index_time = best_of(lambda: index.search(**query))
+
+        assert actual == expected, label
+        print(f"{label:>12} ({len(actual)} matches): linear scan {scan_time * 1000:9.2f}ms, "
+              f"index {index_time * 1000:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Per-employee dicts vs. the columnar EmployeeTable
+
+Reports the memory held per employee and the time of the descriptive_analytics
+style aggregate scan (four metrics, positive values only) for both layouts.
+
+Run from the repository root:
+    python -m benchmarks.employee_table
+"""
+
+import csv
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from employee_table import EmployeeTable
+from benchmarks.synthetic import FIRST_NAMES, LAST_NAMES
+
+EMPLOYEES = 200000
+
+
+def write_final_data(path):
+    """Write a synthetic emp_end_yr.txt."""
+    rng = random.Random(0)
+    with open(path, 'w') as file:
+        file.write('ID,FirstName,LastName,JobCode,BasePay,Utilization,Evaluation,Sales,Bonus\n')
+        for emp_id in range(101, 101 + EMPLOYEES):
+            file.write(f"{emp_id},{rng.choice(FIRST_NAMES)},{rng.choice(LAST_NAMES)},{rng.choice('CCCCD')},"
+                       f"{float(rng.randint(60000, 400000))},{round(rng.uniform(0, 100), 2)},"
+                       f"{float(rng.randint(0, 5))},{float(rng.randint(0, 400) * 5000)},{rng.uniform(0, 50000)}\n")
+
+
+def load_dicts(path):
+    """The per-employee dict layout previously built by UserInteraction.load_data."""
+    employees = []
+    with open(path, 'r') as file:
+        for row in csv.DictReader(file):
+            employees.append({
+                "ID": row["ID"], "FirstName": row["FirstName"], "LastName": row["LastName"],
+                "JobCode": row["JobCode"], "BasePay": float(row["BasePay"]),
+                "Utilization": float(row["Utilization"]), "Evaluation": float(row["Evaluation"]),
+                "Sales": float(row["Sales"]), "Bonus": float(row["Bonus"]),
+            })
+    return employees
+
+
+def load_table(path):
+    table = EmployeeTable()
+    with open(path, 'r') as file:
+        for row in csv.DictReader(file):
+            table.add(int(row["ID"]), row["LastName"], row["FirstName"], row["JobCode"],
+                      base_pay=float(row["BasePay"]), utilization=float(row["Utilization"]),
+                      evaluation_score=float(row["Evaluation"]), sales=float(row["Sales"]),
+                      bonus=float(row["Bonus"]))
+    return table
+
+
+def measure(loader, path):
+    tracemalloc.start()
+    data = loader(path)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return data, current / EMPLOYEES
+
+
+def scan_dicts(employees):
+    for key in ("Utilization", "Evaluation", "Sales", "Bonus"):
+        valid = [value for value in (emp[key] for emp in employees) if value > 0]
+        sum(valid), min(valid), max(valid)
+
+
+def scan_table(table):
+    for column in (table.utilization, table.evaluation_score, table.sales, table.bonus):
+        valid = [value for value in column if value > 0]
+        sum(valid), min(valid), max(valid)
+
+
+def best_of(function, data, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(data)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'emp_end_yr.txt')
+        write_final_data(path)
+        employees, dict_bytes = measure(load_dicts, path)
+        table, table_bytes = measure(load_table, path)
+    dict_scan = best_of(scan_dicts, employees)
+    table_scan = best_of(scan_table, table)
+    print(f"{EMPLOYEES} employees")
+    print(f"bytes per employee: dicts {dict_bytes:.0f}, table {table_bytes:.0f} ({dict_bytes / table_bytes:.1f}x)")
+    print(f"aggregate scan: dicts {dict_scan:.3f}s, table {table_scan:.3f}s ({dict_scan / table_scan:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Peak memory of unbounded error sets vs. ErrorSink
+
+The old DataProcessor kept every unknown timesheet ID and every missing ID in
+sets, and found missing IDs by walking the whole ID range. This feeds both
+approaches the same errors (unknown evaluation lines plus one stray large ID)
+and compares peak memory and time.
+
+Run from the repository root:
+    python -m benchmarks.error_sink
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+from error_sink import ErrorSink, missing_ranges
+
+EMPLOYEES = 200000
+STRAY_ID = 101 + 20 * EMPLOYEES
+ERROR_LINES = 1000000
+
+
+def sets(ids):
+    """The previous bookkeeping: a set entry per error and per absent ID."""
+    evaluation_errors = set()
+    for line_no in range(1, ERROR_LINES + 1):
+        evaluation_errors.add((STRAY_ID + line_no, line_no))
+    missing_ids = set()
+    for i in range(min(ids), max(ids) + 1):
+        if i not in ids:
+            missing_ids.add(i)
+    return len(evaluation_errors), len(missing_ids)
+
+
+def sink(ids, path):
+    errors = ErrorSink(path)
+    errors.open()
+    for line_no in range(1, ERROR_LINES + 1):
+        emp_id = STRAY_ID + line_no
+        errors.record('evaluation', (emp_id, line_no), id=emp_id, line=line_no)
+    for first, last in missing_ranges(sorted(ids)):
+        errors.record('missing_ids', (first, last), first=first, last=last)
+    errors.close()
+    return errors.counts['evaluation'], sum(last - first + 1 for first, last in errors.samples['missing_ids'])
+
+
+def measure(function, *args):
+    """Return (result, seconds, peak bytes); timed in a separate run, as tracemalloc slows allocation down."""
+    start = time.perf_counter()
+    function(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = function(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    ids = set(range(101, 101 + EMPLOYEES)) | {STRAY_ID}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'error_log.jsonl')
+        expected, set_time, set_peak = measure(sets, ids)
+        actual, sink_time, sink_peak = measure(sink, ids, path)
+        size = os.path.getsize(path)
+    assert actual == expected
+    print(f"{ERROR_LINES} evaluation errors, {expected[1]} missing IDs:")
+    print(f"  sets:      {set_time:6.2f}s, peak {set_peak / 2 ** 20:8.1f} MiB")
+    print(f"  ErrorSink: {sink_time:6.2f}s, peak {sink_peak / 2 ** 20:8.1f} MiB "
+          f"(plus {size / 2 ** 20:.1f} MiB of error_log.jsonl on disk)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Float += totals vs. math.fsum and ExactSum: drift across orderings and overhead
+
+Adds up seeded bonus amounts with cents (and a share of fractions of a
+cent, as rate * base pay gives) serially, in chunks merged in order, and in
+chunks merged in a shuffled order as worker processes would return them.
+Naive float += totals differ between the three; ExactSum's must be
+identical and equal to the exact sum rounded once, as math.fsum gives it.
+Also checks that UserInteraction.bonus_payout is the exact payout (every
+min(base * rate, cap) unrounded, the total rounded once) and that the
+bonus sweep's payout at each rate equals it, and times it against the
+previous += loop.
+
+Run from the repository root:
+    python -m benchmarks.exact_sum
+"""
+
+import random
+import time
+from array import array
+from fractions import Fraction
+from math import fsum
+
+from employee_table import EmployeeTable
+from exact_sum import ExactSum
+from ketan_new_v3 import PAYOUT_CHUNK, UserInteraction, parse_rates
+
+VALUES = 1000000
+CHUNKS = 16
+REPEATS = 5
+SWEEP_RATES = '0.5:50:0.5'
+
+
+def naive_total(values):
+    total = 0
+    for value in values:
+        total += value
+    return total
+
+
+def chunked(values, merge_order, total):
+    """Sum CHUNKS chunks separately with total, then combine the partial sums in merge_order."""
+    size = -(-len(values) // CHUNKS)
+    partials = [total(values[start:start + size]) for start in range(0, len(values), size)]
+    return [partials[index] for index in merge_order]
+
+
+def merged(partials):
+    total = ExactSum()
+    for partial in partials:
+        total.merge(partial)
+    return total.value
+
+
+def naive_payout(ui, rate):
+    """UserInteraction.bonus_payout as it was, with float +=."""
+    total_payout = 0
+    table = ui.final_employee_data
+    consultant = table.job_code_id("C")
+    director = table.job_code_id("D")
+    for start in range(0, len(table), PAYOUT_CHUNK):
+        ui.check_cancelled()
+        end = start + PAYOUT_CHUNK
+        for code, base_pay, evaluation, sales in zip(table.job_codes[start:end], table.base_pay[start:end],
+                                                     table.evaluation_score[start:end], table.sales[start:end]):
+            if code == consultant:
+                if evaluation >= 3.5:
+                    total_payout += min(base_pay * rate, 50000)
+            elif code == director:
+                if sales > 0:
+                    total_payout += min(sales * rate, 150000)
+    return total_payout
+
+
+def exact_payout(table, rate):
+    """The payout at rate with Fraction arithmetic throughout."""
+    rate = Fraction(rate)
+    consultant = table.job_code_id("C")
+    director = table.job_code_id("D")
+    total = Fraction(0)
+    for code, base_pay, evaluation, sales in zip(table.job_codes, table.base_pay, table.evaluation_score, table.sales):
+        if code == consultant and evaluation >= 3.5:
+            total += min(Fraction(base_pay) * rate, 50000)
+        elif code == director and sales > 0:
+            total += min(Fraction(sales) * rate, 150000)
+    return total
+
+
+def best(function, *args):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function(*args)
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def main():
+    rng = random.Random(0)
+    values = array('d', (rng.randint(100000, 40000000) / (100 if rng.random() < 0.8 else 1000)
+                         for _ in range(VALUES)))
+    exact = float(sum(map(Fraction, values), Fraction(0)))
+    assert fsum(values) == exact
+    in_order = list(range(CHUNKS))
+    shuffled = in_order[:]
+    rng.shuffle(shuffled)
+
+    naive = {'serial': naive_total(values),
+             'chunked': naive_total(chunked(values, in_order, naive_total)),
+             'shuffled chunks': naive_total(chunked(values, shuffled, naive_total))}
+    exact_totals = {'serial': ExactSum(values).value,
+                    'chunked': merged(chunked(values, in_order, ExactSum)),
+                    'shuffled chunks': merged(chunked(values, shuffled, ExactSum))}
+    assert set(exact_totals.values()) == {exact}, exact_totals
+
+    _, naive_time = best(naive_total, values)
+    _, fsum_time = best(fsum, values)
+    _, exact_time = best(lambda: ExactSum(values).value)
+    print(f"{VALUES} amounts, exact total {exact:.6f}:")
+    print("  float +=: " + ", ".join(f"{name} {total:.6f}" for name, total in naive.items()) +
+          f" ({len(set(naive.values()))} distinct), {naive_time * 1000:.1f}ms")
+    print(f"  math.fsum (serial only) {fsum_time * 1000:.1f}ms; ExactSum: identical in all three orders, "
+          f"{exact_time * 1000:.1f}ms")
+
+    table = EmployeeTable()
+    for emp_id in range(101, 101 + VALUES):
+        job_code = rng.choice('CCCCD')
+        table.add(emp_id, 'Last', 'First', job_code, rng.randint(6000000, 40000000) / 100,
+                  evaluation_score=float(rng.randint(0, 5)),
+                  sales=rng.randint(0, 40000000) / 100 if job_code == 'D' else 0.0)
+    ui = UserInteraction()
+    ui.use_employees(table)
+    previous, previous_time = best(naive_payout, ui, 0.137)
+    start = time.perf_counter()
+    payout = ui.bonus_payout(0.137)
+    first_time = time.perf_counter() - start
+    _, payout_time = best(ui.bonus_payout, 0.137)
+    assert payout == float(exact_payout(table, 0.137))
+    sweep = ui.simulate_bonus_sweep(parse_rates(SWEEP_RATES))
+    assert all(result["TotalPayout"] == ui.bonus_payout(result["Rate"] / 100) for result in sweep)
+    print(f"{VALUES} employees, bonus_payout at 13.7%: float += {previous:,.6f} in {previous_time * 1000:.1f}ms, "
+          f"exact {payout:,.6f} in {first_time * 1000:.1f}ms (sorting the bases), then {payout_time * 1000:.3f}ms; "
+          f"the sweep over {SWEEP_RATES} matches it at all {len(sweep)} rates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Text-mode readers vs. the block reader in flat_file_reader
+
+For every input file this times the old text-mode loop (open/iterate/strip/split)
+against the block reader as used by DataProcessor and PerformanceMetricsProcessor
+(bytes lines for timesheet.txt, decoded blocks for evaluation.txt and
+emp_beg_yr.txt), and reports the bytes of intermediate line/field objects
+created per row.
+
+Run from the repository root:
+    python -m benchmarks.flat_file_readers
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+
+from flat_file_reader import iter_lines, iter_table
+from benchmarks.synthetic import write_inputs
+
+EMPLOYEES = 100000
+TIMESHEET_ROWS = 2000000
+SAMPLE_ROWS = 10000
+
+
+def text_timesheet(path):
+    for line in open(path, 'r'):
+        if line.strip():
+            emp_id, hours = line.strip().split(',')
+            int(emp_id), float(hours)
+
+
+def block_timesheet(path):
+    for _, line in iter_lines(path):
+        emp_id, hours = line.split(b',')
+        int(emp_id), float(hours)
+
+
+def text_evaluation(path):
+    for line in open(path, 'r'):
+        if line.strip():
+            parts = line.strip().split('#')
+            int(parts[0]), parts[1].strip().lower()
+
+
+def block_evaluation(path):
+    for _, line in iter_lines(path, text=True):
+        parts = line.split('#', 2)
+        int(parts[0]), parts[1].strip().lower()
+
+
+def text_employees(path):
+    with open(path, 'r') as file:
+        for row in csv.DictReader(file):
+            int(row['ID']), float(row['BasePay'])
+
+
+def block_employees(path):
+    for row in iter_table(path):
+        int(row['ID']), float(row['BasePay'])
+
+
+def text_objects(line, delimiter):
+    stripped = line.strip()
+    return [line, stripped] + stripped.split(delimiter)
+
+
+def block_objects(raw, delimiter, text):
+    """Objects the block reader creates for one line; strip() returns the line itself when unchanged."""
+    line = raw.rstrip(b'\n')
+    if text:
+        line = line.decode()
+    stripped = line.strip()
+    fields = stripped.split(delimiter if text else delimiter.encode())
+    return [line] + ([stripped] if stripped is not line else []) + fields
+
+
+def intermediate_bytes(path, delimiter, text):
+    """Average bytes of line and field objects created per row by each reader."""
+    text_total = 0
+    block_total = 0
+    rows = 0
+    with open(path, 'r') as text_file, open(path, 'rb') as binary_file:
+        for line, raw in zip(text_file, binary_file):
+            text_total += sum(map(sys.getsizeof, text_objects(line, delimiter)))
+            block_total += sum(map(sys.getsizeof, block_objects(raw, delimiter, text)))
+            rows += 1
+            if rows == SAMPLE_ROWS:
+                break
+    return text_total / rows, block_total / rows
+
+
+def best_of(function, path, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(path)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    cases = [
+        ('emp_beg_yr.txt', text_employees, block_employees, ',', True),
+        ('timesheet.txt', text_timesheet, block_timesheet, ',', False),
+        ('evaluation.txt', text_evaluation, block_evaluation, '#', True),
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        write_inputs(directory, EMPLOYEES, TIMESHEET_ROWS)
+        print(f"{'file':>15} {'text s':>8} {'block s':>8} {'speedup':>8} {'text B/row':>11} {'block B/row':>11}")
+        for name, text_reader, block_reader, delimiter, text in cases:
+            path = os.path.join(directory, name)
+            text_time = best_of(text_reader, path)
+            block_time = best_of(block_reader, path)
+            text_bytes, block_bytes = intermediate_bytes(path, delimiter, text)
+            print(f"{name:>15} {text_time:>8.3f} {block_time:>8.3f} {text_time / block_time:>7.2f}x "
+                  f"{text_bytes:>11.1f} {block_bytes:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Writing employee_data.csv and emp_end_yr.txt: per-row writes vs. flat_file_writer
+
+The previous writers built a dict per employee for csv.DictWriter.writerow
+(employee_data.csv) or issued one f-string write per employee (emp_end_yr.txt).
+This times both against DataProcessor.write_employee_data and
+PerformanceMetricsProcessor.write_final_data, which go through
+flat_file_writer.write_csv, checking the files come out identical, and
+times the gzip-compressed output as well (the snapshot PerformanceMetricsProcessor
+writes after emp_end_yr.txt is left out).
+
+Run from the repository root:
+    python -m benchmarks.flat_file_writers
+"""
+
+import contextlib
+import csv
+import gzip
+import io
+import os
+import random
+import tempfile
+import time
+
+from Project_Shukla_v2 import PerformanceMetricsProcessor
+from Project_Srinivas_v3 import DataProcessor
+from benchmarks.synthetic import FIRST_NAMES, LAST_NAMES
+from employee_table import EmployeeTable
+
+EMPLOYEES = 500000
+
+
+def dict_rows(table):
+    with open('employee_data.csv', 'w', newline='') as file:
+        fieldnames = ['id', 'last_name', 'first_name', 'job_code', 'base_pay', 'hours', 'utilization',
+                      'evaluation_score', 'sales']
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in range(len(table)):
+            writer.writerow({
+                'id': table.ids[row], 'last_name': table.last_names[row], 'first_name': table.first_names[row],
+                'job_code': table.job_code(row), 'base_pay': table.base_pay[row], 'hours': table.hours[row],
+                'utilization': table.utilization[row], 'evaluation_score': table.evaluation_score[row],
+                'sales': table.sales[row],
+            })
+
+
+def f_string_rows(table, bonuses):
+    with open('emp_end_yr.txt', 'w') as file:
+        file.write('ID,FirstName,LastName,JobCode,BasePay,Utilization,Evaluation,Sales,Bonus\n')
+        for row, emp_id in enumerate(table.ids):
+            file.write(
+                f"{emp_id},{table.first_names[row]},{table.last_names[row]},{table.job_code(row)},"
+                f"{table.base_pay[row]},{table.utilization[row]},{table.evaluation_score[row]},"
+                f"{table.sales[row]},{bonuses.get(emp_id, 0)}\n"
+            )
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function(*args)
+    return time.perf_counter() - start
+
+
+def read(path):
+    with (gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')) as file:
+        return file.read()
+
+
+def main():
+    rng = random.Random(0)
+    table = EmployeeTable()
+    bonuses = {}
+    for emp_id in range(101, 101 + EMPLOYEES):
+        job_code = rng.choice('CCCCD')
+        table.add(emp_id, rng.choice(LAST_NAMES), rng.choice(FIRST_NAMES), job_code,
+                  float(rng.randint(60000, 400000)), hours=float(rng.randint(0, 2600)),
+                  utilization=round(rng.uniform(0, 100), 2), evaluation_score=float(rng.randint(0, 5)),
+                  sales=float(rng.randint(0, 400) * 5000) if job_code == 'D' else 0.0)
+        if rng.random() < 0.3:
+            bonuses[emp_id] = round(rng.uniform(1000, 50000), 2)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for name, old, stage, path in [
+                ('employee_data.csv', lambda: dict_rows(table), DataProcessor, 'employee_data.csv'),
+                ('emp_end_yr.txt', lambda: f_string_rows(table, bonuses), PerformanceMetricsProcessor,
+                 'emp_end_yr.txt'),
+            ]:
+                old_time = timed(old)
+                expected = read(path)
+                seconds, sizes = {}, {}
+                for compression in (None, 'gzip'):
+                    processor = stage(compression=compression)
+                    processor.employees = table
+                    processor.bonuses = bonuses
+                    if stage is DataProcessor:
+                        write = processor.write_employee_data
+                    else:
+                        # Time emp_end_yr.txt alone, not the binary snapshot written after it.
+                        processor.write_snapshot = lambda source: None
+                        write = processor.write_final_data
+                    seconds[compression] = timed(write)
+                    written = path + ('.gz' if compression else '')
+                    assert read(written) == expected, written
+                    sizes[compression] = os.path.getsize(written)
+                print(f"{EMPLOYEES} employees, {name}: per-row writes {old_time:.2f}s, write_csv "
+                      f"{seconds[None]:.2f}s ({old_time / seconds[None]:.1f}x), gzip {seconds['gzip']:.2f}s "
+                      f"({sizes[None] / 2 ** 20:.1f} MiB -> {sizes['gzip'] / 2 ** 20:.1f} MiB)")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
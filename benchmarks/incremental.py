@@ -0,0 +1,63 @@
+"""
+Full runs vs. incremental runs after a small append
+
+Run from the repository root:
+    python -m benchmarks.incremental
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from Project_Shukla_v2 import PerformanceMetricsProcessor
+from Project_Srinivas_v3 import DataProcessor
+from benchmarks.synthetic import write_inputs
+
+EMPLOYEES = 100000
+TIMESHEET_ROWS = 2000000
+APPENDED_ROWS = 1000
+
+
+def timed(run):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        run()
+    return time.perf_counter() - start
+
+
+def full():
+    DataProcessor().process_data()
+    PerformanceMetricsProcessor().process_data()
+
+
+def incremental():
+    DataProcessor().process_data_incremental()
+    PerformanceMetricsProcessor().process_data_incremental()
+
+
+def main():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        write_inputs(directory, EMPLOYEES, TIMESHEET_ROWS)
+        os.chdir(directory)
+        try:
+            timed(incremental)
+            with open('timesheet.txt', 'a') as file:
+                for i in range(APPENDED_ROWS):
+                    file.write(f"{101 + i * 97 % EMPLOYEES},8\n")
+            incremental_time = timed(incremental)
+            with open('emp_end_yr.txt') as file:
+                incremental_output = file.read()
+            full_time = timed(full)
+            with open('emp_end_yr.txt') as file:
+                assert file.read() == incremental_output
+        finally:
+            os.chdir(cwd)
+    print(f"{EMPLOYEES} employees, {TIMESHEET_ROWS} timesheet rows + {APPENDED_ROWS} appended: "
+          f"full run {full_time:.2f}s, incremental run {incremental_time:.2f}s ({full_time / incremental_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
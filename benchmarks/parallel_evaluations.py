@@ -0,0 +1,58 @@
+"""
+Serial vs. process-pool evaluation scoring in DataProcessor.process_evaluations
+
+Generates seeded inputs with a share of unknown IDs and malformed lines,
+then scores evaluation.txt serially and with 2 and 4 worker processes,
+checking the scores and the evaluation error records come out identical.
+
+Run from the repository root:
+    python -m benchmarks.parallel_evaluations
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from Project_Srinivas_v3 import DataProcessor
+from benchmarks.synthetic import write_inputs
+
+EMPLOYEES = 200000
+WORKERS = (1, 2, 4)
+
+
+def score(workers):
+    """Return (evaluation scores, evaluation error records, seconds spent in process_evaluations)."""
+    processor = DataProcessor(workers=workers)
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.read_employee_data()
+        start = time.perf_counter()
+        processor.process_evaluations()
+        elapsed = time.perf_counter() - start
+    errors = {category: (processor.errors.counts[category], processor.errors.samples[category])
+              for category in ('evaluation', 'invalid_evaluation')}
+    return list(processor.employees.evaluation_score), errors, elapsed
+
+
+def main():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        write_inputs(directory, EMPLOYEES, EMPLOYEES, seed=0, invalid_ratio=0.01)
+        size = os.path.getsize(os.path.join(directory, 'evaluation.txt'))
+        os.chdir(directory)
+        try:
+            results = {workers: score(workers) for workers in WORKERS}
+        finally:
+            os.chdir(cwd)
+
+    serial = results[1]
+    for workers, result in results.items():
+        assert result[:2] == serial[:2], workers
+    print(f"{EMPLOYEES} employees, evaluation.txt {size / 2 ** 20:.1f} MiB with {os.cpu_count()} CPU(s): " +
+          ", ".join(f"{workers} worker{'s' if workers > 1 else ''} {result[2]:.2f}s"
+                    for workers, result in results.items()))
+
+
+if __name__ == "__main__":
+    main()
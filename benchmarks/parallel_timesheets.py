@@ -0,0 +1,94 @@
+"""
+Serial vs. process-pool timesheet totals in DataProcessor.process_timesheets
+
+Generates seeded inputs, then rewrites timesheet.txt with fractional hours
+(tenths, quarters and thirds of an hour, which binary floats cannot hold
+exactly), with some lines naming unknown employees or malformed, and sums
+them serially and with 2 and 4 worker processes. Every employee's hours must
+come out identical and equal to the exact sum of their timesheet lines
+rounded once, and the error log must list the same records, with the same
+line numbers, in the same order.
+
+Run from the repository root:
+    python -m benchmarks.parallel_timesheets
+"""
+
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+from fractions import Fraction
+
+from Project_Srinivas_v3 import DataProcessor
+from benchmarks.synthetic import write_inputs
+
+EMPLOYEES = 20000
+TIMESHEET_ROWS = 1000000
+# About this fraction of lines name an unknown employee, and as many are malformed.
+INVALID_RATIO = 0.01
+WORKERS = (1, 2, 4)
+
+
+def write_fractional_timesheet(path, seed=0):
+    """Write TIMESHEET_ROWS lines of fractional hours; returns the exact hours by known employee ID."""
+    rng = random.Random(seed)
+    exact = {}
+    with open(path, 'w') as file:
+        for _ in range(TIMESHEET_ROWS):
+            emp_id = rng.randrange(101, 101 + EMPLOYEES)
+            hours = rng.randint(1, 80) / rng.choice((10, 4, 3))
+            chance = rng.random()
+            if chance < INVALID_RATIO:
+                file.write(f"{emp_id + EMPLOYEES + rng.randrange(1000)},{hours}\n")
+            elif chance < 2 * INVALID_RATIO:
+                file.write(f"{emp_id};{hours}\n")
+            else:
+                exact[emp_id] = exact.get(emp_id, 0) + Fraction(hours)
+                file.write(f"{emp_id},{hours}\n")
+    return exact
+
+
+def total_hours(workers):
+    """Return (hours by employee ID, error log and printed output, seconds spent in process_timesheets)."""
+    processor = DataProcessor(workers=workers)
+    processor.errors.path = f"error_log_{workers}.jsonl"
+    processor.errors.open()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        processor.read_employee_data()
+        start = time.perf_counter()
+        processor.process_timesheets()
+        elapsed = time.perf_counter() - start
+    processor.errors.close()
+    with open(processor.errors.path) as file:
+        errors = file.read()
+    table = processor.employees
+    return dict(zip(table.ids, table.hours)), (errors, output.getvalue()), elapsed
+
+
+def main():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        write_inputs(directory, EMPLOYEES, 0, seed=0)
+        exact = write_fractional_timesheet(os.path.join(directory, 'timesheet.txt'))
+        os.chdir(directory)
+        try:
+            results = {workers: total_hours(workers) for workers in WORKERS}
+        finally:
+            os.chdir(cwd)
+
+    serial, serial_errors, _ = results[1]
+    for workers, (hours, errors, _) in results.items():
+        assert hours == serial, workers
+        assert errors == serial_errors, workers
+    assert all(serial[emp_id] == float(total) for emp_id, total in exact.items())
+    assert '"line"' in serial_errors[0]
+    print(f"{EMPLOYEES} employees, {TIMESHEET_ROWS} fractional timesheet rows with {os.cpu_count()} CPU(s): " +
+          ", ".join(f"{workers} worker{'s' if workers > 1 else ''} {elapsed:.2f}s"
+                    for workers, (_, _, elapsed) in results.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Sort-per-query percentiles vs. PercentileService
+
+Run from the repository root:
+    python -m benchmarks.percentiles
+"""
+
+import random
+import time
+from statistics import median
+
+from employee_table import EmployeeTable
+from percentiles import PercentileService, select_kth
+
+EMPLOYEES = 1000000
+QUERIES = 5
+
+
+def main():
+    rng = random.Random(0)
+    table = EmployeeTable()
+    for emp_id in range(101, 101 + EMPLOYEES):
+        table.add(emp_id, '', '', rng.choice('CCCCD'), 0.0, utilization=round(rng.uniform(0, 100), 2))
+
+    start = time.perf_counter()
+    consultant = table.job_code_id('C')
+    values = [value for code, value in zip(table.job_codes, table.utilization) if code == consultant]
+    expected = sorted(values)[int(len(values) * 0.65)]
+    sort_once = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assert PercentileService(table).percentile('utilization', 0.65, 'C', cache=False) == expected
+    select_once = time.perf_counter() - start
+    print(f"one-off 65th percentile of {len(values)} consultants: sort {sort_once:.3f}s, "
+          f"quickselect {select_once:.3f}s ({sort_once / select_once:.1f}x)")
+
+    start = time.perf_counter()
+    for _ in range(QUERIES):
+        ordered = sorted(table.utilization)
+        ordered[int(len(ordered) * 0.65)]
+        median([value for value in table.utilization if value > 0])
+        min(ordered), max(ordered)
+    sort_each = time.perf_counter() - start
+
+    service = PercentileService(table)
+    start = time.perf_counter()
+    for _ in range(QUERIES):
+        service.percentile('utilization', 0.65)
+        service.median('utilization', positive_only=True)
+        service.minimum('utilization'), service.maximum('utilization')
+    cached = time.perf_counter() - start
+    assert service.kth('utilization', 0) == select_kth(table.utilization, 0)
+    print(f"{QUERIES} rounds of percentile/median/min/max over {EMPLOYEES} employees: "
+          f"sort per query {sort_each:.3f}s, cached sorted view {cached:.3f}s ({sort_each / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
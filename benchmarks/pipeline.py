@@ -0,0 +1,60 @@
+"""
+Three stages through files vs. the in-memory pipeline
+
+Run from the repository root:
+    python -m benchmarks.pipeline
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from Project_Shukla_v2 import PerformanceMetricsProcessor
+from Project_Srinivas_v3 import DataProcessor
+from benchmarks.synthetic import write_inputs
+from ketan_new_v3 import UserInteraction
+from pipeline import run_pipeline
+
+EMPLOYEES = [20000, 200000]
+TIMESHEET_ROWS_PER_EMPLOYEE = 5
+
+
+def through_files():
+    """Run the stages as the separate scripts do, each reading the previous stage's output file."""
+    DataProcessor().process_data()
+    PerformanceMetricsProcessor().process_data()
+    ui = UserInteraction()
+    ui.load_data()
+    return ui
+
+
+def timed(run):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ui = run()
+    return ui, time.perf_counter() - start
+
+
+def main():
+    cwd = os.getcwd()
+    for employees in EMPLOYEES:
+        with tempfile.TemporaryDirectory() as directory:
+            write_inputs(directory, employees, employees * TIMESHEET_ROWS_PER_EMPLOYEE)
+            os.chdir(directory)
+            try:
+                files_ui, files_time = timed(through_files)
+                memory_ui, memory_time = timed(run_pipeline)
+            finally:
+                os.chdir(cwd)
+
+        expected, actual = files_ui.final_employee_data, memory_ui.final_employee_data
+        for column in ('ids', 'utilization', 'evaluation_score', 'sales', 'bonus'):
+            assert list(getattr(expected, column)) == list(getattr(actual, column)), column
+        print(f"{employees} employees: through files {files_time:.2f}s, in memory {memory_time:.2f}s "
+              f"({files_time / memory_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Top/bottom-K leaderboards: sorting each job code's column vs. RankingService
+
+Sorts every (column, job code) slice to take its first and last K rows, and
+compares that with RankingService's single pass of bounded heaps, then with
+a repeat query answered from its cache. Both must rank the same rows.
+
+Run from the repository root:
+    python -m benchmarks.rankings
+"""
+
+import random
+import time
+
+from benchmarks.synthetic import FIRST_NAMES, LAST_NAMES
+from employee_table import EmployeeTable
+from rankings import RANKED_COLUMNS, RankingService
+
+EMPLOYEES = 500000
+K = 10
+
+
+def sorted_leaderboards(table, k):
+    boards = {}
+    for label in table.job_code_labels:
+        rows = table.rows_with_job_code(label)
+        for column in RANKED_COLUMNS:
+            data = table.column(column)
+            ranked = sorted(rows, key=lambda row: (-data[row], row))
+            lowest = sorted(rows, key=lambda row: (data[row], row))
+            boards[(column, label)] = (ranked[:k], lowest[:k])
+    return boards
+
+
+def main():
+    rng = random.Random(0)
+    table = EmployeeTable()
+    for emp_id in range(101, 101 + EMPLOYEES):
+        job_code = rng.choice('CCCCD')
+        sales = float(rng.randint(0, 400) * 5000) if job_code == 'D' else 0.0
+        table.add(emp_id, rng.choice(LAST_NAMES), rng.choice(FIRST_NAMES), job_code,
+                  float(rng.randint(60000, 400000)), utilization=round(rng.uniform(0, 100), 2),
+                  evaluation_score=float(rng.randint(0, 5)), sales=sales,
+                  bonus=min(sales * 0.1, 150000.0) if rng.random() < 0.3 else 0.0)
+
+    start = time.perf_counter()
+    expected = sorted_leaderboards(table, K)
+    sort_time = time.perf_counter() - start
+
+    rankings = RankingService(table)
+    start = time.perf_counter()
+    boards = rankings.leaderboards(K)
+    heap_time = time.perf_counter() - start
+    start = time.perf_counter()
+    rankings.leaderboards(K)
+    cached_time = time.perf_counter() - start
+
+    for key, (top, bottom) in expected.items():
+        assert (boards[key].top, boards[key].bottom) == (top, bottom), key
+    print(f"{EMPLOYEES} employees, top/bottom {K} of {len(RANKED_COLUMNS)} columns per job code: "
+          f"sorting {sort_time:.2f}s, heaps in one pass {heap_time:.2f}s, cached {cached_time * 1000:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Per-call statistics lists vs. TableStatistics
+
+Run from the repository root:
+    python -m benchmarks.running_stats
+"""
+
+import math
+import random
+import time
+from statistics import mean, stdev
+
+from employee_table import EmployeeTable
+from running_stats import STAT_COLUMNS, TableStatistics
+
+EMPLOYEES = 500000
+UPDATES = 1000
+
+
+def list_statistics(table):
+    """The per-metric lists and passes previously made by descriptive_analytics."""
+    results = {}
+    for column in STAT_COLUMNS:
+        valid_data = [value for value in table.column(column) if value > 0]
+        results[column] = (len(valid_data), mean(valid_data), stdev(valid_data), min(valid_data), max(valid_data))
+    return results
+
+
+def main():
+    rng = random.Random(0)
+    table = EmployeeTable()
+    for emp_id in range(101, 101 + EMPLOYEES):
+        job_code = rng.choice('CCCCD')
+        table.add(emp_id, '', '', job_code, 0.0, utilization=round(rng.uniform(0, 100), 2),
+                  evaluation_score=float(rng.randint(0, 5)) if job_code == 'C' else 0.0,
+                  sales=float(rng.randint(0, 400) * 5000) if job_code == 'D' else 0.0,
+                  bonus=float(rng.randint(0, 50000)))
+
+    start = time.perf_counter()
+    expected = list_statistics(table)
+    list_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    statistics = TableStatistics(table)
+    statistics.build()
+    build_time = time.perf_counter() - start
+
+    for column, (count, average, deviation, minimum, maximum) in expected.items():
+        stats = statistics.get(column, positive_only=True)
+        assert stats.count == count and stats.minimum == minimum and stats.maximum == maximum
+        assert math.isclose(stats.mean, average, rel_tol=1e-9)
+        assert math.isclose(stats.stdev, deviation, rel_tol=1e-9)
+    print(f"{EMPLOYEES} employees, {len(STAT_COLUMNS)} metrics: statistics module {list_time:.3f}s, "
+          f"accumulators for every metric and job code {build_time:.3f}s")
+
+    start = time.perf_counter()
+    for _ in range(UPDATES):
+        table.set_value(rng.randrange(EMPLOYEES), 'utilization', round(rng.uniform(1, 99), 2))
+        statistics.get('utilization', positive_only=True).mean
+    update_time = time.perf_counter() - start
+    print(f"{UPDATES} single-value updates, each followed by a query: {update_time * 1000:.1f}ms "
+          f"(statistics module would recompute: ~{list_time / len(STAT_COLUMNS) * UPDATES:.0f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Evaluation comment scoring with and without the comment score cache
+
+Scores evaluation.txt through DataProcessor.process_evaluations with the
+cache disabled (every comment goes through the KeywordMatcher), with an
+empty cache, and with a cache saved by the previous run, checking all three
+give the same scores, and reports the cache's hit rate.
+
+Run from the repository root:
+    python -m benchmarks.score_cache
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from Project_Srinivas_v3 import DataProcessor
+from benchmarks.synthetic import write_inputs
+from score_cache import normalize
+
+EMPLOYEES = 200000
+
+
+class Uncached:
+    """Stand-in for ScoreCache that scores every comment."""
+
+    def __init__(self, cache):
+        self.scorer = cache.scorer
+
+    def score(self, text):
+        return self.scorer(normalize(text))
+
+
+def score(cache_path=None, cached=True):
+    """Return (evaluation scores, seconds spent in process_evaluations, processor)."""
+    processor = DataProcessor()
+    if cache_path:
+        processor.score_cache.load(cache_path)
+    if not cached:
+        processor.score_cache = Uncached(processor.score_cache)
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.read_employee_data()
+        start = time.perf_counter()
+        processor.process_evaluations()
+        elapsed = time.perf_counter() - start
+    return list(processor.employees.evaluation_score), elapsed, processor
+
+
+def main():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        write_inputs(directory, EMPLOYEES, EMPLOYEES, seed=0, invalid_ratio=0.01)
+        os.chdir(directory)
+        try:
+            expected, uncached_time, _ = score(cached=False)
+            scores, cold_time, processor = score()
+            cold = processor.score_cache.summary()
+            processor.score_cache.save('score_cache.pkl')
+            warm_scores, warm_time, processor = score('score_cache.pkl')
+            warm = processor.score_cache.summary()
+        finally:
+            os.chdir(cwd)
+
+    assert scores == expected and warm_scores == expected
+    print(f"{EMPLOYEES} employees, process_evaluations: uncached {uncached_time:.2f}s, "
+          f"empty cache {cold_time:.2f}s ({uncached_time / cold_time:.1f}x; {cold}), "
+          f"saved cache {warm_time:.2f}s ({warm})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Loading emp_end_yr.txt through csv.DictReader vs. the binary snapshot
+
+Run from the repository root:
+    python -m benchmarks.snapshot
+"""
+
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+from Project_Shukla_v2 import PerformanceMetricsProcessor
+from benchmarks.synthetic import FIRST_NAMES, LAST_NAMES
+from ketan_new_v3 import UserInteraction
+from table_snapshot import SNAPSHOT_FILE, read_snapshot
+
+EMPLOYEES = 500000
+
+
+def main():
+    rng = random.Random(0)
+    processor = PerformanceMetricsProcessor()
+    for emp_id in range(101, 101 + EMPLOYEES):
+        job_code = rng.choice('CCCCD')
+        processor.employees.add(emp_id, rng.choice(LAST_NAMES), rng.choice(FIRST_NAMES), job_code,
+                                float(rng.randint(60000, 400000)), utilization=round(rng.uniform(0, 100), 2),
+                                evaluation_score=float(rng.randint(0, 5)),
+                                sales=float(rng.randint(0, 400) * 5000) if job_code == 'D' else 0.0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.determine_bonus_eligibility()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                processor.write_final_data()
+            size = os.path.getsize('emp_end_yr.txt'), os.path.getsize(SNAPSHOT_FILE)
+
+            start = time.perf_counter()
+            expected = UserInteraction().read_csv()
+            csv_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            table = read_snapshot(SNAPSHOT_FILE, 'emp_end_yr.txt')
+            snapshot_time = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+
+    for column in ('ids', 'last_names', 'first_names', 'job_codes', 'base_pay', 'utilization',
+                   'evaluation_score', 'sales', 'bonus'):
+        assert list(getattr(table, column)) == list(getattr(expected, column)), column
+    print(f"{EMPLOYEES} employees: emp_end_yr.txt ({size[0] / 2 ** 20:.1f} MiB) via csv.DictReader "
+          f"{csv_time:.2f}s, {SNAPSHOT_FILE} ({size[1] / 2 ** 20:.1f} MiB) {snapshot_time:.3f}s "
+          f"({csv_time / snapshot_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+In-memory UserInteraction vs. the SQLite backend in employee_db.py
+
+Times the bulk load (executemany in one transaction, indexes built afterwards,
+against committing indexed rows one at a time), then the menu's queries over
+the loaded table vs. indexed SQL, checking both give the same answers.
+
+Run from the repository root:
+    python -m benchmarks.sqlite_backend
+"""
+
+import contextlib
+import io
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import FIRST_NAMES, LAST_NAMES
+from employee_db import FINAL_DATA, FINAL_INDEXES, TABLE_COLUMNS, EmployeeDatabase
+from employee_table import EmployeeTable
+from ketan_new_v3 import DatabaseUserInteraction, UserInteraction
+
+EMPLOYEES = 500000
+ROW_BY_ROW = 20000
+REPEAT = 5
+
+
+def best_of(query):
+    """Return (result, fastest wall time) over REPEAT runs."""
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = query()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def row_by_row(path, table, rows):
+    """Insert into an already indexed table, committing every row."""
+    connection = sqlite3.connect(path)
+    connection.execute(f"CREATE TABLE {FINAL_DATA} ({TABLE_COLUMNS})")
+    for index, columns in FINAL_INDEXES.items():
+        connection.execute(f"CREATE INDEX {index} ON {FINAL_DATA} ({columns})")
+    for row in range(rows):
+        first_name, last_name = table.first_names[row], table.last_names[row]
+        connection.execute(f"INSERT INTO {FINAL_DATA} VALUES ({', '.join('?' * 12)})",
+                           (row, table.ids[row], last_name, first_name, table.job_code(row),
+                            table.base_pay[row], table.hours[row], table.utilization[row],
+                            table.evaluation_score[row], table.sales[row], table.bonus[row],
+                            f"{first_name} {last_name}".lower()))
+        connection.commit()
+    connection.close()
+
+
+def main():
+    rng = random.Random(0)
+    table = EmployeeTable()
+    for emp_id in range(101, 101 + EMPLOYEES):
+        job_code = rng.choice('CCCCD')
+        sales = float(rng.randint(0, 400) * 5000) if job_code == 'D' else 0.0
+        table.add(emp_id, rng.choice(LAST_NAMES), rng.choice(FIRST_NAMES), job_code,
+                  float(rng.randint(60000, 400000)), utilization=round(rng.uniform(0, 100), 2),
+                  evaluation_score=float(rng.randint(0, 5)), sales=sales,
+                  bonus=min(sales * 0.1, 150000.0) if rng.random() < 0.3 else 0.0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'employees.db')
+        start = time.perf_counter()
+        database = EmployeeDatabase(path)
+        database.write_final_data(table, table.bonus)
+        bulk_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        row_by_row(os.path.join(directory, 'row_by_row.db'), table, ROW_BY_ROW)
+        single_time = (time.perf_counter() - start) * EMPLOYEES / ROW_BY_ROW
+        print(f"{EMPLOYEES} employees: loaded with executemany {bulk_time:.2f}s, committing indexed rows one at "
+              f"a time ~{single_time:.0f}s (extrapolated from {ROW_BY_ROW})")
+
+        start = time.perf_counter()
+        memory = UserInteraction()
+        memory.use_employees(table)
+        memory.search_index.build()
+        memory.statistics.build()
+        build_time = time.perf_counter() - start
+        sql = DatabaseUserInteraction(path)
+        print(f"in-memory search index and statistics built in {build_time:.2f}s")
+
+        queries = [
+            ("ID search", lambda ui: ui.find_employees(emp_id=str(101 + EMPLOYEES // 2))),
+            ("name search", lambda ui: ui.find_employees(name=f"{FIRST_NAMES[3]} {LAST_NAMES[7]}")),
+            ("job code search", lambda ui: ui.find_employees(job_type='d')),
+            ("utilization stats", lambda ui: ui.metric_summary('utilization')),
+            ("sales stats", lambda ui: ui.metric_summary('sales')),
+            ("recognition lists", lambda ui: ui.recognition_lists()),
+            ("65th percentile", lambda ui: ui.get_utilization_percentile(65)),
+            ("bonus payout", lambda ui: round(ui.bonus_payout(0.1), 2)),
+        ]
+        with contextlib.redirect_stdout(io.StringIO()):
+            for label, query in queries:
+                expected, memory_time = best_of(lambda: query(memory))
+                actual, sql_time = best_of(lambda: query(sql))
+                if isinstance(expected, dict):
+                    expected = {key: round(value, 6) for key, value in expected.items()}
+                    actual = {key: round(value, 6) for key, value in actual.items()}
+                assert actual == expected, label
+                print(f"{label:>18}: in memory {memory_time * 1000:9.2f}ms, SQLite {sql_time * 1000:9.2f}ms",
+                      file=sys.__stdout__)
+        sql.database.close()
+        database.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Import cost of the stage modules
+
+Imports each module in a fresh interpreter, so nothing is cached between
+them, and reports the best of a few runs against an interpreter that imports
+nothing. Importing a module only defines its classes and main(); no data is
+read until a UserInteraction query or a processor step asks for it.
+
+Run from the repository root:
+    python -m benchmarks.startup
+"""
+
+import subprocess
+import sys
+import time
+
+MODULES = ('Project_Srinivas_v3', 'Project_Shukla_v2', 'ketan_new_v3', 'pipeline')
+REPEAT = 5
+
+
+def best_start(code):
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    baseline = best_start('pass')
+    print(f"bare interpreter: {baseline * 1000:.1f}ms")
+    for module in MODULES:
+        elapsed = best_start(f'import {module}')
+        print(f"{module:>20}: +{(elapsed - baseline) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
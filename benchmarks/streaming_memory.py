@@ -0,0 +1,54 @@
+"""
+Peak memory of DataProcessor as timesheet rows grow
+
+The input files are read as streams of lines and employee_data.csv is
+written from the columns, so peak memory depends on the number of
+employees, not on the number of timesheet rows.
+
+Run from the repository root:
+    python -m benchmarks.streaming_memory
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+from Project_Srinivas_v3 import DataProcessor
+from benchmarks.synthetic import write_inputs
+
+EMPLOYEES = 20000
+TIMESHEET_ROWS = [100000, 400000, 1600000]
+
+
+def measure():
+    """Run one DataProcessor pass in the current directory and return (seconds, peak bytes)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        DataProcessor().process_data()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    cwd = os.getcwd()
+    print(f"{EMPLOYEES} employees")
+    print(f"{'timesheet rows':>15} {'seconds':>9} {'peak MiB':>9}")
+    for rows in TIMESHEET_ROWS:
+        with tempfile.TemporaryDirectory() as directory:
+            write_inputs(directory, EMPLOYEES, rows)
+            os.chdir(directory)
+            try:
+                elapsed, peak = measure()
+                print(f"{rows:>15} {elapsed:>9.2f} {peak / 2 ** 20:>9.2f}")
+            finally:
+                os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark suite: every stage at several scales, with a JSON baseline
+
+Generates seeded synthetic inputs (benchmarks/synthetic.py) for each scale,
+times each DataProcessor and PerformanceMetricsProcessor step and the
+UserInteraction queries, and prints the results as JSON. Save them with
+--output and check a later run against them with --compare; a step that got
+slower than the baseline by more than --tolerance (and by more than
+--min-seconds) is reported as a regression and the exit status is 1.
+
+Run from the repository root, e.g.:
+    python -m benchmarks.suite --scales 10000,100000 --invalid-ratio 0.01 --output baseline.json
+    python -m benchmarks.suite --scales 10000,100000 --invalid-ratio 0.01 --compare baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from Project_Shukla_v2 import PerformanceMetricsProcessor
+from Project_Srinivas_v3 import DataProcessor
+from benchmarks.synthetic import FIRST_NAMES, write_inputs
+from ketan_new_v3 import UserInteraction, parse_rates
+
+DATA_STEPS = ('read_employee_data', 'process_timesheets', 'process_evaluations', 'process_sales',
+              'calculate_utilization', 'write_error_log', 'write_employee_data')
+METRICS_STEPS = ('extract_evaluation_data', 'compute_evaluation_scores', 'determine_bonus_eligibility',
+                 'write_final_data')
+SWEEP_RATES = '0.5:50:0.5'
+
+
+def timed(results, step, function, *args, **kwargs):
+    """Run function with its output suppressed and keep its fastest wall time under step."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+    results[step] = min(elapsed, results.get(step, elapsed))
+    return result
+
+
+def run_stages(results, employees):
+    processor = DataProcessor()
+    processor.errors.open()
+    for step in DATA_STEPS:
+        timed(results, f"DataProcessor.{step}", getattr(processor, step))
+
+    metrics = PerformanceMetricsProcessor()
+    for step in METRICS_STEPS:
+        timed(results, f"PerformanceMetricsProcessor.{step}", getattr(metrics, step))
+
+    ui = UserInteraction()
+    timed(results, "UserInteraction.load_data", ui.load_data)
+    queries = [
+        ("search_employee.id", ui.search_employee, {'emp_id': str(101 + employees // 2)}),
+        ("search_employee.name", ui.search_employee, {'name': FIRST_NAMES[3]}),
+        ("search_employee.job", ui.search_employee, {'job_type': 'd'}),
+        ("descriptive_analytics", ui.descriptive_analytics, {}),
+        ("recognition_and_probation", ui.recognition_and_probation, {}),
+        ("leaderboards", ui.leaderboards, {'k': 10}),
+        ("simulate_bonus", ui.simulate_bonus, {'rate': 10}),
+        ("simulate_bonus_sweep", ui.simulate_bonus_sweep, {'rates': parse_rates(SWEEP_RATES)}),
+    ]
+    for name, query, arguments in queries:
+        timed(results, f"UserInteraction.{name}", query, **arguments)
+
+
+def run_scale(employees, timesheet_rows, seed, invalid_ratio, repeat):
+    """Time every stage on one generated input set; each step keeps its best of repeat runs."""
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        write_inputs(directory, employees, timesheet_rows, seed, invalid_ratio)
+        generate_time = time.perf_counter() - start
+        os.chdir(directory)
+        try:
+            for _ in range(repeat):
+                run_stages(results, employees)
+        finally:
+            os.chdir(cwd)
+    print(f"{employees} employees, {timesheet_rows} timesheet rows: inputs generated in {generate_time:.1f}s, "
+          f"stages took {sum(results.values()):.2f}s", file=sys.stderr)
+    return results
+
+
+def compare(report, baseline, tolerance, min_seconds):
+    """Return a line per step that is slower than the baseline by more than tolerance and min_seconds."""
+    regressions = []
+    for scale, results in report['results'].items():
+        previous = baseline['results'].get(scale, {})
+        for name, seconds in results.items():
+            before = previous.get(name)
+            if before is not None and seconds > before * (1 + tolerance) and seconds - before > min_seconds:
+                regressions.append(f"{scale} {name}: {before:.4f}s -> {seconds:.4f}s ({seconds / before - 1:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every stage on synthetic inputs and keep a JSON baseline")
+    parser.add_argument('--scales', default='10000,100000',
+                        help="comma-separated employee counts, from 10000 up to 10000000 (default: %(default)s)")
+    parser.add_argument('--timesheet-factor', type=float, default=1.0,
+                        help="timesheet rows per employee (default: %(default)s)")
+    parser.add_argument('--invalid-ratio', type=float, default=0.0,
+                        help="fraction of invalid rows and IDs in the generated inputs (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1, help="keep the best of this many runs per step")
+    parser.add_argument('--output', metavar='PATH', help="write the results to this JSON file")
+    parser.add_argument('--compare', metavar='PATH', help="check the results against this JSON baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown against the baseline, as a fraction (default: %(default)s)")
+    parser.add_argument('--min-seconds', type=float, default=0.005,
+                        help="ignore slowdowns smaller than this many seconds (default: %(default)s)")
+    args = parser.parse_args()
+
+    scales = [int(scale) for scale in args.scales.split(',')]
+    report = {
+        'config': {'scales': scales, 'timesheet_factor': args.timesheet_factor, 'invalid_ratio': args.invalid_ratio,
+                   'seed': args.seed, 'repeat': args.repeat},
+        'environment': {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+                        'machine': platform.machine(), 'system': platform.system()},
+        'results': {},
+    }
+    for employees in scales:
+        rows = int(employees * args.timesheet_factor)
+        report['results'][str(employees)] = run_scale(employees, rows, args.seed, args.invalid_ratio, args.repeat)
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if baseline['config'] != report['config']:
+            print(f"Warning: {args.compare} was recorded with {baseline['config']}", file=sys.stderr)
+        regressions = compare(report, baseline, args.tolerance, args.min_seconds)
+        for line in regressions:
+            print(f"Regression: {line}", file=sys.stderr)
+        if regressions:
+            raise SystemExit(1)
+        print(f"No regressions against {args.compare}.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
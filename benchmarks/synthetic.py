@@ -0,0 +1,68 @@
+"""
+Synthetic input files for the benchmarks
+"""
+
+import os
+import random
+
+BUFFER_SIZE = 1 << 20
+
+FIRST_NAMES = ['Maria', 'Ana', 'Antonio', 'Thomas', 'Christina', 'Hanna', 'Frederique', 'Martin', 'Laurence', 'Elizabeth']
+LAST_NAMES = ['Anders', 'Trujillo', 'Moreno', 'Hardy', 'Berglund', 'Moos', 'Citeaux', 'Sommer', 'Lebihan', 'Lincoln']
+COMMENTS = [
+    'Excellent client engagement.',
+    'Occasionally late to meetings.',
+    'Is dependable, prompt and delivers good work!',
+    'Completely unreliable.',
+    'Poor documentation, frequent error in reports.',
+]
+
+
+def write_inputs(directory, employees, timesheet_rows, seed=0, invalid_ratio=0.0):
+    """Write emp_beg_yr.txt, timesheet.txt, sales.txt and evaluation.txt into directory.
+
+    With invalid_ratio, about that fraction of employees are left out (gaps in the IDs) or
+    listed twice, and about that fraction of the other files' lines name an unknown
+    employee or are malformed. With the default of 0 the files do not change for a seed.
+    """
+    rng = random.Random(seed)
+    first_id = 101
+    ids = range(first_id, first_id + employees)
+    unknown_id = first_id + employees + 1000
+    directors = set()
+
+    def invalid():
+        return invalid_ratio and rng.random() < invalid_ratio
+
+    with open(os.path.join(directory, 'emp_beg_yr.txt'), 'w', buffering=BUFFER_SIZE) as file:
+        file.write('ID,LastName,FirstName,JobCode,BasePay\n')
+        for emp_id in ids:
+            job_code = 'D' if rng.random() < 0.2 else 'C'
+            line = f"{emp_id},{rng.choice(LAST_NAMES)},{rng.choice(FIRST_NAMES)},{job_code},{rng.randint(60000, 400000)}\n"
+            if invalid():
+                if rng.random() < 0.5:
+                    continue
+                file.write(line)
+            if job_code == 'D':
+                directors.add(emp_id)
+            file.write(line)
+
+    with open(os.path.join(directory, 'timesheet.txt'), 'w', buffering=BUFFER_SIZE) as file:
+        for _ in range(timesheet_rows):
+            if invalid():
+                file.write(f"{unknown_id + rng.randrange(employees)},8\n" if rng.random() < 0.5 else "n/a\n")
+                continue
+            file.write(f"{rng.randrange(first_id, first_id + employees)},{rng.randint(1, 400)}\n")
+
+    with open(os.path.join(directory, 'sales.txt'), 'w', buffering=BUFFER_SIZE) as file:
+        for emp_id in sorted(directors):
+            if invalid():
+                file.write(f"{unknown_id + rng.randrange(employees)},5000\n" if rng.random() < 0.5 else f"{emp_id};\n")
+            file.write(f"{emp_id},{rng.randint(1, 400) * 5000}\n")
+
+    with open(os.path.join(directory, 'evaluation.txt'), 'w', buffering=BUFFER_SIZE) as file:
+        for emp_id in ids:
+            if invalid():
+                file.write(f"{unknown_id + rng.randrange(employees)}#Good work.\n" if rng.random() < 0.5
+                           else f"{emp_id} without a separator\n")
+            file.write(f"{emp_id}#{' '.join(rng.sample(COMMENTS, 2))} \n")
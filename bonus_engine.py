@@ -0,0 +1,109 @@
+"""
+Batch bonus engine
+
+Computes the 65th-percentile utilization threshold, the eligibility mask and
+the capped bonuses for a whole workforce at once from EmployeeTable columns
+with whole-column comprehensions; employee_bonus applies the same rules to
+one employee.
+
+Also evaluates capped payouts for many what-if rates from bases sorted once
+and their exact prefix sums: each bonus is min(base * rate, cap) without
+rounding, and a payout is their exact total rounded once.
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+from fractions import Fraction
+from itertools import accumulate
+
+from percentiles import select_kth
+
+CONSULTANT_RATE = 0.1
+DIRECTOR_RATE = 0.15
+CONSULTANT_CAP = 50000
+DIRECTOR_CAP = 150000
+ELIGIBILITY_PERCENTILE = 0.65
+MIN_EVALUATION = 3.5
+
+
+def compute_bonuses(job_codes, base_pay, sales, evaluation, utilization, consultant, director):
+    """Return (bonus column, eligibility mask) for the given columns, or None without consultants.
+
+    consultant and director are the job code values used in job_codes (None if absent).
+    A NaN evaluation score ('N/A') never qualifies. Directors are always eligible.
+    """
+    if consultant is None:
+        return None
+
+    threshold = eligibility_threshold(job_codes, utilization, consultant)
+    if threshold is None:
+        return None
+
+    eligible = [
+        code == director or (code == consultant and value >= threshold and score >= MIN_EVALUATION)
+        for code, value, score in zip(job_codes, utilization, evaluation)
+    ]
+    bonuses = array('d', [
+        (min(amount * DIRECTOR_RATE, DIRECTOR_CAP) if code == director else min(pay * CONSULTANT_RATE, CONSULTANT_CAP))
+        if is_eligible else 0.0
+        for is_eligible, code, pay, amount in zip(eligible, job_codes, base_pay, sales)
+    ])
+    return bonuses, eligible
+
+
+def eligibility_threshold(job_codes, utilization, consultant):
+    """Return the consultants' 65th-percentile utilization, or None without consultants."""
+    consultant_utilization = [value for code, value in zip(job_codes, utilization) if code == consultant]
+    if not consultant_utilization:
+        return None
+    return select_kth(consultant_utilization, int(len(consultant_utilization) * ELIGIBILITY_PERCENTILE))
+
+
+def employee_bonus(code, pay, amount, score, value, threshold, consultant, director):
+    """Return one employee's bonus under the rules of compute_bonuses, or None if not eligible."""
+    if code == director:
+        return float(min(amount * DIRECTOR_RATE, DIRECTOR_CAP))
+    if code == consultant and value >= threshold and score >= MIN_EVALUATION:
+        return float(min(pay * CONSULTANT_RATE, CONSULTANT_CAP))
+    return None
+
+
+def sweep_bases(values):
+    """Sort bonus bases once for capped_payout: returns (sorted bases, prefix sums, scale).
+
+    The prefix sums are whole multiples of 1 / scale (a power of two no float base is finer
+    than), so they are the exact sums of the bases.
+    """
+    bases = sorted(values)
+    scale = max((base.as_integer_ratio()[1] for base in bases), default=1)
+    prefix = list(accumulate((numerator * (scale // denominator)
+                              for numerator, denominator in (base.as_integer_ratio() for base in bases)),
+                             initial=0))
+    return bases, prefix, scale
+
+
+def cap_threshold(rate, cap):
+    """Return the smallest float base whose exact bonus base * rate reaches cap (inf if none does)."""
+    if rate <= 0:
+        return math.inf
+    exact_rate = Fraction(rate)
+    threshold = cap / rate
+    # cap / rate is rounded; step to the first float on the capped side.
+    while Fraction(threshold) * exact_rate < cap:
+        threshold = math.nextafter(threshold, math.inf)
+    while Fraction(math.nextafter(threshold, 0)) * exact_rate >= cap:
+        threshold = math.nextafter(threshold, 0)
+    return threshold
+
+
+def capped_payout(prepared, rate, cap):
+    """Return (exact sum of min(base * rate, cap) as a Fraction, number of capped bonuses) for prepared sweep bases.
+
+    Bases at or above cap_threshold are capped, so one binary search per rate replaces
+    a pass over every employee.
+    """
+    bases, prefix, scale = prepared
+    uncapped = bisect_left(bases, cap_threshold(rate, cap))
+    capped = len(bases) - uncapped
+    return Fraction(prefix[uncapped], scale) * Fraction(rate) + cap * capped, capped
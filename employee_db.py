@@ -0,0 +1,206 @@
+"""
+Optional SQLite backend for the employee data (stdlib sqlite3 only)
+
+DataProcessor writes its employees into the employee_data table and
+PerformanceMetricsProcessor reads them from there and writes the final rows,
+bonuses included, into emp_end_yr. Both tables have the EmployeeTable columns
+plus the row number, so rows come back in file order, and the lowercased full
+name that name searches match. Tables are rewritten in one transaction with
+executemany, and emp_end_yr's indexes (ID, job code with utilization,
+utilization) are created after the rows are in, which is cheaper than
+maintaining them row by row.
+
+The user interface's search, analytics and recognition/probation queries are
+answered by SQL over emp_end_yr, so it never has to load every employee.
+"""
+
+import sqlite3
+
+from employee_table import NUMERIC_COLUMNS, EmployeeTable
+
+EMPLOYEE_DATA = 'employee_data'
+FINAL_DATA = 'emp_end_yr'
+COLUMNS = ('id', 'last_name', 'first_name', 'job_code') + NUMERIC_COLUMNS
+RECORD_COLUMNS = ', '.join(COLUMNS)
+FINAL_INDEXES = {
+    'emp_end_yr_id': 'id',
+    'emp_end_yr_job_code': 'job_code, utilization',
+    'emp_end_yr_utilization': 'utilization',
+}
+TABLE_COLUMNS = ('row INTEGER PRIMARY KEY, id INTEGER NOT NULL, last_name TEXT, first_name TEXT, job_code TEXT, '
+                 'base_pay REAL, hours REAL, utilization REAL, evaluation_score REAL, sales REAL, bonus REAL, '
+                 'search_name TEXT')
+BATCH_SIZE = 10000
+
+
+def _record(cursor, values):
+    """Row factory returning the same dicts as EmployeeTable.record."""
+    return dict(zip(COLUMNS, values))
+
+
+class EmployeeDatabase:
+    def __init__(self, path):
+        self.path = path
+        # Callers that share the database between threads serialize access themselves (UserInteraction's data lock).
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+
+    def close(self):
+        self.connection.close()
+
+    def has_table(self, name):
+        found = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone()
+        return found is not None
+
+    def row_count(self, name):
+        if not self.has_table(name):
+            return 0
+        return self.connection.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+
+    def write_table(self, name, table, bonus=None, indexes=None):
+        """Replace the named table with the rows of an EmployeeTable, in one transaction.
+
+        bonus overrides the table's bonus column (a sequence with one value per row).
+        """
+        if bonus is None:
+            bonus = table.bonus
+        labels = table.job_code_labels
+        # SQLite's lower() only folds ASCII, so the searched full name is lowercased here, as EmployeeIndex does.
+        search_names = (f"{first_name} {last_name}".lower()
+                        for first_name, last_name in zip(table.first_names, table.last_names))
+        rows = zip(range(len(table)), table.ids, table.last_names, table.first_names,
+                   (labels[code] for code in table.job_codes), table.base_pay, table.hours,
+                   table.utilization, table.evaluation_score, table.sales, bonus, search_names)
+        with self.connection:
+            self.connection.execute(f"DROP TABLE IF EXISTS {name}")
+            self.connection.execute(f"CREATE TABLE {name} ({TABLE_COLUMNS})")
+            self.connection.executemany(f"INSERT INTO {name} VALUES ({', '.join('?' * 12)})", rows)
+            for index, columns in (indexes or {}).items():
+                self.connection.execute(f"CREATE INDEX {index} ON {name} ({columns})")
+
+    def read_table(self, name):
+        """Return the named table as a new EmployeeTable, in row order."""
+        table = EmployeeTable()
+        cursor = self.connection.execute(f"SELECT {RECORD_COLUMNS} FROM {name} ORDER BY row")
+        while True:
+            batch = cursor.fetchmany(BATCH_SIZE)
+            if not batch:
+                break
+            table.extend(*zip(*batch))
+        return table
+
+    def write_employee_data(self, table):
+        """Store DataProcessor's employees (the contents of employee_data.csv)."""
+        self.write_table(EMPLOYEE_DATA, table)
+
+    def read_employee_data(self):
+        return self.read_table(EMPLOYEE_DATA)
+
+    def write_final_data(self, table, bonus):
+        """Store the final employees (the contents of emp_end_yr.txt) with their bonuses, and index them."""
+        self.write_table(FINAL_DATA, table, bonus, FINAL_INDEXES)
+
+    def find(self, emp_id=None, name=None, job_type=None):
+        """Return, in row order, the records matching any of the given criteria (as EmployeeIndex.search)."""
+        conditions = []
+        parameters = []
+        if emp_id:
+            # Only IDs that print exactly as given match, as in EmployeeIndex.by_id.
+            try:
+                value = int(emp_id)
+            except (TypeError, ValueError):
+                value = None
+            if value is not None and str(value) == str(emp_id):
+                conditions.append("id = ?")
+                parameters.append(value)
+        if name:
+            conditions.append("instr(search_name, ?) > 0")
+            parameters.append(name.lower())
+        if job_type:
+            conditions.append("job_code = ?")
+            parameters.append(job_type.upper())
+        if not conditions:
+            return []
+        return self._records(f"SELECT {RECORD_COLUMNS} FROM {FINAL_DATA} WHERE {' OR '.join(conditions)} "
+                             f"ORDER BY row", parameters)
+
+    def _records(self, query, parameters=()):
+        cursor = self.connection.cursor()
+        cursor.row_factory = _record
+        return cursor.execute(query, parameters).fetchall()
+
+    def _column(self, column):
+        if column not in NUMERIC_COLUMNS:
+            raise KeyError(column)
+        return column
+
+    def summary(self, column, where="1"):
+        """Return (count, mean, sample stdev or None, min, max) of a column over the rows matching where."""
+        column = self._column(column)
+        count, mean, minimum, maximum = self.connection.execute(
+            f"SELECT COUNT({column}), AVG({column}), MIN({column}), MAX({column}) "
+            f"FROM {FINAL_DATA} WHERE {where}").fetchone()
+        stdev = None
+        if count > 1:
+            # Two passes, squaring deviations from the mean, rather than the cancellation-prone sum of squares.
+            squares = self.connection.execute(
+                f"SELECT TOTAL(({column} - ?) * ({column} - ?)) FROM {FINAL_DATA} WHERE {where}",
+                (mean, mean)).fetchone()[0]
+            stdev = (squares / (count - 1)) ** 0.5
+        return count, mean, stdev, minimum, maximum
+
+    def median(self, column, where="1"):
+        """Median as statistics.median computes it, of a column over the rows matching where."""
+        column = self._column(column)
+        count = self.connection.execute(f"SELECT COUNT(*) FROM {FINAL_DATA} WHERE {where}").fetchone()[0]
+        if count == 0:
+            raise ValueError("no median for empty data")
+        middle = self.connection.execute(
+            f"SELECT {column} FROM {FINAL_DATA} WHERE {where} ORDER BY {column} LIMIT ? OFFSET ?",
+            (2 - count % 2, (count - 1) // 2)).fetchall()
+        return sum(value for value, in middle) / len(middle)
+
+    def kth(self, column, k):
+        """Return the k-th smallest value (0-based) of a column."""
+        column = self._column(column)
+        found = None
+        if k >= 0:
+            found = self.connection.execute(
+                f"SELECT {column} FROM {FINAL_DATA} ORDER BY {column} LIMIT 1 OFFSET ?", (k,)).fetchone()
+        if found is None:
+            raise IndexError("selection index out of range")
+        return found[0]
+
+    def top(self, column, job_code):
+        """Return the records of one job code holding its highest value of a column, or None if it has no rows."""
+        column = self._column(column)
+        maximum = self.connection.execute(
+            f"SELECT MAX({column}) FROM {FINAL_DATA} WHERE job_code = ?", (job_code,)).fetchone()[0]
+        if maximum is None:
+            return None
+        return self._records(f"SELECT {RECORD_COLUMNS} FROM {FINAL_DATA} WHERE job_code = ? AND {column} = ? "
+                             f"ORDER BY row", (job_code, maximum))
+
+    def ranked(self, column, job_code, k, descending=True):
+        """Return the records of one job code with the k highest (or lowest) values of a column, ties in row order."""
+        column = self._column(column)
+        order = "DESC" if descending else "ASC"
+        return self._records(f"SELECT {RECORD_COLUMNS} FROM {FINAL_DATA} WHERE job_code = ? "
+                             f"ORDER BY {column} {order}, row LIMIT ?", (job_code, k))
+
+    def job_codes(self):
+        """Return the job codes present, in order of first appearance."""
+        return [job_code for job_code, in self.connection.execute(
+            f"SELECT job_code FROM {FINAL_DATA} GROUP BY job_code ORDER BY MIN(row)")]
+
+    def probation(self, threshold):
+        """Return the consultants with utilization below threshold and an evaluation below 1."""
+        return self._records(f"SELECT {RECORD_COLUMNS} FROM {FINAL_DATA} WHERE job_code = 'C' AND "
+                             f"utilization < ? AND evaluation_score < 1 ORDER BY row", (threshold,))
+
+    def values(self, column, job_code, where):
+        """Yield a column's values over the rows of one job code matching where."""
+        column = self._column(column)
+        cursor = self.connection.execute(
+            f"SELECT {column} FROM {FINAL_DATA} WHERE job_code = ? AND {where}", (job_code,))
+        return (value for value, in cursor)
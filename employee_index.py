@@ -0,0 +1,150 @@
+"""
+Search index over an EmployeeTable
+
+Looks employees up by ID through the table's ID index, by job code through
+per-code row buckets, and by name substring through a trigram index over the
+distinct lowercased full names, so a search touches only candidate rows
+instead of formatting and lowercasing every employee's name. The index
+listens to its table and takes in added rows as they come, so a table that
+is still being loaded can be searched without rebuilding it.
+"""
+
+from array import array
+
+GRAM = 3
+
+
+def _grams(text):
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+class EmployeeIndex:
+    def __init__(self, table):
+        self.table = table
+        self.version = None
+        self.build()
+        table.listeners.append(self)
+
+    def build(self):
+        """(Re)build the job code buckets and the name index from the table."""
+        table = self.table
+        # The table's ID index keeps the last row per ID; earlier rows of a repeated ID are kept here.
+        self.repeated_ids = {}
+        for row, emp_id in enumerate(table.ids):
+            if table.index.get(emp_id) != row:
+                self.repeated_ids.setdefault(emp_id, []).append(row)
+        self.job_code_rows = {label: array('q') for label in table.job_code_labels}
+        for row, code in enumerate(table.job_codes):
+            self.job_code_rows[table.job_code_labels[code]].append(row)
+
+        # Many employees share a full name, so names are indexed once each and map to their rows.
+        name_ids = self.name_ids = {}
+        self.names = []
+        self.name_rows = []
+        for row, (first_name, last_name) in enumerate(zip(table.first_names, table.last_names)):
+            key = (first_name, last_name)
+            name_id = name_ids.get(key)
+            if name_id is None:
+                name_id = name_ids[key] = len(self.names)
+                self.names.append(f"{first_name} {last_name}".lower())
+                self.name_rows.append(array('q'))
+            self.name_rows[name_id].append(row)
+
+        self.grams = {}
+        for name_id, name in enumerate(self.names):
+            for gram in _grams(name):
+                postings = self.grams.get(gram)
+                if postings is None:
+                    postings = self.grams[gram] = array('q')
+                postings.append(name_id)
+        self.version = table.version
+
+    def row_added(self, row):
+        """Table listener: index a newly added row."""
+        table = self.table
+        if self.version != table.version - 1:
+            return
+        if len(table.index) < len(table):
+            # A repeated ID: leave the earlier rows' bookkeeping to a full rebuild on the next search.
+            self.version = None
+            return
+        label = table.job_code(row)
+        rows = self.job_code_rows.get(label)
+        if rows is None:
+            rows = self.job_code_rows[label] = array('q')
+        rows.append(row)
+        key = (table.first_names[row], table.last_names[row])
+        name_id = self.name_ids.get(key)
+        if name_id is None:
+            name_id = self.name_ids[key] = len(self.names)
+            name = f"{key[0]} {key[1]}".lower()
+            self.names.append(name)
+            self.name_rows.append(array('q'))
+            for gram in _grams(name):
+                postings = self.grams.get(gram)
+                if postings is None:
+                    postings = self.grams[gram] = array('q')
+                postings.append(name_id)
+        self.name_rows[name_id].append(row)
+        self.version = table.version
+
+    def value_changed(self, row, column, old, new):
+        """Table listener: numeric values are not indexed, so only the version moves on."""
+        if self.version == self.table.version - 1:
+            self.version = self.table.version
+
+    def refresh(self):
+        """Rebuild the index if the table changed since it was built."""
+        if self.version != self.table.version:
+            self.build()
+
+    def by_id(self, emp_id):
+        """Return the rows whose ID prints exactly as emp_id."""
+        self.refresh()
+        try:
+            value = int(emp_id)
+        except (TypeError, ValueError):
+            return []
+        if str(value) != str(emp_id):
+            return []
+        row = self.table.index.get(value)
+        if row is None:
+            return []
+        return self.repeated_ids.get(value, []) + [row]
+
+    def by_job_code(self, job_code):
+        self.refresh()
+        return list(self.job_code_rows.get(job_code, ()))
+
+    def by_name(self, name):
+        """Return the rows whose lowercased 'First Last' contains name, ignoring case."""
+        self.refresh()
+        query = name.lower()
+        if len(query) < GRAM:
+            candidates = range(len(self.names))
+        else:
+            # Every match contains all of the query's trigrams; the rarest one gives the fewest names to check.
+            candidates = None
+            for gram in _grams(query):
+                found = self.grams.get(gram)
+                if found is None:
+                    return []
+                if candidates is None or len(found) < len(candidates):
+                    candidates = found
+        rows = []
+        for name_id in candidates:
+            if query in self.names[name_id]:
+                rows.extend(self.name_rows[name_id])
+        rows.sort()
+        return rows
+
+    def search(self, emp_id=None, name=None, job_type=None):
+        """Return, in table order, the rows matching any of the given criteria."""
+        rows = set()
+        if emp_id:
+            rows.update(self.by_id(emp_id))
+        if name:
+            rows.update(self.by_name(name))
+        if job_type:
+            rows.update(self.by_job_code(job_type.upper()))
+        return sorted(rows)
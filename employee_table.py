@@ -0,0 +1,239 @@
+"""
+Columnar employee store shared by all three stages
+
+Each numeric field is one typed stdlib array, so an employee costs a few
+machine words instead of a dict with its own keys and boxed floats. Rows are
+found through an ID -> row index that is itself an array while IDs are dense.
+"""
+
+import sys
+from array import array
+
+NUMERIC_COLUMNS = ('base_pay', 'hours', 'utilization', 'evaluation_score', 'sales', 'bonus')
+
+
+class IdIndex:
+    """ID -> row mapping kept as an array over the ID range, switching to a dict once IDs get sparse."""
+
+    def __init__(self):
+        self.base = 0
+        self.rows = array('q')
+        self.sparse = None
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, emp_id):
+        return self.get(emp_id) is not None
+
+    def __getitem__(self, emp_id):
+        row = self.get(emp_id)
+        if row is None:
+            raise KeyError(emp_id)
+        return row
+
+    def __iter__(self):
+        if self.sparse is not None:
+            return iter(self.sparse)
+        return (self.base + offset for offset, row in enumerate(self.rows) if row >= 0)
+
+    def get(self, emp_id, default=None):
+        if self.sparse is not None:
+            return self.sparse.get(emp_id, default)
+        offset = emp_id - self.base
+        if 0 <= offset < len(self.rows):
+            row = self.rows[offset]
+            if row >= 0:
+                return row
+        return default
+
+    def __setitem__(self, emp_id, row):
+        if self.sparse is None:
+            if not self.rows:
+                self.base = emp_id
+            offset = emp_id - self.base
+            limit = 4 * (self.count + 1) + 1024
+            below = above = 0
+            if offset < 0:
+                # Grow downwards geometrically when the density allows, so descending IDs stay cheap.
+                below = max(-offset, len(self.rows))
+                if len(self.rows) + below > limit:
+                    below = -offset
+            elif offset >= len(self.rows):
+                above = offset + 1 - len(self.rows)
+            if len(self.rows) + below + above <= limit:
+                if below:
+                    self.rows = array('q', [-1]) * below + self.rows
+                    self.base -= below
+                    offset += below
+                if above:
+                    self.rows.extend(array('q', [-1]) * above)
+                if self.rows[offset] < 0:
+                    self.count += 1
+                self.rows[offset] = row
+                return
+            self.sparse = dict(self.items())
+            self.rows = array('q')
+        if emp_id not in self.sparse:
+            self.count += 1
+        self.sparse[emp_id] = row
+
+    def extend(self, ids, first_row):
+        """Map ids (a sequence) to consecutive rows from first_row on, as setting them one by one would."""
+        if not ids:
+            return
+        if self.sparse is None:
+            low, high = min(ids), max(ids)
+            if self.rows:
+                low, high = min(low, self.base), max(high, self.base + len(self.rows) - 1)
+            if high - low + 1 <= 4 * (self.count + len(ids)) + 1024:
+                if not self.rows:
+                    self.base = low
+                    self.rows = array('q', [-1]) * (high + 1 - low)
+                below = self.base - low
+                above = high + 1 - self.base - len(self.rows)
+                if below:
+                    self.rows = array('q', [-1]) * below + self.rows
+                    self.base = low
+                if above:
+                    self.rows.extend(array('q', [-1]) * above)
+                rows, base, count = self.rows, self.base, self.count
+                for row, emp_id in enumerate(ids, first_row):
+                    offset = emp_id - base
+                    if rows[offset] < 0:
+                        count += 1
+                    rows[offset] = row
+                self.count = count
+                return
+            self.sparse = dict(self.items())
+            self.rows = array('q')
+        self.sparse.update(zip(ids, range(first_row, first_row + len(ids))))
+        self.count = len(self.sparse)
+
+    def items(self):
+        if self.sparse is not None:
+            return self.sparse.items()
+        return [(self.base + offset, row) for offset, row in enumerate(self.rows) if row >= 0]
+
+
+class EmployeeTable:
+    def __init__(self):
+        self.ids = array('q')
+        self.last_names = []
+        self.first_names = []
+        self.job_codes = array('H')
+        self.job_code_labels = []
+        self.base_pay = array('d')
+        self.hours = array('d')
+        self.utilization = array('d')
+        self.evaluation_score = array('d')
+        self.sales = array('d')
+        self.bonus = array('d')
+        self.index = IdIndex()
+        self.version = 0
+        # Objects with row_added(row) and value_changed(row, column, old, new), told about every change.
+        self.listeners = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, emp_id):
+        return emp_id in self.index
+
+    def add(self, emp_id, last_name, first_name, job_code, base_pay, hours=0.0, utilization=0.0,
+            evaluation_score=0.0, sales=0.0, bonus=0.0):
+        """Append one employee and return its row number."""
+        row = len(self.ids)
+        self.ids.append(emp_id)
+        self.last_names.append(sys.intern(last_name))
+        self.first_names.append(sys.intern(first_name))
+        self.job_codes.append(self.job_code_id(job_code, create=True))
+        self.base_pay.append(base_pay)
+        self.hours.append(hours)
+        self.utilization.append(utilization)
+        self.evaluation_score.append(evaluation_score)
+        self.sales.append(sales)
+        self.bonus.append(bonus)
+        self.index[emp_id] = row
+        self.version += 1
+        for listener in self.listeners:
+            listener.row_added(row)
+        return row
+
+    def extend(self, ids, last_names, first_names, job_codes, base_pay, hours=None, utilization=None,
+               evaluation_score=None, sales=None, bonus=None):
+        """Append many employees at once, from one sequence per field, as add would one by one.
+
+        Each column is filled in one go; numeric fields left out are 0.0.
+        """
+        first_row = len(self.ids)
+        self.ids.extend(ids)
+        self.last_names.extend(map(sys.intern, last_names))
+        self.first_names.extend(map(sys.intern, first_names))
+        # New job codes get their numbers in order of first appearance, as add gives them.
+        codes = {job_code: self.job_code_id(job_code, create=True) for job_code in dict.fromkeys(job_codes)}
+        self.job_codes.extend(map(codes.__getitem__, job_codes))
+        for name, values in zip(NUMERIC_COLUMNS, (base_pay, hours, utilization, evaluation_score, sales, bonus)):
+            getattr(self, name).extend(array('d', bytes(8 * len(ids))) if values is None else values)
+        self.index.extend(ids, first_row)
+        if not self.listeners:
+            self.version += 1
+            return
+        # Listeners follow the table one version, i.e. one added row, at a time.
+        for row in range(first_row, len(self.ids)):
+            self.version += 1
+            for listener in self.listeners:
+                listener.row_added(row)
+
+    def job_code_id(self, job_code, create=False):
+        """Return the small integer stored in job_codes for a job code label, or None if unseen."""
+        try:
+            return self.job_code_labels.index(job_code)
+        except ValueError:
+            if not create:
+                return None
+            self.job_code_labels.append(job_code)
+            return len(self.job_code_labels) - 1
+
+    def job_code(self, row):
+        return self.job_code_labels[self.job_codes[row]]
+
+    def column(self, name):
+        """Return the array holding one numeric column."""
+        if name not in NUMERIC_COLUMNS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def set_value(self, row, name, value):
+        """Change one numeric value and tell the listeners about it."""
+        data = self.column(name)
+        old = data[row]
+        data[row] = value
+        self.version += 1
+        for listener in self.listeners:
+            listener.value_changed(row, name, old, value)
+
+    def rows_with_job_code(self, job_code):
+        """Return the row numbers of every employee with the given job code."""
+        code = self.job_code_id(job_code)
+        return [row for row, value in enumerate(self.job_codes) if value == code]
+
+    def record(self, row):
+        """Return one employee as a plain dict, for display."""
+        return {
+            'id': self.ids[row],
+            'last_name': self.last_names[row],
+            'first_name': self.first_names[row],
+            'job_code': self.job_code(row),
+            'base_pay': self.base_pay[row],
+            'hours': self.hours[row],
+            'utilization': self.utilization[row],
+            'evaluation_score': self.evaluation_score[row],
+            'sales': self.sales[row],
+            'bonus': self.bonus[row],
+        }
+
+    def mark_changed(self):
+        """Record that column values were updated in place, invalidating anything cached on them."""
+        self.version += 1
@@ -0,0 +1,131 @@
+"""
+Streaming, bounded-memory error log
+
+ErrorSink writes every data error to error_log.jsonl as a JSON line the
+moment it is found, counts them per category and keeps the sample_limit
+smallest distinct samples per category for the error.txt summary, so the
+summary lists a sorted prefix of the errors whatever order they arrive in. Missing employee IDs
+are found from the gaps between sorted IDs and recorded as ranges, so a stray
+large ID costs one record rather than one per absent number.
+"""
+
+import heapq
+import itertools
+import json
+from collections import Counter
+
+ERROR_LOG_FILE = 'error_log.jsonl'
+SAMPLE_LIMIT = 1000
+BUFFER_SIZE = 1 << 20
+CATEGORIES = ('timesheet', 'evaluation', 'sales', 'duplicate', 'missing_ids',
+              'invalid_timesheet', 'invalid_evaluation', 'invalid_sales')
+
+
+def missing_ranges(ids):
+    """Yield (first, last) for every run of integers absent between consecutive sorted ids."""
+    previous = None
+    for emp_id in ids:
+        if previous is not None and emp_id > previous + 1:
+            yield previous + 1, emp_id - 1
+        previous = emp_id
+
+
+def format_ranges(ranges):
+    """Format (first, last) ranges as '3, 7, 10-25'; runs of two stay as two numbers."""
+    parts = []
+    for first, last in ranges:
+        if last - first >= 2:
+            parts.append(f"{first}-{last}")
+        else:
+            parts.extend(map(str, range(first, last + 1)))
+    return ", ".join(parts)
+
+
+class ErrorSink:
+    def __init__(self, path=ERROR_LOG_FILE, sample_limit=SAMPLE_LIMIT):
+        self.path = path
+        self.sample_limit = sample_limit
+        self.counts = Counter()
+        self.samples = {category: set() for category in CATEGORIES}
+        # Per category, the largest sample kept at the last pruning; larger ones can never be listed.
+        self.cutoffs = {}
+        # Categories that had more distinct samples than sample_limit.
+        self.truncated = set()
+        self.file = None
+
+    def open(self, append=False):
+        """Start streaming records to path; without this the sink only counts and samples."""
+        self.close()
+        self.file = open(self.path, 'a' if append else 'w', buffering=BUFFER_SIZE)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def record(self, category, sample, **fields):
+        """Count one error, keep sample if it may be among the smallest and stream the record."""
+        self.counts[category] += 1
+        samples = self.samples[category]
+        if sample not in samples:
+            cutoff = self.cutoffs.get(category)
+            if cutoff is not None and sample > cutoff:
+                self.truncated.add(category)
+            else:
+                samples.add(sample)
+                if len(samples) > 2 * self.sample_limit:
+                    self.prune(category)
+        if self.file is not None:
+            self.file.write(json.dumps(dict(category=category, **fields)) + '\n')
+
+    def prune(self, category):
+        """Keep only the sample_limit smallest samples of category; amortized over sample_limit records."""
+        samples = self.samples[category]
+        if len(samples) > self.sample_limit:
+            kept = heapq.nsmallest(self.sample_limit, samples)
+            self.samples[category] = set(kept)
+            self.cutoffs[category] = kept[-1]
+            self.truncated.add(category)
+
+    def reset(self, category):
+        """Forget one category, e.g. when its input file is reprocessed from scratch."""
+        self.counts.pop(category, None)
+        self.samples[category] = set()
+        self.cutoffs.pop(category, None)
+        self.truncated.discard(category)
+        if self.file is not None:
+            self.file.write(json.dumps({'category': category, 'reset': True}) + '\n')
+
+    def sorted_samples(self, category):
+        self.prune(category)
+        return sorted(self.samples[category])
+
+    def state(self):
+        """Counters and samples, for incremental runs to carry over."""
+        return {'counts': self.counts, 'samples': self.samples, 'cutoffs': self.cutoffs, 'truncated': self.truncated}
+
+    def restore(self, state):
+        self.counts = state['counts']
+        self.samples = state['samples']
+        self.cutoffs = state.get('cutoffs', {})
+        self.truncated = state['truncated']
+
+
+def iter_error_records(path=ERROR_LOG_FILE, category=None, emp_id=None):
+    """Yield the records of an error log one at a time, optionally only one category and/or employee ID."""
+    with open(path, 'r') as file:
+        for line in file:
+            record = json.loads(line)
+            if category is not None and record['category'] != category:
+                continue
+            if emp_id is not None and record.get('id') != emp_id and not (
+                    record.get('first', emp_id + 1) <= emp_id <= record.get('last', emp_id - 1)):
+                continue
+            yield record
+
+
+def read_error_page(page, page_size, path=ERROR_LOG_FILE, category=None, emp_id=None):
+    """Return (records on the 0-based page, whether more follow), reading no further than needed."""
+    records = iter_error_records(path, category, emp_id)
+    found = list(itertools.islice(records, page * page_size, (page + 1) * page_size + 1))
+    return found[:page_size], len(found) > page_size
@@ -0,0 +1,82 @@
+"""
+Exact, order-independent sums of floats
+
+Adding money and hours with float += rounds after every addition, so the
+total depends on the order the values arrive in: serial, chunked and
+parallel runs can differ in the last cents. ExactSum keeps the exact sum of
+everything added as a short list of floats (an expansion) and reports it
+correctly rounded with math.fsum, so any order or grouping of the same
+values gives the same total. Partial sums from chunks, worker processes or
+partitions merge exactly.
+
+An expansion of a batch is found with fsum passes that run at C speed: the
+first pass gives the rounded sum, each further pass the rounded remainder
+the terms so far leave, until the remainder is exactly zero (usually after
+one or two passes).
+
+For many small running sums, such as hours per employee, a plain float sum
+can be kept instead: adding two floats either is exact or loses an error that
+is itself a float (two_sum_error), so keeping the rare errors next to the sum
+keeps it exact at the cost of a float addition and two checks per value.
+"""
+
+from itertools import chain
+from math import fsum, isfinite
+
+# Merged expansions are re-expanded once they hold more terms than this.
+MAX_TERMS = 32
+
+
+def expansion(values):
+    """Return floats whose exact sum is the exact sum of values (a list or other re-iterable)."""
+    terms = []
+    total = fsum(values)
+    while total:
+        terms.append(total)
+        if not isfinite(total):
+            break
+        total = fsum(chain(values, (-term for term in terms)))
+    return terms
+
+
+class ExactSum:
+    __slots__ = ('terms',)
+
+    def __init__(self, values=()):
+        self.terms = []
+        self.extend(values)
+
+    def add(self, value):
+        self.terms.append(value)
+        if len(self.terms) > MAX_TERMS:
+            self.terms = expansion(self.terms)
+
+    def extend(self, values):
+        """Add a batch of values; a list or array is read in place, other iterables are listed first."""
+        if not isinstance(values, (list, tuple)) and not hasattr(values, 'buffer_info'):
+            values = list(values)
+        self.terms.extend(expansion(values))
+        if len(self.terms) > MAX_TERMS:
+            self.terms = expansion(self.terms)
+
+    def merge(self, other):
+        """Add another ExactSum, e.g. the partial sum of a chunk or worker process."""
+        self.extend(other.terms)
+        return self
+
+    @property
+    def value(self):
+        """The exact sum, correctly rounded to a float."""
+        return fsum(self.terms)
+
+    def __float__(self):
+        return self.value
+
+
+def two_sum_error(a, b, total):
+    """The rounding error of total = a + b, a float with a + b == total + error exactly.
+
+    total = a + b was exact if and only if total - a == b and total - b == a.
+    """
+    b_virtual = total - a
+    return (a - (total - b_virtual)) + (b - b_virtual)
@@ -0,0 +1,127 @@
+"""
+Block reader for the flat input files
+(emp_beg_yr.txt, timesheet.txt, sales.txt, evaluation.txt)
+
+A byte range of the file is read in large blocks cut at line breaks, and each
+block is split into lines at once. Numeric files (timesheet.txt, sales.txt)
+stay bytes, which int() and float() parse directly; files whose text is kept
+(evaluation.txt comments, emp_beg_yr.txt names) are decoded a block at a
+time, which is cheaper than decoding line by line or field by field.
+
+find_output and open_text read the CSV outputs of the stages, which
+flat_file_writer may have written gzip- or zstd-compressed.
+"""
+
+import csv
+import gzip
+import io
+import os
+
+COMPRESSED_SUFFIXES = {'.gz': 'gzip', '.zst': 'zstd'}
+BLOCK_SIZE = 1 << 20
+
+
+def zstd_module():
+    """Return compression.zstd (Python 3.14+) or the zstandard package, whichever is available."""
+    try:
+        from compression import zstd
+    except ImportError:
+        try:
+            import zstandard as zstd
+        except ImportError:
+            raise RuntimeError("zstd compression needs Python 3.14+ or the zstandard package") from None
+    return zstd
+
+
+def find_output(path):
+    """Return whichever of path, path.gz and path.zst was written last, or path if none exists."""
+    candidates = [candidate for candidate in [path] + [path + suffix for suffix in COMPRESSED_SUFFIXES]
+                  if os.path.exists(candidate)]
+    return max(candidates, key=os.path.getmtime) if candidates else path
+
+
+def open_text(path, fileobj=None):
+    """Open path for reading text, decompressing it if its suffix says it is compressed.
+
+    With fileobj the data is read from that binary file instead, so a caller can
+    follow the progress through the (compressed) file with fileobj.tell().
+    """
+    compression = COMPRESSED_SUFFIXES.get(os.path.splitext(path)[1])
+    source = path if fileobj is None else fileobj
+    if compression == 'gzip':
+        return gzip.open(source, 'rt')
+    if compression == 'zstd':
+        return zstd_module().open(source, 'rt')
+    return open(path, 'r') if fileobj is None else io.TextIOWrapper(fileobj)
+
+
+def _blocks(path, start, end):
+    """Yield the bytes of path between offsets start and end in blocks ending on a line break.
+
+    Only the last block can end mid-line, at end or at a file without a final newline.
+    """
+    with open(path, 'rb', buffering=0) as file:
+        file.seek(start)
+        remaining = end - start
+        pending = b''
+        while remaining:
+            block = file.read(min(BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            block = pending + block
+            cut = block.rfind(b'\n') + 1
+            pending = block[cut:]
+            if cut:
+                yield block[:cut]
+        if pending:
+            yield pending
+
+
+def iter_lines(path, start=0, end=None, skip_blank=True, text=False):
+    """Yield (line number, stripped line) for the lines of path between byte offsets start and end.
+
+    Lines are bytes, or str with text=True. Line numbers count every line from start,
+    blank ones included, so they match text-mode enumeration of the same range.
+    """
+    size = os.path.getsize(path)
+    if end is None or end > size:
+        end = size
+    if start >= end:
+        return
+    line_no = 0
+    for block in _blocks(path, start, end):
+        lines = block.decode().split('\n') if text else block.split(b'\n')
+        if not lines[-1]:
+            # The block ended with a line break.
+            lines.pop()
+        for line_no, line in enumerate(lines, start=line_no + 1):
+            line = line.strip()
+            if line or not skip_blank:
+                yield line_no, line
+
+
+def iter_records(path, delimiter=b',', maxsplit=-1):
+    """Yield (line number, list of bytes fields) for every non-blank line of path."""
+    for line_no, line in iter_lines(path):
+        yield line_no, line.split(delimiter, maxsplit)
+
+
+def iter_table(path):
+    """Yield one dict per data row of a CSV file with a header line, like csv.DictReader.
+
+    Lines containing quotes are handed to the csv module so quoted fields still
+    parse correctly; all other lines are split on commas.
+    """
+    lines = iter_lines(path, text=True)
+    for _, header in lines:
+        fieldnames = header.split(',')
+        break
+    else:
+        return
+    for _, line in lines:
+        if '"' in line:
+            values = next(csv.reader([line]))
+        else:
+            values = line.split(',')
+        yield dict(zip(fieldnames, values))
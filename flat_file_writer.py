@@ -0,0 +1,54 @@
+"""
+Bulk, atomic writer for the CSV outputs (employee_data.csv, emp_end_yr.txt)
+
+Rows go through csv.writer.writerows into a large write buffer instead of a
+write call per employee. The file is written under a temporary name and only
+renamed over the target once it is complete, so a crash part way through
+never leaves a truncated file for the next stage. With compression set to
+'gzip' or 'zstd' the output is compressed and gets a .gz or .zst suffix;
+flat_file_reader.find_output and open_text read it back.
+"""
+
+import csv
+import gzip
+import os
+from contextlib import contextmanager
+
+from flat_file_reader import zstd_module
+
+BUFFER_SIZE = 1 << 20
+COMPRESSIONS = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+
+
+def output_path(path, compression=None):
+    """The name path is written under with the given compression."""
+    return path + COMPRESSIONS[compression]
+
+
+@contextmanager
+def atomic_output(path, compression=None):
+    """Open a temporary file to write text to, renamed to path only if the block completes."""
+    temporary = f"{path}.tmp"
+    if compression == 'gzip':
+        file = gzip.open(temporary, 'wt', newline='', compresslevel=6)
+    elif compression == 'zstd':
+        file = zstd_module().open(temporary, 'wt', newline='')
+    else:
+        file = open(temporary, 'w', newline='', buffering=BUFFER_SIZE)
+    try:
+        with file:
+            yield file
+    except BaseException:
+        os.remove(temporary)
+        raise
+    os.replace(temporary, path)
+
+
+def write_csv(path, header, rows, compression=None, lineterminator='\r\n'):
+    """Write header and rows (an iterable of tuples) to path atomically and return the name written."""
+    target = output_path(path, compression)
+    with atomic_output(target, compression) as file:
+        writer = csv.writer(file, lineterminator=lineterminator)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return target
@@ -0,0 +1,82 @@
+"""
+Change detection and persisted state for incremental runs
+
+Each input file is fingerprinted by size, SHA-256 digest and line count. On
+the next run a file is 'unchanged', 'appended' (the old content is an exact
+prefix of the new one, so only the bytes after the old size need processing)
+or 'changed' (anything else, which means reprocessing the whole file).
+"""
+
+import hashlib
+import os
+import pickle
+
+STATE_VERSION = 2
+DATA_STATE_FILE = 'processing_state.pkl'
+METRICS_STATE_FILE = 'metrics_state.pkl'
+BLOCK_SIZE = 1 << 20
+
+
+def scan_input(path, previous=None):
+    """Fingerprint path and compare it with a previous fingerprint.
+
+    Returns (fingerprint, status, start offset, lines before start); the fingerprint
+    is None if the file does not exist.
+    """
+    prefix_size = previous['size'] if previous else -1
+    digest = hashlib.sha256()
+    prefix_digest = None
+    size = lines = 0
+    last = b''
+    try:
+        with open(path, 'rb') as file:
+            while True:
+                if size == prefix_size:
+                    prefix_digest = digest.hexdigest()
+                # Stop a block short at the old size, so the old content's digest can be read off on the way.
+                limit = prefix_size - size if 0 < prefix_size - size < BLOCK_SIZE else BLOCK_SIZE
+                block = file.read(limit)
+                if not block:
+                    break
+                digest.update(block)
+                size += len(block)
+                lines += block.count(b'\n')
+                last = block[-1:]
+    except FileNotFoundError:
+        return None, 'changed', 0, 0
+
+    fingerprint = {'size': size, 'digest': digest.hexdigest(), 'lines': lines,
+                   'ends_with_newline': size == 0 or last == b'\n'}
+    if previous is None:
+        return fingerprint, 'changed', 0, 0
+    if size == previous['size'] and fingerprint['digest'] == previous['digest']:
+        return fingerprint, 'unchanged', size, lines
+    # Appending to a file whose last line had no newline would extend that line, so it counts as a change.
+    if size > previous['size'] and prefix_digest == previous['digest'] and previous['ends_with_newline']:
+        return fingerprint, 'appended', previous['size'], previous['lines']
+    return fingerprint, 'changed', 0, 0
+
+
+def load_state(path):
+    """Return the state saved at path, or None if there is none or it was written by another version."""
+    try:
+        with open(path, 'rb') as file:
+            state = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Ignoring unreadable state file {path}: {str(e)}")
+        return None
+    if not isinstance(state, dict) or state.get('version') != STATE_VERSION:
+        print(f"Ignoring state file {path} from another version.")
+        return None
+    return state
+
+
+def save_state(path, state):
+    """Write state to path atomically, so an interrupted run never leaves half a state file."""
+    state = dict(state, version=STATE_VERSION)
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as file:
+        pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, path)
@@ -0,0 +1,134 @@
+"""
+Per-step timing, throughput and memory instrumentation
+
+Instrumentation.run wraps one processing step and records its wall time, the
+rows it processed, rows per second and the process's peak resident memory
+after it. Recording costs a couple of clock reads per step, so it is always
+on. With profiling started the whole run is also traced by cProfile and
+tracemalloc, each step additionally records its own traced peak, and report()
+includes the most expensive functions and allocation sites, for dumping as
+JSON.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+TOP_ENTRIES = 25
+
+
+def max_rss():
+    """Peak resident set size of this process in bytes, or None where it is not available."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class StepMetrics:
+    __slots__ = ('name', 'seconds', 'rows', 'max_rss', 'traced_peak')
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.rows = None
+        self.max_rss = None
+        self.traced_peak = None
+
+    @property
+    def rows_per_second(self):
+        if not self.rows or not self.seconds:
+            return None
+        return self.rows / self.seconds
+
+    def as_dict(self):
+        return {'name': self.name, 'seconds': self.seconds, 'rows': self.rows,
+                'rows_per_second': self.rows_per_second, 'max_rss_bytes': self.max_rss,
+                'traced_peak_bytes': self.traced_peak}
+
+
+class Instrumentation:
+    def __init__(self, stage):
+        self.stage = stage
+        self.steps = []
+        self.profiler = None
+        # Set by stop_profile; report() leaves out the allocations until then.
+        self.snapshot = None
+        self.traced_peak = None
+
+    def run(self, name, function, *args, rows=None, **kwargs):
+        """Call function as the step called name; rows() is asked for the rows it processed afterwards."""
+        step = StepMetrics(name)
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            step.seconds = time.perf_counter() - start
+            if tracing:
+                step.traced_peak = tracemalloc.get_traced_memory()[1]
+            step.max_rss = max_rss()
+            step.rows = rows() if rows is not None else None
+            self.steps.append(step)
+
+    def start_profile(self):
+        """Trace everything until stop_profile with cProfile and tracemalloc."""
+        tracemalloc.start()
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+
+    def stop_profile(self):
+        if self.profiler is None:
+            return
+        self.profiler.disable()
+        self.snapshot = tracemalloc.take_snapshot()
+        self.traced_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    def report(self):
+        """Return the recorded steps (and the profile, if one was taken) as plain data."""
+        report = {
+            'stage': self.stage,
+            'total_seconds': sum(step.seconds for step in self.steps),
+            'max_rss_bytes': max_rss(),
+            'steps': [step.as_dict() for step in self.steps],
+        }
+        if self.profiler is not None:
+            stats = pstats.Stats(self.profiler, stream=io.StringIO())
+            functions = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_ENTRIES]
+            report['profile'] = [
+                {'function': f"{path}:{line}({name})", 'calls': calls, 'total_seconds': total,
+                 'cumulative_seconds': cumulative}
+                for (path, line, name), (_, calls, total, cumulative, _) in functions
+            ]
+        if self.snapshot is not None:
+            report['traced_peak_bytes'] = self.traced_peak
+            report['allocations'] = [
+                {'location': str(statistic.traceback), 'bytes': statistic.size, 'blocks': statistic.count}
+                for statistic in self.snapshot.statistics('lineno')[:TOP_ENTRIES]
+            ]
+        return report
+
+    def write_report(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.report(), file, indent=2)
+
+    def print_summary(self):
+        print(f"\n{self.stage} step timings:")
+        print(f"{'step':<30} {'seconds':>9} {'rows':>11} {'rows/s':>12} {'peak RSS MiB':>13}")
+        for step in self.steps:
+            rows = '' if step.rows is None else step.rows
+            rate = '' if step.rows_per_second is None else f"{step.rows_per_second:,.0f}"
+            rss = '' if step.max_rss is None else f"{step.max_rss / 2 ** 20:.1f}"
+            print(f"{step.name:<30} {step.seconds:>9.3f} {rows:>11} {rate:>12} {rss:>13}")
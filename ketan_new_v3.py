@@ -1,12 +1,104 @@
+import argparse
 import csv
-from statistics import mean, median, stdev
+import itertools
+import os
+import sqlite3
+import threading
+
+from bonus_engine import CONSULTANT_CAP, DIRECTOR_CAP, capped_payout, sweep_bases
+from employee_db import FINAL_DATA, EmployeeDatabase
+from employee_index import EmployeeIndex
+from employee_table import EmployeeTable
+from error_sink import CATEGORIES, ERROR_LOG_FILE, read_error_page
+from flat_file_reader import find_output, open_text
+from percentiles import PercentileService
+from rankings import RANKED_COLUMNS, RankingService
+from running_stats import TableStatistics
+from table_snapshot import SNAPSHOT_FILE, read_snapshot
+
+SWEEP_FIELDS = ["Rate", "ConsultantPayout", "DirectorPayout", "TotalPayout", "EligibleConsultants",
+                "EligibleDirectors", "CappedConsultants", "CappedDirectors"]
+ERROR_PAGE_SIZE = 20
+LOAD_BATCH = 10000
+PAYOUT_CHUNK = 1 << 16
+
+
+class SimulationCancelled(Exception):
+    """Raised inside a simulation once the user has asked to cancel it."""
+
+
+def parse_rates(spec):
+    """Parse a rate list such as '5,10,12.5' or '1:20:0.5' (start:stop:step, stop included)."""
+    rates = []
+    for part in spec.split(","):
+        part = part.strip()
+        if ":" in part:
+            start, stop, step = (float(value) for value in part.split(":"))
+            if step <= 0:
+                raise ValueError(f"step must be positive in '{part}'")
+            count = int(round((stop - start) / step)) + 1
+            rates.extend(round(start + i * step, 10) for i in range(max(count, 0)))
+        elif part:
+            rates.append(float(part))
+    return rates
 
 
 class UserInteraction:
+    """Queries over emp_end_yr data; the data is loaded on first use unless load_data or start_loading ran first."""
+
     def __init__(self):
-        self.final_employee_data = []
+        self.employees = None
+        self._percentiles = None
+        self._search_index = None
+        self._statistics = None
+        self._rankings = None
         self.error_log = []
         self.bonus_rate = 0
+        self.sweep_cache = None
+        # Held by the background loader while it adds a batch and by every query while it runs.
+        self.data_lock = threading.RLock()
+        self.loader = None
+        self.load_progress = (0, 0)
+        self.load_message = None
+        self.cancel = threading.Event()
+
+    def use_employees(self, table):
+        """Analyze the given EmployeeTable; its search index and statistics are built when first needed."""
+        self.employees = table
+        self._percentiles = None
+        self._search_index = None
+        self._statistics = None
+        self._rankings = None
+
+    @property
+    def final_employee_data(self):
+        if self.employees is None:
+            self.load_data()
+        return self.employees
+
+    @property
+    def percentiles(self):
+        if self._percentiles is None:
+            self._percentiles = PercentileService(self.final_employee_data)
+        return self._percentiles
+
+    @property
+    def search_index(self):
+        if self._search_index is None:
+            self._search_index = EmployeeIndex(self.final_employee_data)
+        return self._search_index
+
+    @property
+    def statistics(self):
+        if self._statistics is None:
+            self._statistics = TableStatistics(self.final_employee_data)
+        return self._statistics
+
+    @property
+    def rankings(self):
+        if self._rankings is None:
+            self._rankings = RankingService(self.final_employee_data)
+        return self._rankings
 
     # def load_data(self):
     #     try:
@@ -25,24 +117,12 @@ class UserInteraction:
     #     except Exception as e:
     #         print("Unexpected error: {}".format(e))
     def load_data(self):
-        """Load employee data from the emp_end_yr.txt."""
+        """Load employee data from its binary snapshot, or from emp_end_yr.txt if that is missing or stale."""
         try:
-            with open("emp_end_yr.txt", "r") as f:
-                reader = csv.DictReader(f)
-                self.final_employee_data = []
-                for row in reader:
-                    emp = {
-                        "ID": row["ID"],
-                        "FirstName": row["FirstName"],
-                        "LastName": row["LastName"],
-                        "JobCode": row["JobCode"],
-                        "BasePay": self.safe_float(row["BasePay"]),
-                        "Utilization": self.safe_float(row["Utilization"]),
-                        "Evaluation": self.safe_float(row["Evaluation"]),
-                        "Sales": self.safe_float(row["Sales"]),
-                        "Bonus": self.safe_float(row["Bonus"]),
-                    }
-                    self.final_employee_data.append(emp)
+            table = read_snapshot(SNAPSHOT_FILE, find_output("emp_end_yr.txt"))
+            if table is None:
+                table = self.read_csv()
+            self.use_employees(table)
             with open("error.txt", "r") as f:
                 self.error_log = f.readlines()
 
@@ -51,6 +131,97 @@ class UserInteraction:
             print(f"Error loading data files: {e}")
         except Exception as e:
             print(f"Unexpected error: {e}")
+        if self.employees is None:
+            self.use_employees(EmployeeTable())
+
+    def read_csv(self):
+        """Read employee data from the emp_end_yr.txt (or its compressed copy) into a new EmployeeTable."""
+        with open_text(find_output("emp_end_yr.txt")) as f:
+            reader = csv.DictReader(f)
+            table = EmployeeTable()
+            while True:
+                batch = list(itertools.islice(reader, LOAD_BATCH))
+                if not batch:
+                    break
+                self.add_csv_rows(table, batch)
+        return table
+
+    def add_csv_rows(self, table, rows):
+        """Append a batch of emp_end_yr.txt rows to table, a column at a time."""
+        safe_float = self.safe_float
+        table.extend(
+            [int(row["ID"]) for row in rows], [row["LastName"] for row in rows],
+            [row["FirstName"] for row in rows], [row["JobCode"] for row in rows],
+            base_pay=[safe_float(row["BasePay"]) for row in rows],
+            utilization=[safe_float(row["Utilization"]) for row in rows],
+            evaluation_score=[safe_float(row["Evaluation"]) for row in rows],
+            sales=[safe_float(row["Sales"]) for row in rows],
+            bonus=[safe_float(row["Bonus"]) for row in rows],
+        )
+
+    def start_loading(self):
+        """Load the data in a background thread, so the menu can be used while it loads.
+
+        Until loading finishes, queries see the employees loaded so far; load_progress
+        holds (bytes read, total bytes) and load_message the outcome once it is known.
+        error_log is None until error.txt has been read, which happens before the employees.
+        """
+        self.load_message = None
+        self.error_log = None
+        self.use_employees(EmployeeTable())
+        self.loader = threading.Thread(target=self.load_in_background, daemon=True)
+        self.loader.start()
+
+    def is_loading(self):
+        return self.loader is not None and self.loader.is_alive()
+
+    def load_in_background(self):
+        # error.txt is small and option 4 needs nothing else, so it is read first and on its own.
+        error_log_message = None
+        try:
+            with open("error.txt", "r") as f:
+                self.error_log = f.readlines()
+        except Exception as e:
+            self.error_log = []
+            error_log_message = f"Error loading data files: {e}"
+        try:
+            table = read_snapshot(SNAPSHOT_FILE, find_output("emp_end_yr.txt"))
+            if table is not None:
+                with self.data_lock:
+                    self.use_employees(table)
+            else:
+                self.read_csv_in_batches()
+            with self.data_lock:
+                # Build what the first queries would otherwise build, while the user is still reading the menu.
+                self.search_index.refresh()
+                self.statistics.get("utilization")
+            load_message = "Data loaded successfully!"
+        except FileNotFoundError as e:
+            load_message = f"Error loading data files: {e}"
+        except Exception as e:
+            load_message = f"Unexpected error: {e}"
+        if error_log_message is not None:
+            load_message = f"{load_message}\n{error_log_message}"
+        self.load_message = load_message
+
+    def read_csv_in_batches(self):
+        """Read emp_end_yr.txt into a table the queries already use, LOAD_BATCH rows at a time."""
+        table = EmployeeTable()
+        with self.data_lock:
+            self.use_employees(table)
+        path = find_output("emp_end_yr.txt")
+        size = os.path.getsize(path)
+        self.load_progress = (0, size)
+        # Progress is taken from the position in the file itself, so it holds for compressed files too.
+        with open(path, "rb") as raw, open_text(path, raw) as f:
+            reader = csv.DictReader(f)
+            while True:
+                batch = list(itertools.islice(reader, LOAD_BATCH))
+                if not batch:
+                    break
+                with self.data_lock:
+                    self.add_csv_rows(table, batch)
+                self.load_progress = (raw.tell(), size)
 
     # def simulate_bonus(self, rate):
     #     """Simulate total bonus payout for a given percentage rate"""
@@ -97,36 +268,103 @@ class UserInteraction:
     def simulate_bonus(self, rate):
         """Simulate total bonus payout for a given percentage."""
         try:
-            rate = float(rate) / 100
-            total_payout = 0
-            for emp in self.final_employee_data:
-                if emp["JobCode"] == "C":
-                    if emp["Evaluation"] >= 3.5:
-                        bonus = min(emp["BasePay"] * rate, 50000)
-                        total_payout += bonus
-                elif emp["JobCode"] == "D":
-                    if emp["Sales"] > 0:
-                        bonus = min(emp["Sales"] * rate, 150000)
-                        total_payout += bonus
-
+            total_payout = self.bonus_payout(float(rate) / 100)
             print("\nTotal Bonus Payout: ${:,.2f}".format(total_payout))
             return total_payout
+        except SimulationCancelled:
+            raise
         except Exception as e:
             print(f"Error simulating bonus: {e}")
             return 0
 
+    def bonus_payout(self, rate):
+        """Total payout at a rate given as a fraction: capped base pay for consultants evaluated 3.5 or
+        better, capped sales for directors with sales. Each bonus is min(base * rate, cap) without
+        rounding and the exact total is rounded once, the same as simulate_bonus_sweep gives."""
+        consultant_bases, director_bases = self.bonus_sweep_bases()
+        consultants, _ = capped_payout(consultant_bases, rate, CONSULTANT_CAP)
+        directors, _ = capped_payout(director_bases, rate, DIRECTOR_CAP)
+        return float(consultants + directors)
+
+    def check_cancelled(self):
+        if self.cancel.is_set():
+            raise SimulationCancelled()
+
+    def interrupt(self):
+        """Ask a running simulation to stop at its next check."""
+        self.cancel.set()
+
+    def bonus_sweep_bases(self):
+        """Eligible consultant base pay and director sales, sorted once and cached until the data changes."""
+        table = self.final_employee_data
+        if self.sweep_cache is None or self.sweep_cache[0] != table.version:
+            consultant = table.job_code_id("C")
+            director = table.job_code_id("D")
+            consultants, directors = [], []
+            for start in range(0, len(table), PAYOUT_CHUNK):
+                self.check_cancelled()
+                end = start + PAYOUT_CHUNK
+                for code, base_pay, evaluation, sales in zip(table.job_codes[start:end], table.base_pay[start:end],
+                                                             table.evaluation_score[start:end], table.sales[start:end]):
+                    if code == consultant:
+                        if evaluation >= 3.5:
+                            consultants.append(base_pay)
+                    elif code == director:
+                        if sales > 0:
+                            directors.append(sales)
+            self.sweep_cache = (table.version, sweep_bases(consultants), sweep_bases(directors))
+        return self.sweep_cache[1], self.sweep_cache[2]
+
+    def simulate_bonus_sweep(self, rates):
+        """Simulate total bonus payouts for many percentage rates, with per job code breakdowns."""
+        try:
+            consultant_bases, director_bases = self.bonus_sweep_bases()
+            results = []
+            for rate in rates:
+                self.check_cancelled()
+                fraction = float(rate) / 100
+                consultant_payout, capped_consultants = capped_payout(consultant_bases, fraction, CONSULTANT_CAP)
+                director_payout, capped_directors = capped_payout(director_bases, fraction, DIRECTOR_CAP)
+                results.append({
+                    "Rate": float(rate),
+                    "ConsultantPayout": float(consultant_payout),
+                    "DirectorPayout": float(director_payout),
+                    "TotalPayout": float(consultant_payout + director_payout),
+                    "EligibleConsultants": len(consultant_bases),
+                    "EligibleDirectors": len(director_bases),
+                    "CappedConsultants": capped_consultants,
+                    "CappedDirectors": capped_directors,
+                })
+            return results
+        except SimulationCancelled:
+            raise
+        except Exception as e:
+            print(f"Error simulating bonus sweep: {e}")
+            return []
+
+    def print_bonus_sweep(self, results):
+        print("\nBonus Rate Sweep:")
+        print(f"{'Rate %':>8} {'Consultants':>16} {'Directors':>16} {'Total':>16}")
+        for result in results:
+            print(f"{result['Rate']:>8.2f} {result['ConsultantPayout']:>16,.2f} "
+                  f"{result['DirectorPayout']:>16,.2f} {result['TotalPayout']:>16,.2f}")
+
+    def export_bonus_sweep(self, results, path):
+        """Write bonus sweep results to a CSV file."""
+        try:
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=SWEEP_FIELDS)
+                writer.writeheader()
+                writer.writerows(results)
+            print(f"Bonus sweep written to {path}")
+        except Exception as e:
+            print(f"Error writing bonus sweep: {e}")
+
     def get_utilization_percentile(self, percentile):
         """Calculate the specified percentile of utilization rates"""
         try:
-            utilizations = []
-            for emp in self.final_employee_data:
-                utilization_value = float(emp["Utilization"])
-                utilizations.append(utilization_value)
-
-            utilizations = sorted(utilizations)  # Sort the list
-
-            index = int(len(utilizations) * percentile / 100)
-            return utilizations[index]
+            index = int(len(self.final_employee_data) * percentile / 100)
+            return self.percentiles.kth("utilization", index)
         except Exception as e:
             print("Error calculating utilization percentile: {}".format(e))
             return 0
@@ -137,69 +375,79 @@ class UserInteraction:
         except ValueError:
             return 0.0
 
+    def find_employees(self, emp_id=None, name=None, job_type=None):
+        """Return the records of the employees matching the ID, name or job type, in file order."""
+        rows = self.search_index.search(emp_id=emp_id, name=name, job_type=job_type)
+        return [self.final_employee_data.record(row) for row in rows]
+
     def search_employee(self, emp_id=None, name=None, job_type=None):
         """Search employee details by ID, Name, or Job Type."""
-        found = False
-        for emp in self.final_employee_data:
-            if (
-                    (emp_id and emp["ID"] == str(emp_id)) or
-                    (name and name.lower() in f"{emp['FirstName']} {emp['LastName']}".lower()) or
-                    (job_type and emp["JobCode"] == job_type.upper())
-            ):
-                found = True
-                job_title = "Consultant" if emp["JobCode"] == "C" else "Director"
-                print(f"\nID: {emp['ID']}")
-                print(f"{job_title}: {emp['FirstName']} {emp['LastName']}")
-                print(f"Utilization: {emp['Utilization']}%")
-                print(f"Sales: ${emp['Sales']}")
-                print(f"Base Pay: ${emp['BasePay']}")
-                print(f"Bonus: ${emp['Bonus']}")
-
-        if not found:
-            print("No matching employees found.")
+        employees = self.find_employees(emp_id=emp_id, name=name, job_type=job_type)
+        for emp in employees:
+            self.print_record(emp)
+
+        if not employees:
+            if self.is_loading():
+                print("No matching employees found among those loaded so far; the data is still loading.")
+            else:
+                print("No matching employees found.")
+
+    def print_employee(self, row):
+        """Print the details of the employee in the given table row."""
+        self.print_record(self.final_employee_data.record(row))
+
+    def print_record(self, emp):
+        """Print the details of one employee record."""
+        job_title = "Consultant" if emp["job_code"] == "C" else "Director"
+        print(f"\nID: {emp['id']}")
+        print(f"{job_title}: {emp['first_name']} {emp['last_name']}")
+        print(f"Utilization: {emp['utilization']}%")
+        print(f"Sales: ${emp['sales']}")
+        print(f"Base Pay: ${emp['base_pay']}")
+        print(f"Bonus: ${emp['bonus']}")
+
+    def metric_summary(self, column):
+        """Return count, mean, median, stdev, min and max of a column's positive values, or None if there are none."""
+        stats = self.statistics.get(column, positive_only=True)
+        if not stats.count:
+            return None
+        return {
+            "count": stats.count,
+            "mean": stats.mean,
+            "median": self.percentiles.median(column, positive_only=True),
+            "stdev": stats.stdev,
+            "minimum": stats.minimum,
+            "maximum": stats.maximum,
+        }
 
     def descriptive_analytics(self):
         print("\nDescriptive Analytics")
         try:
-            utilizations = []
-            bonuses = []
-            evaluations = []
-            sales = []
-
-            for emp in self.final_employee_data:
-                utilizations.append(self.safe_float(emp["Utilization"]))
-                bonuses.append(self.safe_float(emp["Bonus"]))
-                evaluations.append(self.safe_float(emp["Evaluation"]))
-                sales.append(self.safe_float(emp["Sales"]))
-
             metrics_data = [
-                ("Utilization", utilizations),
-                ("Evaluation", evaluations),
-                ("Sales", sales),
-                ("Bonus", bonuses)
+                ("Utilization", "utilization"),
+                ("Evaluation", "evaluation_score"),
+                ("Sales", "sales"),
+                ("Bonus", "bonus")
             ]
 
             for i in range(len(metrics_data)):
                 metric = metrics_data[i][0]
-                data = metrics_data[i][1]
+                column = metrics_data[i][1]
 
-                valid_data = []
-                for value in data:
-                    if value > 0:
-                        valid_data.append(value)
+                stats = self.metric_summary(column)
 
-                if not valid_data:
+                if stats is None:
                     print(f"\n{metric} Statistics: No valid data available.")
                     continue
 
                 print(f"\n{metric} Statistics:")
-                print(f"Count: {len(valid_data)}")
-                print(f"Mean: {mean(valid_data):.2f}")
-                print(f"Median: {median(valid_data):.2f}")
+                print(f"Count: {stats['count']}")
+                print(f"Mean: {stats['mean']:.2f}")
+                print(f"Median: {stats['median']:.2f}")
                 print(
-                    f"Std Dev: {stdev(valid_data):.2f}" if len(valid_data) > 1 else "Std Dev: N/A (insufficient data)")
-                print(f"Min: {min(valid_data):.2f}")
-                print(f"Max: {max(valid_data):.2f}")
+                    f"Std Dev: {stats['stdev']:.2f}" if stats['count'] > 1 else "Std Dev: N/A (insufficient data)")
+                print(f"Min: {stats['minimum']:.2f}")
+                print(f"Max: {stats['maximum']:.2f}")
         except Exception as e:
             print(f"Error generating analytics: {e}")
 
@@ -270,137 +518,414 @@ class UserInteraction:
     #             print("No employees meet the probation criteria.")
     #     except Exception as e:
     #         print(f"Error generating lists: {e}")
-    def recognition_and_probation(self):
-        """Generate recognition and probation lists based on given data format."""
-        print("\nRecognition and Probation Lists")
-        try:
-            consultants = []
-            directors = []
+    def recognition_lists(self):
+        """Return the top consultants by utilization, the top directors by sales and the probation list.
 
-            for emp in self.final_employee_data:
-                if emp["JobCode"] == "C":
-                    consultants.append(emp)
-                elif emp["JobCode"] == "D":
-                    directors.append(emp)
+        Each is a list of employee records; the top lists are None when there are no
+        consultants or no directors at all.
+        """
+        table = self.final_employee_data
 
-            # Top Performers: Consultants (Highest Utilization)
-            if consultants:
-                max_util = -float('inf')
+        # Top Performers: Consultants (Highest Utilization) and Directors (Highest Sales), ties included
+        top_consultants = [table.record(row) for row in self.rankings.top("utilization", "C", 1, with_ties=True)]
+        top_directors = [table.record(row) for row in self.rankings.top("sales", "D", 1, with_ties=True)]
 
-                for emp in consultants:
-                    if emp["Utilization"] > max_util:
-                        max_util = emp["Utilization"]
+        # Probation List (Low Utilization and Low Evaluation for Consultants)
+        utilization = self.statistics.get("utilization")
+
+        if utilization.count > 0:
+            mean_util = utilization.mean
+        else:
+            mean_util = 0
+
+        if utilization.count > 1:
+            std_dev_util = utilization.stdev
+        else:
+            std_dev_util = 0
+
+        probation_threshold = mean_util - std_dev_util
+
+        consultant = table.job_code_id("C")
+        probation_list = [
+            table.record(row) for row, code in enumerate(table.job_codes)
+            if code == consultant and table.utilization[row] < probation_threshold
+            and table.evaluation_score[row] < 1
+        ]
+        return top_consultants or None, top_directors or None, probation_list
+
+    def leaderboards(self, k, job_code=None):
+        """Return the top and bottom k employees per job code for every ranked column.
+
+        The result maps job code -> column -> {'top': records, 'bottom': records}, best
+        and worst first; equal values keep file order.
+        """
+        table = self.final_employee_data
+        labels = [job_code] if job_code is not None else table.job_code_labels
+        boards = {}
+        for label in labels:
+            boards[label] = {
+                column: {
+                    "top": [table.record(row) for row in self.rankings.top(column, label, k)],
+                    "bottom": [table.record(row) for row in self.rankings.bottom(column, label, k)],
+                }
+                for column in RANKED_COLUMNS
+            }
+        return boards
+
+    def print_leaderboards(self, boards):
+        """Print leaderboards as returned by leaderboards(), skipping columns that are zero for a whole job code."""
+        for job_code, columns in boards.items():
+            job_title = "Consultants" if job_code == "C" else "Directors" if job_code == "D" else f"Job code {job_code}"
+            for column, board in columns.items():
+                if not board["top"] or not board["top"][0][column]:
+                    continue
+                for end, heading in (("top", "Top"), ("bottom", "Bottom")):
+                    print(f"\n{heading} {len(board[end])} {job_title} by {column.replace('_', ' ').title()}:")
+                    for place, emp in enumerate(board[end], start=1):
+                        print(f"{place:>3}. ID: {emp['id']}, Name: {emp['first_name']} {emp['last_name']}, "
+                              f"{column.replace('_', ' ').title()}: {emp[column]}")
 
-                top_consultants = []
-                for emp in consultants:
-                    if emp["Utilization"] == max_util:
-                        top_consultants.append(emp)
+    def recognition_and_probation(self):
+        """Print the recognition and probation lists and return them as recognition_lists() does (None on error)."""
+        print("\nRecognition and Probation Lists")
+        try:
+            top_consultants, top_directors, probation_list = self.recognition_lists()
 
+            if top_consultants is not None:
                 print("\nTop Performers (Highest Utilization):")
                 for emp in top_consultants:
                     print(
-                        f"ID: {emp['ID']}, Name: {emp['FirstName']} {emp['LastName']}, Utilization: {emp['Utilization']}%")
-
-            # Top Performers: Directors (Highest Sales)
-            if directors:
-                max_sales = max(emp["Sales"] for emp in directors)
-                top_directors = []
-                for emp in directors:
-                    if emp["Sales"] == max_sales:
-                        top_directors.append(emp)
+                        f"ID: {emp['id']}, Name: {emp['first_name']} {emp['last_name']}, Utilization: {emp['utilization']}%")
+
+            if top_directors is not None:
                 print("\nTop Performer (Highest Sales):")
                 for emp in top_directors:
-                    print(f"ID: {emp['ID']}, Name: {emp['FirstName']} {emp['LastName']}, Sales: ${emp['Sales']}")
+                    print(f"ID: {emp['id']}, Name: {emp['first_name']} {emp['last_name']}, Sales: ${emp['sales']}")
 
-            # Probation List (Low Utilization and Low Evaluation for Consultants)
-            total_util = 0
-            count = 0
+            print("\nEmployees on Probation (Low Utilization and Evaluation):")
+            if probation_list:
+                for emp in probation_list:
+                    print(
+                        f"ID: {emp['id']}, Name: {emp['first_name']} {emp['last_name']}, Utilization: {emp['utilization']}%, Evaluation: {emp['evaluation_score']}")
+            else:
+                print("No employees meet the probation criteria.")
+            return top_consultants, top_directors, probation_list
+        except Exception as e:
+            print(f"Error generating recognition/probation lists: {e}")
 
-            for emp in self.final_employee_data:
-                total_util += emp["Utilization"]
-                count += 1
+    def load_error_log(self):
+        """Load error.txt on its own, for runs that hand over the employees in memory."""
+        try:
+            with open("error.txt", "r") as f:
+                self.error_log = f.readlines()
+        except FileNotFoundError as e:
+            print(f"Error loading data files: {e}")
 
-            if count > 0:
-                mean_util = total_util / count
+    def view_error_log(self, category=None, emp_id=None, page=None, page_size=ERROR_PAGE_SIZE):
+        """Print the error.txt summary, or with a category, employee ID or page, one page of error_log.jsonl.
+
+        The detailed log is read record by record up to the requested page, never loaded whole.
+        Returns whether more matching records follow the page printed.
+        """
+        if category is None and emp_id is None and page is None:
+            print("\nError Log:")
+            if self.error_log is None:
+                print("The error log is still loading.")
+            elif self.error_log:
+                for line in self.error_log:
+                    print(line.strip())
             else:
-                mean_util = 0
+                print("No errors logged.")
+            return False
 
-            if len(self.final_employee_data) > 1:
-                utilization_values = [emp["Utilization"] for emp in self.final_employee_data]
-                std_dev_util = stdev(utilization_values)
-            else:
-                std_dev_util = 0
+        page = page or 0
+        try:
+            records, more = read_error_page(page, page_size, ERROR_LOG_FILE, category, emp_id)
+        except FileNotFoundError:
+            print(f"No detailed error log ({ERROR_LOG_FILE}) found.")
+            return False
+        print(f"\nError Records, page {page + 1}:")
+        for record in records:
+            print(", ".join(f"{key}: {value}" for key, value in record.items()))
+        if not records:
+            print("No matching error records.")
+        return more
+
+
+class DatabaseUserInteraction(UserInteraction):
+    """UserInteraction answering its queries with SQL over an EmployeeDatabase instead of in-memory indexes."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._database = None
+        # Nothing is held in memory; the in-memory queries this class does not override see no employees.
+        self.use_employees(EmployeeTable())
+
+    @property
+    def database(self):
+        if self._database is None:
+            self.load_data()
+        return self._database
 
-            probation_threshold = mean_util - std_dev_util
+    def load_data(self):
+        """Use the emp_end_yr table, importing emp_end_yr.txt into it first if the database has none."""
+        try:
+            if self._database is None:
+                self._database = EmployeeDatabase(self.path)
+            if not self._database.row_count(FINAL_DATA):
+                table = self.read_csv()
+                self._database.write_final_data(table, table.bonus)
+            self.sweep_cache = None
+            with open("error.txt", "r") as f:
+                self.error_log = f.readlines()
 
-            probation_list = []
+            print("Data loaded successfully!")
+        except FileNotFoundError as e:
+            print(f"Error loading data files: {e}")
+        except Exception as e:
+            print(f"Unexpected error: {e}")
 
-            for emp in consultants:
-                if emp["Utilization"] < probation_threshold and emp["Evaluation"] < 1:
-                    probation_list.append(emp)
+    def start_loading(self):
+        """Nothing is loaded into memory, so the database is just checked (and imported into) up front."""
+        self.load_data()
+
+    def find_employees(self, emp_id=None, name=None, job_type=None):
+        return self.database.find(emp_id=emp_id, name=name, job_type=job_type)
+
+    def metric_summary(self, column):
+        positive = f"{column} > 0"
+        count, mean, stdev, minimum, maximum = self.database.summary(column, positive)
+        if not count:
+            return None
+        return {
+            "count": count,
+            "mean": mean,
+            "median": self.database.median(column, positive),
+            "stdev": stdev,
+            "minimum": minimum,
+            "maximum": maximum,
+        }
+
+    def recognition_lists(self):
+        top_consultants = self.database.top("utilization", "C")
+        top_directors = self.database.top("sales", "D")
+        count, mean_util, std_dev_util = self.database.summary("utilization")[:3]
+        probation_threshold = (mean_util if count > 0 else 0) - (std_dev_util if count > 1 else 0)
+        return top_consultants, top_directors, self.database.probation(probation_threshold)
+
+    def leaderboards(self, k, job_code=None):
+        labels = [job_code] if job_code is not None else self.database.job_codes()
+        return {
+            label: {
+                column: {"top": self.database.ranked(column, label, k),
+                         "bottom": self.database.ranked(column, label, k, descending=False)}
+                for column in RANKED_COLUMNS
+            }
+            for label in labels
+        }
+
+    def interrupt(self):
+        """Also abort the SQL query in progress."""
+        super().interrupt()
+        if self._database is not None:
+            self._database.connection.interrupt()
+
+    def bonus_sweep_bases(self):
+        """Eligible consultant base pay and director sales, sorted once per loaded database."""
+        if self.sweep_cache is None:
+            try:
+                consultant_bases = sweep_bases(self.database.values("base_pay", "C", "evaluation_score >= 3.5"))
+                self.check_cancelled()
+                director_bases = sweep_bases(self.database.values("sales", "D", "sales > 0"))
+            except sqlite3.OperationalError:
+                self.check_cancelled()
+                raise
+            self.sweep_cache = (None, consultant_bases, director_bases)
+        return self.sweep_cache[1], self.sweep_cache[2]
 
-            print("\nEmployees on Probation (Low Utilization and Evaluation):")
-            if probation_list:
-                for emp in probation_list:
-                    print(
-                        f"ID: {emp['ID']}, Name: {emp['FirstName']} {emp['LastName']}, Utilization: {emp['Utilization']}%, Evaluation: {emp['Evaluation']}")
-            else:
-                print("No employees meet the probation criteria.")
+    def get_utilization_percentile(self, percentile):
+        try:
+            index = int(self.database.row_count(FINAL_DATA) * percentile / 100)
+            return self.database.kth("utilization", index)
         except Exception as e:
-            print(f"Error generating recognition/probation lists: {e}")
+            print("Error calculating utilization percentile: {}".format(e))
+            return 0
 
-    def view_error_log(self):
-        print("\nError Log:")
-        if self.error_log:
-            for line in self.error_log:
-                print(line.strip())
-        else:
-            print("No errors logged.")
-
-ui = UserInteraction()
-ui.load_data()
-
-while True:
-    print("\nUser Interaction Menu:")
-    print("1. Search for Employee")
-    print("2. View Descriptive Analytics")
-    print("3. Generate Recognition/Probation Lists")
-    print("4. View Error Log")
-    print("5. Simulate Bonus Rate")
-    print("6. Exit")
-
-    choice = input("Enter your choice: ")
-
-    if choice == "1":
-        search_by = input("Search by ID, Name, or Job Type (Enter 'ID', 'Name', or 'Job'): ").lower()
-        if search_by == "id":
-            emp_id = input("Enter Employee ID: ")
-            ui.search_employee(emp_id=emp_id)
-        elif search_by == "name":
-            name = input("Enter Employee Name: ")
-            ui.search_employee(name=name)
-        elif search_by == "job":
-            job_type = input("Enter Job Type ('C' for Consultant, 'D' for Director): ")
-            ui.search_employee(job_type=job_type)
+
+def browse_error_records(ui):
+    """Page through error_log.jsonl, optionally filtered by category or employee ID."""
+    choice = input(f"Browse detailed error records? Enter a category ({', '.join(CATEGORIES)}), "
+                   f"an employee ID or 'all' (Enter to skip): ").strip()
+    if not choice:
+        return
+    category = emp_id = None
+    if choice.isdigit():
+        emp_id = int(choice)
+    elif choice.lower() != "all":
+        category = choice.lower()
+    page = 0
+    while ui.view_error_log(category=category, emp_id=emp_id, page=page):
+        if input("Press Enter for the next page, or 'q' to stop: ").strip().lower() == "q":
+            break
+        page += 1
+
+
+def show_leaderboards(ui):
+    """Offer top/bottom-N leaderboards per job code after the recognition lists."""
+    count = input("Show top/bottom-N leaderboards per job code? Enter N (Enter to skip): ").strip()
+    if not count:
+        return
+    if not count.isdigit() or int(count) < 1:
+        print("Please enter a positive whole number.")
+        return
+    boards = run_query(ui, ui.leaderboards, int(count))
+    if boards is not None:
+        ui.print_leaderboards(boards)
+
+
+def report_loading(ui):
+    """Print the background load's progress while it runs, and its outcome once when it is done."""
+    if ui.loader is None:
+        return
+    if ui.is_loading():
+        read, size = ui.load_progress
+        progress = f"{read * 100 // size}%" if size else "starting"
+        print(f"\n[Loading employee data in the background: {progress}, "
+              f"{len(ui.final_employee_data)} employees so far]")
+    elif ui.load_message is not None:
+        print(f"\n{ui.load_message}")
+        ui.load_message = None
+
+
+def run_query(ui, function, *args, **kwargs):
+    """Run a query under the data lock, noting when it only sees part of the data.
+
+    Returns None without running the query while no employees have been loaded yet, e.g.
+    before a snapshot is swapped in, so it does not answer as if there were none.
+    """
+    if ui.is_loading():
+        loaded = len(ui.final_employee_data)
+        if not loaded:
+            print("Still loading the employee data; please try again in a moment.")
+            return None
+        print(f"(Still loading: results cover the {loaded} employees loaded so far.)")
+    with ui.data_lock:
+        return function(*args, **kwargs)
+
+
+def run_cancellable(ui, function, *args):
+    """Run a simulation in a worker thread, so Ctrl+C cancels it instead of ending the program.
+
+    Returns the simulation's result, or None if it was cancelled.
+    """
+    result = []
+
+    def work():
+        try:
+            result.append(run_query(ui, function, *args))
+        except SimulationCancelled:
+            pass
+
+    ui.cancel.clear()
+    worker = threading.Thread(target=work, daemon=True)
+    worker.start()
+    while worker.is_alive():
+        try:
+            worker.join(0.1)
+        except KeyboardInterrupt:
+            print("\nCancelling simulation...")
+            ui.interrupt()
+    if not result:
+        print("Simulation cancelled.")
+        return None
+    return result[0]
+
+
+def run_menu(ui):
+    """Run the interactive menu until the user exits."""
+    while True:
+        report_loading(ui)
+        print("\nUser Interaction Menu:")
+        print("1. Search for Employee")
+        print("2. View Descriptive Analytics")
+        print("3. Generate Recognition/Probation Lists")
+        print("4. View Error Log")
+        print("5. Simulate Bonus Rate")
+        print("6. Exit")
+
+        choice = input("Enter your choice: ")
+
+        if choice == "1":
+            search_by = input("Search by ID, Name, or Job Type (Enter 'ID', 'Name', or 'Job'): ").lower()
+            if search_by == "id":
+                emp_id = input("Enter Employee ID: ")
+                run_query(ui, ui.search_employee, emp_id=emp_id)
+            elif search_by == "name":
+                name = input("Enter Employee Name: ")
+                run_query(ui, ui.search_employee, name=name)
+            elif search_by == "job":
+                job_type = input("Enter Job Type ('C' for Consultant, 'D' for Director): ")
+                run_query(ui, ui.search_employee, job_type=job_type)
+            else:
+                print("Invalid search option.")
+        elif choice == "2":
+            run_query(ui, ui.descriptive_analytics)
+        elif choice == "3":
+            run_query(ui, ui.recognition_and_probation)
+            show_leaderboards(ui)
+        elif choice == "4":
+            ui.view_error_log()
+            if os.path.exists(ERROR_LOG_FILE):
+                browse_error_records(ui)
+        elif choice == "5":
+            while True:
+                rate = input("Enter bonus percentage rate (or 'done' to finish): ")
+                if rate.lower() == 'done':
+                    break
+                try:
+                    if "," in rate or ":" in rate:
+                        results = run_cancellable(ui, ui.simulate_bonus_sweep, parse_rates(rate))
+                        if results is not None:
+                            ui.print_bonus_sweep(results)
+                    else:
+                        run_cancellable(ui, ui.simulate_bonus, float(rate))
+                except ValueError:
+                    print("Please enter a valid numeric percentage")
+        elif choice == "6":
+            print("Exiting program. Adios!")
+            break
         else:
-            print("Invalid search option.")
-    elif choice == "2":
-        ui.descriptive_analytics()
-    elif choice == "3":
-        ui.recognition_and_probation()
-    elif choice == "4":
-        ui.view_error_log()
-    elif choice == "5":
-        while True:
-            rate = input("Enter bonus percentage rate (or 'done' to finish): ")
-            if rate.lower() == 'done':
-                break
-            try:
-                ui.simulate_bonus(float(rate))
-            except ValueError:
-                print("Please enter a valid numeric percentage")
-    elif choice == "6":
-        print("Exiting program. Adios!")
-        break
+            print("Invalid choice. Please try again.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Interactive employee analytics over emp_end_yr.txt")
+    parser.add_argument("--sweep", metavar="RATES",
+                        help="simulate bonus payouts for rates such as '5,10,15' or '1:20:0.5' and exit")
+    parser.add_argument("--sweep-csv", metavar="PATH", help="also write the sweep results to this CSV file")
+    parser.add_argument("--db", metavar="PATH",
+                        help="query the emp_end_yr table of this SQLite database (importing emp_end_yr.txt "
+                             "into it if it has none) instead of loading the employees into memory")
+    parser.add_argument("--wait", action="store_true",
+                        help="load all the data before showing the menu instead of loading it in the background")
+    args = parser.parse_args(argv)
+
+    ui = DatabaseUserInteraction(args.db) if args.db else UserInteraction()
+    if args.sweep or args.wait:
+        ui.load_data()
     else:
-        print("Invalid choice. Please try again.")
+        ui.start_loading()
+
+    if args.sweep:
+        results = ui.simulate_bonus_sweep(parse_rates(args.sweep))
+        ui.print_bonus_sweep(results)
+        if args.sweep_csv:
+            ui.export_bonus_sweep(results, args.sweep_csv)
+        return
+
+    run_menu(ui)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compiled keyword matcher for evaluation comments
+
+All keywords of a keyword -> score map are combined into one regular
+expression, so finding every keyword in a comment is a single pass over the
+text instead of one substring search per keyword.
+"""
+
+import re
+
+
+class KeywordMatcher:
+    def __init__(self, mapping, negative_below=4):
+        self.mapping = dict(mapping)
+        self.negative_below = negative_below
+        self.rank = {keyword: rank for rank, keyword in enumerate(self.mapping)}
+        self.negatives = {keyword for keyword, score in self.mapping.items() if score < negative_below}
+        # Longest first, so a keyword that starts where a shorter one does wins the alternation.
+        keywords = sorted(self.mapping, key=len, reverse=True)
+        self.pattern = re.compile('|'.join(map(re.escape, keywords))) if keywords else None
+        # A match hides keywords that lie inside it, or that start inside it and run past its end.
+        self.contained = {}
+        self.overlapping = {}
+        for keyword in self.mapping:
+            self.contained[keyword] = [other for other in self.mapping if other != keyword and other in keyword]
+            self.overlapping[keyword] = [
+                other for other in self.mapping
+                if other != keyword and other not in keyword and _overlaps(keyword, other)
+            ]
+        self.independent = not any(self.contained.values()) and not any(self.overlapping.values())
+
+    def find(self, text):
+        """Return the set of keywords that occur anywhere in text."""
+        if self.pattern is None:
+            return set()
+        found = set(self.pattern.findall(text))
+        if self.independent:
+            return found
+        for keyword in list(found):
+            found.update(self.contained[keyword])
+        for keyword in list(found):
+            for other in self.overlapping[keyword]:
+                if other not in found and other in text:
+                    found.add(other)
+        return found
+
+    def counts(self, comment):
+        """Return (keywords found, negative keywords found) for a comment, ignoring case."""
+        found = self.find(comment.lower())
+        return len(found), len(found & self.negatives)
+
+    def first_score(self, text, default):
+        """Return the score of the earliest keyword in map order that occurs in text, else default."""
+        found = self.find(text)
+        if not found:
+            return default
+        return self.mapping[min(found, key=self.rank.__getitem__)]
+
+
+def _overlaps(keyword, other):
+    """True if a proper suffix of keyword is a proper prefix of other."""
+    for size in range(1, min(len(keyword), len(other))):
+        if keyword.endswith(other[:size]):
+            return True
+    return False
@@ -0,0 +1,116 @@
+"""
+Percentile, median and min/max queries over EmployeeTable columns
+
+Sorted views are built once per (column, job code) and reused until the
+table's version changes. One-off queries that should not pay for a full sort
+use quickselect instead.
+"""
+
+import random
+from bisect import bisect_right
+
+
+def select_kth(values, k):
+    """Return the k-th smallest of values (0-based) in expected O(n) time."""
+    values = list(values)
+    if not 0 <= k < len(values):
+        raise IndexError("selection index out of range")
+    rng = random.Random(k)
+    while len(values) > 32:
+        pivot = values[rng.randrange(len(values))]
+        lows = [value for value in values if value < pivot]
+        if k < len(lows):
+            values = lows
+            continue
+        highs = [value for value in values if value > pivot]
+        equal = len(values) - len(lows) - len(highs)
+        if k < len(lows) + equal:
+            return pivot
+        k -= len(lows) + equal
+        values = highs
+    return sorted(values)[k]
+
+
+class PercentileService:
+    def __init__(self, table):
+        self.table = table
+        self.views = {}
+
+    def values(self, column, job_code=None):
+        """Yield the values of a column, optionally only for one job code."""
+        data = self.table.column(column)
+        if job_code is None:
+            return iter(data)
+        code = self.table.job_code_id(job_code)
+        return (value for value, value_code in zip(data, self.table.job_codes) if value_code == code)
+
+    def sorted_values(self, column, job_code=None):
+        """Return the cached sorted view of a column, rebuilding it if the table changed."""
+        key = (column, job_code)
+        cached = self.views.get(key)
+        if cached is None or cached[0] != self.table.version:
+            cached = (self.table.version, sorted(self.values(column, job_code)))
+            self.views[key] = cached
+        return cached[1]
+
+    def is_cached(self, column, job_code=None):
+        cached = self.views.get((column, job_code))
+        return cached is not None and cached[0] == self.table.version
+
+    def _bounds(self, view, positive_only):
+        """Return the [start, end) slice of a sorted view holding the requested values."""
+        start = bisect_right(view, 0.0) if positive_only else 0
+        return start, len(view)
+
+    def count(self, column, job_code=None, positive_only=False):
+        start, end = self._bounds(self.sorted_values(column, job_code), positive_only)
+        return end - start
+
+    def kth(self, column, k, job_code=None, positive_only=False, cache=True):
+        """Return the k-th smallest value (0-based); with cache=False an uncached column is quickselected."""
+        if not cache and not self.is_cached(column, job_code):
+            values = self.values(column, job_code)
+            if positive_only:
+                values = (value for value in values if value > 0)
+            return select_kth(values, k)
+        view = self.sorted_values(column, job_code)
+        start, end = self._bounds(view, positive_only)
+        if not 0 <= k < end - start:
+            raise IndexError("selection index out of range")
+        return view[start + k]
+
+    def percentile(self, column, fraction, job_code=None, positive_only=False, cache=True):
+        """Return the value at index int(count * fraction) of the sorted values."""
+        if not cache and not self.is_cached(column, job_code):
+            values = list(self.values(column, job_code))
+            if positive_only:
+                values = [value for value in values if value > 0]
+            return select_kth(values, int(len(values) * fraction))
+        return self.kth(column, int(self.count(column, job_code, positive_only) * fraction), job_code,
+                        positive_only)
+
+    def median(self, column, job_code=None, positive_only=False):
+        """Median as statistics.median computes it: the mean of the middle pair for even counts."""
+        view = self.sorted_values(column, job_code)
+        start, end = self._bounds(view, positive_only)
+        n = end - start
+        if n == 0:
+            raise ValueError("no median for empty data")
+        middle = start + n // 2
+        if n % 2 == 1:
+            return view[middle]
+        return (view[middle - 1] + view[middle]) / 2
+
+    def minimum(self, column, job_code=None, positive_only=False):
+        view = self.sorted_values(column, job_code)
+        start, end = self._bounds(view, positive_only)
+        if start == end:
+            raise ValueError("minimum of empty data")
+        return view[start]
+
+    def maximum(self, column, job_code=None, positive_only=False):
+        view = self.sorted_values(column, job_code)
+        start, end = self._bounds(view, positive_only)
+        if start == end:
+            raise ValueError("maximum of empty data")
+        return view[end - 1]
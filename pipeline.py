@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Single-process pipeline: DataProcessor -> PerformanceMetricsProcessor -> UserInteraction
+
+The EmployeeTable built by DataProcessor is handed to the next stage in memory,
+so employee_data.csv and emp_end_yr.txt are only written when asked for.
+error.txt is always written, as it is when the scripts run one by one.
+"""
+
+import argparse
+
+from Project_Shukla_v2 import PerformanceMetricsProcessor
+from Project_Srinivas_v3 import DataProcessor
+from ketan_new_v3 import UserInteraction, run_menu
+
+
+def run_pipeline(workers=1, write_intermediate=False, timings=False):
+    """Run data processing and bonus computation and return a UserInteraction over the result."""
+    processor = DataProcessor(workers=workers)
+    processor.process_data(write_employee_data=write_intermediate)
+
+    metrics = PerformanceMetricsProcessor()
+    metrics.process_data(employees=processor.employees, write_final_data=write_intermediate)
+    if timings:
+        processor.instrumentation.print_summary()
+        metrics.instrumentation.print_summary()
+
+    ui = UserInteraction()
+    ui.use_employees(metrics.employees)
+    ui.load_error_log()
+    return ui
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run all three stages in one process without intermediate files")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="aggregate timesheet.txt in this many worker processes")
+    parser.add_argument('--write-intermediate', action='store_true',
+                        help="also write employee_data.csv and emp_end_yr.txt")
+    parser.add_argument('--timings', action='store_true',
+                        help="print wall time, rows, rows/s and peak memory for every step of both stages")
+    args = parser.parse_args(argv)
+
+    ui = run_pipeline(workers=args.workers, write_intermediate=args.write_intermediate, timings=args.timings)
+    run_menu(ui)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Top-K and bottom-K leaderboards over EmployeeTable columns
+
+RankingService keeps, for every job code and ranked column, the k highest
+and k lowest values in bounded heaps, filled in a single pass over the
+table and reused until the table's version changes. Equal values rank by row
+(file order), and rows tied with the k-th value are kept aside so a
+leaderboard can also be read with its ties, as the recognition lists are.
+"""
+
+from heapq import heappush, heapreplace
+
+RANKED_COLUMNS = ('utilization', 'sales', 'evaluation_score', 'bonus')
+DEFAULT_K = 10
+
+
+def _offer(heap, tied, k, key, row):
+    """Keep the k largest keys in a min-heap, earlier rows first among equal keys.
+
+    Rows left out only because they tie with the k-th key are collected in tied.
+    """
+    if len(heap) < k:
+        heappush(heap, (key, -row))
+        return
+    low = heap[0][0]
+    if key < low:
+        return
+    if key == low:
+        tied.append(row)
+        return
+    evicted_key, evicted_row = heapreplace(heap, (key, -row))
+    if heap[0][0] == evicted_key:
+        tied.append(-evicted_row)
+    else:
+        tied.clear()
+
+
+class Leaderboard:
+    """The rows with the k highest and the k lowest values of one column within one job code."""
+    __slots__ = ('column', 'job_code', 'top', 'top_ties', 'bottom', 'bottom_ties')
+
+    def __init__(self, column, job_code, top_heap, top_tied, bottom_heap, bottom_tied):
+        self.column = column
+        self.job_code = job_code
+        # Highest value first; equal values in row order.
+        self.top = [-row for _, row in sorted(top_heap, reverse=True)]
+        self.top_ties = sorted(top_tied)
+        # Lowest value first; equal values in row order.
+        self.bottom = [-row for _, row in sorted(bottom_heap, reverse=True)]
+        self.bottom_ties = sorted(bottom_tied)
+
+
+class RankingService:
+    def __init__(self, table):
+        self.table = table
+        self.cache = None
+
+    def leaderboards(self, k=DEFAULT_K):
+        """Return {(column, job code): Leaderboard} for every ranked column and job code, rebuilt if stale."""
+        table = self.table
+        if self.cache is not None and self.cache[0] == table.version and self.cache[1] >= k:
+            return self.cache[2]
+        columns = [table.column(column) for column in RANKED_COLUMNS]
+        # Per job code id: a (top heap, top ties, bottom heap, bottom ties) per ranked column.
+        heaps = [[([], [], [], []) for _ in RANKED_COLUMNS] for _ in table.job_code_labels]
+        for row, (code, *values) in enumerate(zip(table.job_codes, *columns)):
+            for value, (top, top_tied, bottom, bottom_tied) in zip(values, heaps[code]):
+                if len(top) < k or value >= top[0][0]:
+                    _offer(top, top_tied, k, value, row)
+                if len(bottom) < k or -value >= bottom[0][0]:
+                    _offer(bottom, bottom_tied, k, -value, row)
+        boards = {
+            (column, label): Leaderboard(column, label, *heaps[code][index])
+            for code, label in enumerate(table.job_code_labels)
+            for index, column in enumerate(RANKED_COLUMNS)
+        }
+        self.cache = (table.version, k, boards)
+        return boards
+
+    def leaderboard(self, column, job_code, k=DEFAULT_K):
+        """Return the Leaderboard of one column and job code, or None if no employee has that job code."""
+        if column not in RANKED_COLUMNS:
+            raise KeyError(column)
+        return self.leaderboards(k).get((column, job_code))
+
+    def top(self, column, job_code, k=DEFAULT_K, with_ties=False):
+        """Return the rows of the k highest values, plus any rows tied with the k-th when with_ties is set."""
+        return self._rows(column, job_code, k, with_ties, 'top')
+
+    def bottom(self, column, job_code, k=DEFAULT_K, with_ties=False):
+        """Return the rows of the k lowest values, plus any rows tied with the k-th when with_ties is set."""
+        return self._rows(column, job_code, k, with_ties, 'bottom')
+
+    def _rows(self, column, job_code, k, with_ties, end):
+        board = self.leaderboard(column, job_code, k)
+        if board is None:
+            return []
+        rows = getattr(board, end)
+        ties = getattr(board, f"{end}_ties") if with_ties else []
+        # A cached board may have been built for a larger k; its first k rows are the same.
+        if len(rows) > k:
+            head, rest = rows[:k], rows[k:]
+            if not with_ties:
+                return head
+            data = self.table.column(column)
+            cutoff = data[head[-1]]
+            tied = [row for row in rest if data[row] == cutoff]
+            return head + tied + (ties if len(tied) == len(rest) else [])
+        return rows + ties
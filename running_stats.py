@@ -0,0 +1,177 @@
+"""
+Streaming statistics over EmployeeTable columns
+
+RunningStats keeps count, mean, variance (Welford's running sum of squared
+deviations), min and max of a stream of values. TableStatistics keeps one per
+metric and job code, for all values and for positive values only, builds
+them in a single pass over the table and updates them in place when the
+table reports an added row or a changed value.
+"""
+
+import math
+
+STAT_COLUMNS = ('utilization', 'evaluation_score', 'sales', 'bonus')
+
+
+class RunningStats:
+    __slots__ = ('count', 'mean', 'm2', 'minimum', 'maximum', 'stale')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        # Set when a removal leaves values that can only be recomputed from the data: a lost min or
+        # max, or a sum of squares that mostly cancelled out and so lost its precision.
+        self.stale = False
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def extend(self, values):
+        count, mean, m2 = self.count, self.mean, self.m2
+        minimum, maximum = self.minimum, self.maximum
+        for value in values:
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+            if value < minimum:
+                minimum = value
+            if value > maximum:
+                maximum = value
+        self.count, self.mean, self.m2 = count, mean, m2
+        self.minimum, self.maximum = minimum, maximum
+
+    def remove(self, value):
+        """Take back one value previously added."""
+        if self.count <= 1:
+            self.__init__()
+            return
+        delta = value - self.mean
+        m2 = self.m2
+        self.count -= 1
+        self.mean -= delta / self.count
+        self.m2 = max(m2 - delta * (value - self.mean), 0.0) if self.count > 1 else 0.0
+        if value <= self.minimum or value >= self.maximum or self.m2 < m2 * 1e-6:
+            self.stale = True
+
+    def merge(self, other):
+        """Combine with the statistics of another stream (Chan et al.)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+        else:
+            count = self.count + other.count
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / count
+            self.m2 += other.m2 + delta * delta * self.count * other.count / count
+            self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.stale = self.stale or other.stale
+
+    @property
+    def variance(self):
+        """Sample variance, as statistics.variance; None for fewer than two values."""
+        if self.count < 2:
+            return None
+        return self.m2 / (self.count - 1)
+
+    @property
+    def stdev(self):
+        variance = self.variance
+        return None if variance is None else math.sqrt(variance)
+
+
+class TableStatistics:
+    def __init__(self, table, columns=STAT_COLUMNS):
+        self.table = table
+        self.columns = columns
+        self.stats = {}
+        self.version = None
+        table.listeners.append(self)
+
+    def build(self):
+        """Rebuild every accumulator in one pass over each column."""
+        table = self.table
+        self.stats = {}
+        for column in self.columns:
+            groups = [[] for _ in table.job_code_labels]
+            for code, value in zip(table.job_codes, table.column(column)):
+                groups[code].append(value)
+            overall = self.stats[(column, None, False)] = RunningStats()
+            overall_positive = self.stats[(column, None, True)] = RunningStats()
+            for label, values in zip(table.job_code_labels, groups):
+                stats = self.stats[(column, label, False)] = RunningStats()
+                stats.extend(values)
+                positive = self.stats[(column, label, True)] = RunningStats()
+                positive.extend(value for value in values if value > 0)
+                overall.merge(stats)
+                overall_positive.merge(positive)
+        self.version = table.version
+
+    def get(self, column, job_code=None, positive_only=False):
+        """Return the RunningStats of a column, optionally for one job code and/or positive values only."""
+        if self.version != self.table.version:
+            self.build()
+        stats = self.stats.get((column, job_code, positive_only))
+        if stats is None:
+            return RunningStats()
+        if stats.stale:
+            stats = self.stats[(column, job_code, positive_only)] = self.rescan(column, job_code, positive_only)
+        return stats
+
+    def rescan(self, column, job_code=None, positive_only=False):
+        """Compute one accumulator from scratch."""
+        values = self.table.column(column)
+        if job_code is not None:
+            code = self.table.job_code_id(job_code)
+            values = (value for value, value_code in zip(values, self.table.job_codes) if value_code == code)
+        if positive_only:
+            values = (value for value in values if value > 0)
+        stats = RunningStats()
+        stats.extend(values)
+        return stats
+
+    def _accumulators(self, column, job_code, value):
+        keys = [(column, None, False), (column, job_code, False)]
+        if value > 0:
+            keys += [(column, None, True), (column, job_code, True)]
+        for key in keys:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = RunningStats()
+            yield stats
+
+    def row_added(self, row):
+        """Table listener: fold a newly added row into the accumulators."""
+        if self.version != self.table.version - 1:
+            return
+        job_code = self.table.job_code(row)
+        for column in self.columns:
+            value = self.table.column(column)[row]
+            for stats in self._accumulators(column, job_code, value):
+                stats.add(value)
+        self.version = self.table.version
+
+    def value_changed(self, row, column, old, new):
+        """Table listener: replace one value in the accumulators."""
+        if self.version != self.table.version - 1:
+            return
+        if column in self.columns:
+            job_code = self.table.job_code(row)
+            for stats in self._accumulators(column, job_code, old):
+                stats.remove(old)
+            for stats in self._accumulators(column, job_code, new):
+                stats.add(new)
+        self.version = self.table.version
@@ -0,0 +1,95 @@
+"""
+Bounded LRU cache of evaluation comment scores
+
+Evaluation comments are mostly a few boilerplate phrases repeated across
+employees and years. ScoreCache scores each distinct comment once: scores
+are kept under the comment's normalized text (stripped, lowercased) in an
+LRU of at most maxsize entries, and counted as hits and misses. The cache
+carries the version of the keyword map and scoring rule it was filled with,
+and save/load persist it between runs; a file written with another version
+is ignored, so a changed keyword map never serves stale scores.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+
+SCORE_CACHE_SIZE = 1 << 16
+
+
+def keyword_map_version(mapping, rule):
+    """Identify a keyword -> score map (in order) together with the rule that scores comments with it."""
+    encoded = json.dumps([rule, list(mapping.items())]).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def normalize(text):
+    return text.strip().lower()
+
+
+class ScoreCache:
+    def __init__(self, scorer, version, maxsize=SCORE_CACHE_SIZE):
+        # scorer maps normalized comment text to its score.
+        self.scorer = scorer
+        self.version = version
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def score(self, text):
+        """Return the score of a comment, computing it only if its normalized text is not cached."""
+        key = normalize(text)
+        entries = self.entries
+        score = entries.get(key)
+        if score is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return score
+        self.misses += 1
+        score = entries[key] = self.scorer(key)
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+        return score
+
+    def update(self, items):
+        """Add (normalized text, score) pairs, e.g. from a saved cache, least recently used first."""
+        for key, score in items:
+            self.entries[key] = score
+            self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries),
+                'hit_rate': self.hits / lookups if lookups else 0.0}
+
+    def summary(self):
+        stats = self.stats()
+        return (f"{stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.2%} hit rate), "
+                f"{stats['entries']} cached comments")
+
+    def load(self, path):
+        """Fill the cache from a file written by save; returns False if it is missing or for another version."""
+        try:
+            with open(path, 'rb') as file:
+                saved = pickle.load(file)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"Ignoring unreadable score cache {path}: {e}")
+            return False
+        if not isinstance(saved, dict) or saved.get('version') != self.version:
+            return False
+        self.update(saved['entries'])
+        return True
+
+    def save(self, path):
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as file:
+            pickle.dump({'version': self.version, 'entries': list(self.entries.items())}, file,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
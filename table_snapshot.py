@@ -0,0 +1,146 @@
+"""
+Binary columnar snapshot of emp_end_yr.txt
+
+Layout: an 8-byte magic, a little-endian (format version, header length) pair,
+a JSON header, then one 8-byte aligned section per column. The header holds
+the schema, the row count, the job code labels, where each section lives and
+the size and modification time of the emp_end_yr.txt it was written with; a
+snapshot whose source no longer matches is stale and ignored.
+
+Numeric columns are the EmployeeTable arrays' raw bytes, names are stored
+once each (a UTF-8 blob plus offsets) and referenced by number, and a dense
+ID index is stored as is, so loading is a few memory copies out of an mmap
+rather than parsing text.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from employee_table import EmployeeTable, IdIndex
+
+MAGIC = b'EMPSNAP\0'
+FORMAT_VERSION = 1
+PREFIX = struct.Struct('<II')
+SCHEMA = [
+    ('ids', 'q'), ('job_codes', 'H'), ('base_pay', 'd'), ('utilization', 'd'),
+    ('evaluation_score', 'd'), ('sales', 'd'), ('bonus', 'd'),
+    ('last_name_ids', 'I'), ('first_name_ids', 'I'), ('name_offsets', 'q'), ('names', 'B'),
+]
+SNAPSHOT_FILE = 'emp_end_yr.bin'
+
+
+def _source_stamp(source):
+    info = os.stat(source)
+    return {'size': info.st_size, 'mtime_ns': info.st_mtime_ns}
+
+
+def write_snapshot(table, bonus, path, source):
+    """Write the columns of emp_end_yr.txt (source, already written) to a snapshot at path.
+
+    bonus is the Bonus column as written to source. The file is written under a
+    temporary name and renamed, so readers never see half a snapshot.
+    """
+    names = {}
+    last_name_ids = array('I', [names.setdefault(name, len(names)) for name in table.last_names])
+    first_name_ids = array('I', [names.setdefault(name, len(names)) for name in table.first_names])
+    encoded = [name.encode() for name in names]
+    name_offsets = array('q', [0])
+    for name in encoded:
+        name_offsets.append(name_offsets[-1] + len(name))
+    columns = {
+        'ids': table.ids, 'job_codes': table.job_codes, 'base_pay': table.base_pay,
+        'utilization': table.utilization, 'evaluation_score': table.evaluation_score, 'sales': table.sales,
+        'bonus': bonus, 'last_name_ids': last_name_ids, 'first_name_ids': first_name_ids,
+        'name_offsets': name_offsets, 'names': array('B', b''.join(encoded)),
+    }
+    if table.index.sparse is None and len(table.index) == len(table):
+        columns['index_rows'] = table.index.rows
+
+    header = {
+        'schema': SCHEMA,
+        'byteorder': sys.byteorder,
+        'rows': len(table),
+        'job_code_labels': table.job_code_labels,
+        'index_base': table.index.base,
+        'source': _source_stamp(source),
+        'sections': {},
+    }
+    # Offsets are relative to the first section, which starts after the (8-byte padded) header.
+    position = 0
+    for name, column in columns.items():
+        header['sections'][name] = [position, len(column) * column.itemsize, column.typecode]
+        position += -(-len(column) * column.itemsize // 8) * 8
+    encoded_header = json.dumps(header).encode()
+    data_start = -(-(len(MAGIC) + PREFIX.size + len(encoded_header)) // 8) * 8
+
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as file:
+        file.write(MAGIC)
+        file.write(PREFIX.pack(FORMAT_VERSION, len(encoded_header)))
+        file.write(encoded_header)
+        for name, column in columns.items():
+            offset = header['sections'][name][0]
+            file.write(bytes(data_start + offset - file.tell()))
+            column.tofile(file)
+    os.replace(temporary, path)
+
+
+def read_snapshot(path, source):
+    """Return an EmployeeTable from the snapshot at path, or None if it is missing, invalid or stale."""
+    try:
+        with open(path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _read(mm, path, source)
+    except (FileNotFoundError, ValueError, KeyError, struct.error):
+        return None
+
+
+def _read(mm, path, source):
+    if mm[:len(MAGIC)] != MAGIC:
+        return None
+    version, header_length = PREFIX.unpack_from(mm, len(MAGIC))
+    if version != FORMAT_VERSION:
+        print(f"{path} has format version {version}, reading {source} instead.")
+        return None
+    start = len(MAGIC) + PREFIX.size
+    header = json.loads(mm[start:start + header_length])
+    if [tuple(entry) for entry in header['schema']] != SCHEMA or header['byteorder'] != sys.byteorder:
+        print(f"{path} has a different schema, reading {source} instead.")
+        return None
+    if header['source'] != _source_stamp(source):
+        print(f"{path} is older than {source}, reading {source} instead.")
+        return None
+    data_start = -(-(start + header_length) // 8) * 8
+
+    def column(name):
+        offset, length, typecode = header['sections'][name]
+        values = array(typecode)
+        values.frombytes(mm[data_start + offset:data_start + offset + length])
+        return values
+
+    table = EmployeeTable()
+    for name in ('ids', 'job_codes', 'base_pay', 'utilization', 'evaluation_score', 'sales', 'bonus'):
+        setattr(table, name, column(name))
+    table.hours = array('d', bytes(8 * header['rows']))
+    table.job_code_labels = header['job_code_labels']
+
+    blob = column('names').tobytes()
+    offsets = column('name_offsets')
+    names = [blob[begin:end].decode() for begin, end in zip(offsets, offsets[1:])]
+    table.last_names = list(map(names.__getitem__, column('last_name_ids')))
+    table.first_names = list(map(names.__getitem__, column('first_name_ids')))
+
+    if 'index_rows' in header['sections']:
+        table.index = IdIndex()
+        table.index.base = header['index_base']
+        table.index.rows = column('index_rows')
+        table.index.count = header['rows']
+    else:
+        for row, emp_id in enumerate(table.ids):
+            table.index[emp_id] = row
+    table.mark_changed()
+    return table